@@ -0,0 +1,320 @@
+"""
+批量渲染命令行工具
+在进程池中并行渲染多个图JSON文件（或 graph_binary 转换的 .prg 文件），
+每个工作进程使用Agg后端并持有一个渲染器
+
+用法:
+    python batch_render.py graphs/ -o output/ --jobs 64
+    python batch_render.py "graphs/**/*.json.gz" -o output/ --format svg --config render.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Tuple
+
+
+GRAPH_SUFFIXES = ('.json', '.json.gz', '.prg')
+
+# 每个工作进程只使用单线程的数值库，避免多进程叠加多线程造成超额订阅
+_THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# 工作进程内的渲染器，由 _init_worker 创建
+_renderer = None
+# 工作进程开始渲染文件时写入输入路径的队列，进程池失效后用于找出崩溃时正在渲染的文件
+_started = None
+
+
+def _strip_suffix(name: str) -> str:
+    """去掉图文件的扩展名"""
+    for suffix in sorted(GRAPH_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return os.path.splitext(name)[0]
+
+
+def collect_jobs(inputs: List[str], output_dir: str, output_format: str) -> List[Tuple[str, str]]:
+    """
+    把输入的目录、通配符或文件展开为 (输入文件, 输出文件) 列表
+
+    目录会被递归扫描，输出保留相对于该目录的子路径；通配符与单个文件的
+    输出直接放在输出目录下。
+
+    Args:
+        inputs: 目录、通配符或文件路径列表
+        output_dir: 输出目录
+        output_format: 输出格式（文件扩展名）
+
+    Returns:
+        去重后的任务列表
+    """
+    jobs = {}
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                for name in sorted(files):
+                    if not name.endswith(GRAPH_SUFFIXES):
+                        continue
+                    source = os.path.join(root, name)
+                    relative = os.path.relpath(os.path.join(root, _strip_suffix(name)), pattern)
+                    jobs.setdefault(os.path.abspath(source),
+                                    os.path.join(output_dir, f"{relative}.{output_format}"))
+            continue
+
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise ValueError(f"没有匹配的输入文件: {pattern}")
+        for source in matches:
+            if not os.path.isfile(source):
+                raise ValueError(f"输入文件不存在: {source}")
+            name = _strip_suffix(os.path.basename(source))
+            jobs.setdefault(os.path.abspath(source), os.path.join(output_dir, f"{name}.{output_format}"))
+
+    return list(jobs.items())
+
+
+def is_up_to_date(source: str, output: str, dependencies: Optional[List[str]] = None) -> bool:
+    """
+    输出文件存在且不早于输入文件及其依赖（如配置文件）时视为最新
+
+    Args:
+        source: 输入文件
+        output: 输出文件
+        dependencies: 其他依赖文件
+
+    Returns:
+        是否可以跳过
+    """
+    if not os.path.exists(output):
+        return False
+    output_time = os.path.getmtime(output)
+    return all(os.path.getmtime(path) <= output_time for path in [source] + (dependencies or []))
+
+
+def load_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    把JSON配置中的字符串转换为渲染器使用的枚举与元组
+
+    Args:
+        config: 从JSON读取的配置
+
+    Returns:
+        渲染器配置
+    """
+    from pagerank_renderer import (
+        EdgeWidthStrategy,
+        LayoutAlgorithm,
+        NodeColorStrategy,
+        NodeSizeStrategy,
+    )
+    from pagerank_solvers import Acceleration, SolverMethod, StoppingRule
+
+    enums = {
+        'layout': LayoutAlgorithm,
+        'node_size': NodeSizeStrategy,
+        'node_color': NodeColorStrategy,
+        'edge_width': EdgeWidthStrategy,
+        'pagerank_solver': SolverMethod,
+        'pagerank_acceleration': Acceleration,
+        'pagerank_stopping': StoppingRule,
+    }
+    result = dict(config)
+    for name, enum in enums.items():
+        if isinstance(result.get(name), str):
+            result[name] = enum(result[name])
+    if isinstance(result.get('figsize'), list):
+        result['figsize'] = tuple(result['figsize'])
+    return result
+
+
+def _init_worker(config: Dict[str, Any], started=None) -> None:
+    """工作进程初始化：切换到Agg后端并创建渲染器"""
+    global _renderer, _started
+
+    import matplotlib
+    matplotlib.use('Agg')
+    from pagerank_renderer import PageRankRenderer
+
+    _renderer = PageRankRenderer(load_config(config))
+    _started = started
+
+
+def _render_one(source: str, output: str, dpi: int) -> Tuple[str, str, Optional[str], float]:
+    """
+    在工作进程中渲染单个文件，异常被捕获并作为结果返回
+
+    Returns:
+        (输入文件, 输出文件, 错误信息或None, 耗时)
+    """
+    if _started is not None:
+        _started.put(source)
+    start = time.perf_counter()
+    try:
+        if source.endswith('.prg'):
+            _renderer.load_binary(source)
+        else:
+            _renderer.load_json(source)
+        _renderer.export(output, dpi=dpi)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return source, output, error, time.perf_counter() - start
+
+
+def _render_isolated(source: str, output: str, config: Dict[str, Any], dpi: int) -> Tuple[str, str, Optional[str], float]:
+    """
+    在独立的单进程池中渲染单个文件，工作进程崩溃只记为该文件的失败
+
+    Returns:
+        (输入文件, 输出文件, 错误信息或None, 耗时)
+    """
+    with ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(config,)) as pool:
+        try:
+            return pool.submit(_render_one, source, output, dpi).result()
+        except BrokenProcessPool as e:
+            return source, output, f"工作进程异常退出: {type(e).__name__}: {e}", 0.0
+
+
+def run_batch(jobs: List[Tuple[str, str]], config: Dict[str, Any], workers: int, dpi: int,
+              stream=sys.stdout) -> Dict[str, Any]:
+    """
+    并行渲染任务列表，逐个输出进度与耗时，单个文件失败不影响其他文件；
+    工作进程崩溃导致进程池失效时，崩溃时正在渲染的文件在独立进程中逐个重试，
+    其余未完成的文件在新的进程池中继续渲染
+
+    任务按输入文件大小从大到小提交，使大图尽早开始、减少尾部等待。
+
+    Args:
+        jobs: (输入文件, 输出文件) 列表
+        config: 渲染器配置（JSON形式）
+        workers: 工作进程数
+        dpi: 图像分辨率
+        stream: 进度输出流
+
+    Returns:
+        汇总信息，包含成功与失败数量、失败列表、总耗时与累计渲染耗时
+    """
+    for variable in _THREAD_VARIABLES:
+        os.environ.setdefault(variable, '1')
+    os.environ['MPLBACKEND'] = 'Agg'
+
+    jobs = sorted(jobs, key=lambda job: os.path.getsize(job[0]), reverse=True)
+    failures = []
+    busy_time = 0.0
+    done = 0
+    start = time.perf_counter()
+
+    def report(source: str, output: str, error: Optional[str], elapsed: float) -> None:
+        nonlocal done, busy_time
+        done += 1
+        busy_time += elapsed
+        if error is None:
+            print(f"[{done}/{len(jobs)}] 完成 {source} -> {output} ({elapsed:.2f}s)", file=stream, flush=True)
+        else:
+            failures.append((source, error))
+            print(f"[{done}/{len(jobs)}] 失败 {source}: {error}", file=stream, flush=True)
+
+    # 一个工作进程异常退出（内存不足被杀、段错误等）会使整个进程池失效，池中所有未完成的任务
+    # 都会得到BrokenProcessPool。失效时已开始渲染的文件可能是原因，在独立进程中逐个重试；
+    # 尚未开始的文件在新建的进程池中继续渲染
+    remaining = jobs
+    suspects = []
+    while remaining:
+        started = get_context().SimpleQueue()
+        broken = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(config, started)) as pool:
+            futures = {pool.submit(_render_one, source, output, dpi): (source, output)
+                       for source, output in remaining}
+            for future in as_completed(futures):
+                try:
+                    report(*future.result())
+                except BrokenProcessPool:
+                    broken.append(futures[future])
+                except Exception as e:
+                    report(*futures[future], f"{type(e).__name__}: {e}", 0.0)
+
+        running = set()
+        while not started.empty():
+            running.add(started.get())
+        started.close()
+        crashed = [job for job in broken if job[0] in running]
+        if broken and not crashed:
+            # 工作进程在开始渲染前就退出（如初始化失败），无法定位，全部隔离重试
+            crashed = broken
+        suspects += crashed
+        remaining = [job for job in broken if job not in crashed]
+
+    if suspects:
+        print(f"工作进程异常退出，{len(suspects)} 个可能导致崩溃的文件逐个隔离重试", file=stream, flush=True)
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            retries = [threads.submit(_render_isolated, source, output, config, dpi) for source, output in suspects]
+            for future in as_completed(retries):
+                report(*future.result())
+
+    return {
+        'succeeded': len(jobs) - len(failures),
+        'failed': len(failures),
+        'failures': failures,
+        'wall_time': time.perf_counter() - start,
+        'busy_time': busy_time
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数，默认使用 sys.argv
+
+    Returns:
+        退出码，存在失败的文件时为1
+    """
+    parser = argparse.ArgumentParser(description='批量并行渲染图JSON文件')
+    parser.add_argument('inputs', nargs='+', help='输入目录、通配符或文件')
+    parser.add_argument('-o', '--output-dir', required=True, help='输出目录')
+    parser.add_argument('--format', default=None, help='输出格式: png, svg, pdf（默认取配置中的output_format）')
+    parser.add_argument('--config', default=None, help='渲染器配置JSON文件')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='工作进程数')
+    parser.add_argument('--dpi', type=int, default=300, help='图像分辨率')
+    parser.add_argument('--force', action='store_true', help='忽略已是最新的输出，全部重新渲染')
+    args = parser.parse_args(argv)
+
+    config = {}
+    dependencies = []
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        dependencies.append(args.config)
+
+    output_format = args.format or config.get('output_format', 'png')
+    try:
+        jobs = collect_jobs(args.inputs, args.output_dir, output_format)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+
+    pending = [job for job in jobs if args.force or not is_up_to_date(*job, dependencies)]
+    print(f"共 {len(jobs)} 个文件，跳过 {len(jobs) - len(pending)} 个已是最新的输出，"
+          f"使用 {args.jobs} 个进程渲染 {len(pending)} 个", flush=True)
+    if not pending:
+        return 0
+
+    summary = run_batch(pending, config, max(1, args.jobs), args.dpi)
+    speedup = summary['busy_time'] / summary['wall_time'] if summary['wall_time'] > 0 else 0.0
+    print(f"成功 {summary['succeeded']}，失败 {summary['failed']}，"
+          f"总耗时 {summary['wall_time']:.2f}s，累计渲染耗时 {summary['busy_time']:.2f}s（并行加速 {speedup:.1f}x）")
+    for source, error in summary['failures']:
+        print(f"  {source}: {error}", file=sys.stderr)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+迭代动画基准测试
+在不同边数的合成图上比较每帧重新绘制整张图（相当于每帧调用一次render）
+与只重绘节点的动画导出，报告首帧耗时与之后每帧的平均耗时
+
+用法:
+    python benchmarks/bench_animation.py --nodes 2000 --edges-per-node 2 8 32 --frames 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fast_draw import draw_edges, draw_nodes, fit_axes  # noqa: E402
+from history_animation import HistoryAnimator  # noqa: E402
+
+
+class TimingWriter:
+    """只记录每帧到达时间的写入器，编码耗时不计入"""
+
+    def __init__(self):
+        self.times = [time.perf_counter()]
+
+    def write(self, rgba):
+        self.times.append(time.perf_counter())
+
+    def close(self):
+        pass
+
+
+def history(num_nodes, frames, rng):
+    """从均匀分布逐步趋向随机幂律分布的合成迭代历史"""
+    target = rng.pareto(1.5, num_nodes) + 1.0
+    target /= target.sum()
+    uniform = np.full(num_nodes, 1.0 / num_nodes)
+    return [uniform + (target - uniform) * (1 - 0.5 ** k) for k in range(frames)]
+
+
+def redraw(positions, sources, targets, frames, dpi):
+    """每帧新建图形并完整绘制边与节点，返回首帧与之后每帧的平均耗时"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    low, high = min(f.min() for f in frames), max(f.max() for f in frames)
+    times = []
+    for values in frames:
+        start = time.perf_counter()
+        fig = Figure(figsize=(12, 8), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        fit_axes(ax, positions)
+        sizes = 100 + (values - low) / (high - low) * 1900
+        draw_edges(ax, positions, sources, targets, node_sizes=sizes)
+        draw_nodes(ax, positions, sizes, values, cmap='viridis')
+        canvas.draw()
+        np.asarray(canvas.buffer_rgba())
+        times.append(time.perf_counter() - start)
+    return times[0], float(np.mean(times[1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='迭代动画基准测试')
+    parser.add_argument('--nodes', type=int, default=2000, help='节点数量')
+    parser.add_argument('--edges-per-node', type=int, nargs='+', default=[2, 8, 32], help='平均出度列表')
+    parser.add_argument('--frames', type=int, default=20, help='帧数')
+    parser.add_argument('--dpi', type=int, default=100, help='分辨率')
+    parser.add_argument('--gif', action='store_true', help='同时测量写出GIF的总耗时')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    positions = rng.random((args.nodes, 2))
+    frames = history(args.nodes, args.frames, rng)
+
+    print(f"{'edges':>10}{'redraw first':>14}{'redraw/frame':>14}{'blit first':>12}{'blit/frame':>12}"
+          + (f"{'gif total':>11}" if args.gif else ''))
+    for degree in args.edges_per_node:
+        m = args.nodes * degree
+        sources = rng.integers(0, args.nodes, m)
+        targets = rng.integers(0, args.nodes, m)
+
+        redraw_first, redraw_frame = redraw(positions, sources, targets, frames, args.dpi)
+
+        animator = HistoryAnimator(positions, sources, targets, dpi=args.dpi)
+        writer = TimingWriter()
+        animator.animate(frames, writer)
+        deltas = np.diff(writer.times)
+        line = f"{m:>10}{redraw_first:>13.3f}s{redraw_frame:>13.3f}s{deltas[0]:>11.3f}s{deltas[1:].mean():>11.3f}s"
+
+        if args.gif:
+            with tempfile.TemporaryDirectory() as directory:
+                start = time.perf_counter()
+                animator.animate(frames, os.path.join(directory, 'history.gif'))
+                line += f"{time.perf_counter() - start:>10.2f}s"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+二进制图格式基准测试
+比较JSON流式加载与内存映射加载的耗时，以及两种图存储上的PageRank计算耗时；
+--workers 大于1时另外在多个进程中同时映射同一文件
+
+用法:
+    python benchmarks/bench_binary.py --nodes 100000 1000000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import generate  # noqa: E402
+from graph_binary import convert_json  # noqa: E402
+from pagerank_renderer import PageRankRenderer  # noqa: E402
+
+
+def timed(function, *args):
+    """调用函数并返回耗时（秒）"""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def load_and_rank(path: str) -> float:
+    """在工作进程中映射二进制图并计算PageRank，返回耗时"""
+    renderer = PageRankRenderer()
+    start = time.perf_counter()
+    renderer.load_binary(path)
+    renderer.calculate_pagerank()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='二进制图格式基准测试')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[100000, 1000000], help='节点数量列表')
+    parser.add_argument('--family', default='power_law', help='合成图结构')
+    parser.add_argument('--workers', type=int, default=4, help='同时映射同一文件的进程数')
+    args = parser.parse_args()
+
+    print(f"{'nodes':>10}{'edges':>12}{'json':>10}{'convert':>10}{'mmap':>10}"
+          f"{'pr(json)':>10}{'pr(mmap)':>10}{'workers':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n in args.nodes:
+            json_path = os.path.join(directory, f"{n}.json")
+            binary_path = os.path.join(directory, f"{n}.prg")
+            generate(args.family, n, seed=0).write_json(json_path)
+
+            renderer = PageRankRenderer()
+            json_time = timed(renderer.load_json, json_path)
+            json_rank = timed(renderer.calculate_pagerank)
+            convert_time = timed(convert_json, json_path, binary_path)
+            mmap_time = timed(renderer.load_binary, binary_path)
+            mmap_rank = timed(renderer.calculate_pagerank)
+
+            worker_time = float('nan')
+            if args.workers > 1:
+                with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                    worker_time = max(pool.map(load_and_rank, [binary_path] * args.workers))
+
+            print(f"{n:>10}{renderer.store.num_edges:>12}{json_time:>10.3f}{convert_time:>10.3f}"
+                  f"{mmap_time:>10.4f}{json_rank:>10.3f}{mmap_rank:>10.3f}{worker_time:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+快速绘制模式基准测试
+对比逐条边绘制（networkx，每条边一个FancyArrowPatch）与集合绘制的渲染与保存耗时
+
+用法:
+    python benchmarks/bench_draw.py --edges 1000 5000 20000 --slow-limit 5000
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagerank_renderer import LayoutAlgorithm, PageRankRenderer  # noqa: E402
+
+
+def make_graph(num_edges: int, edges_per_node: int, seed: int) -> dict:
+    """生成随机图的JSON数据"""
+    rng = np.random.default_rng(seed)
+    n = max(2, num_edges // edges_per_node)
+    types = ['function', 'class', 'module']
+    pairs = rng.integers(0, n, (num_edges, 2))
+    return {
+        'metadata': {},
+        'graph': {
+            'nodes': [{'id': f'n{i}', 'type': types[i % 3]} for i in range(n)],
+            'edges': [{'source': f'n{a}', 'target': f'n{b}', 'weight': 1.0 + (a + b) % 4}
+                      for a, b in pairs.tolist()]
+        }
+    }
+
+
+def time_render(data: dict, fast: bool, dpi: int) -> float:
+    """渲染并保存为PNG，返回耗时（不含PageRank与布局）"""
+    renderer = PageRankRenderer({
+        'layout': LayoutAlgorithm.BARNES_HUT,
+        'fast_draw_threshold': 0 if fast else None,
+        'show_labels': False
+    })
+    renderer.load_json_from_dict(data)
+    renderer.calculate_pagerank()
+    renderer.apply_layout()
+
+    start = time.perf_counter()
+    fig = renderer.render()
+    fig.savefig(io.BytesIO(), format='png', dpi=dpi)
+    plt.close(fig)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='快速绘制模式基准测试')
+    parser.add_argument('--edges', type=int, nargs='+', default=[1000, 5000, 20000], help='边数量列表')
+    parser.add_argument('--edges-per-node', type=int, default=3, help='平均出度')
+    parser.add_argument('--slow-limit', type=int, default=5000, help='超过该边数时跳过逐条边绘制')
+    parser.add_argument('--dpi', type=int, default=100, help='保存分辨率')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    print(f"{'edges':>10}{'per-edge(s)':>14}{'collection(s)':>16}{'speedup':>10}")
+    for m in args.edges:
+        data = make_graph(m, args.edges_per_node, args.seed)
+        fast = time_render(data, True, args.dpi)
+        if m <= args.slow_limit:
+            slow = time_render(data, False, args.dpi)
+            print(f"{m:>10}{slow:>14.2f}{fast:>16.2f}{slow / fast:>9.1f}x")
+        else:
+            print(f"{m:>10}{'-':>14}{fast:>16.2f}{'-':>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+导入耗时基准测试
+在新进程中分别测量导入 pagerank_renderer、首次计算PageRank与首次导出图像的耗时，
+并检查仅计算PageRank时是否加载了绘图库
+
+用法:
+    python benchmarks/bench_import.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 在子进程中执行，输出各步骤耗时与已加载的重量级模块
+SCRIPT = r'''
+import json, os, sys, tempfile, time
+start = time.perf_counter()
+import numpy
+numpy_time = time.perf_counter() - start
+
+start = time.perf_counter()
+from pagerank_renderer import LayoutAlgorithm, PageRankRenderer
+import_time = time.perf_counter() - start
+
+data = {'metadata': {}, 'graph': {
+    'nodes': [{'id': f'n{i}', 'type': 'function'} for i in range(200)],
+    'edges': [{'source': f'n{i}', 'target': f'n{(i * 7 + 1) % 200}'} for i in range(200)]}}
+start = time.perf_counter()
+renderer = PageRankRenderer({'layout': LayoutAlgorithm.BARNES_HUT})
+renderer.load_json_from_dict(data)
+renderer.get_pagerank_values()
+pagerank_time = time.perf_counter() - start
+heavy = [name for name in ('networkx', 'matplotlib', 'matplotlib.pyplot', 'scipy') if name in sys.modules]
+
+start = time.perf_counter()
+with tempfile.TemporaryDirectory() as output_dir:
+    renderer.export(os.path.join(output_dir, 'graph.png'), dpi=50)
+export_time = time.perf_counter() - start
+
+import matplotlib
+print(json.dumps({'numpy': numpy_time, 'import': import_time, 'pagerank': pagerank_time,
+                  'export': export_time, 'loaded': heavy, 'backend': matplotlib.get_backend()}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='导入耗时基准测试')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数（取中位数）')
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        output = subprocess.run([sys.executable, '-c', SCRIPT], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    for name, label in (('numpy', 'import numpy'), ('import', 'import pagerank_renderer'),
+                        ('pagerank', '首次计算PageRank'), ('export', '首次导出图像（含绘图库导入）')):
+        print(f"{label:<32}{statistics.median(run[name] for run in runs) * 1000:>10.1f} ms")
+    print(f"计算PageRank后已加载的重量级模块: {', '.join(runs[0]['loaded']) or '无'}")
+    print(f"绘图后端: {runs[0]['backend']}")
+
+
+if __name__ == '__main__':
+    main()
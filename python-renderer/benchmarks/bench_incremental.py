@@ -0,0 +1,127 @@
+"""
+增量PageRank更新基准测试
+比较小规模图增量下全量重算、热启动与局部残差推送的迭代次数和耗时；
+三组都计入图存储上的增量应用、计算模型重建与求解，不计入JSON解析
+
+用法:
+    python benchmarks/bench_incremental.py --nodes 20000 --delta-size 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagerank_renderer import PageRankRenderer  # noqa: E402
+from pagerank_solvers import IncrementalUpdate, PageRankModel, solve_pagerank  # noqa: E402
+
+
+def generate_graph(num_nodes, edges_per_node, rng):
+    """生成入度服从幂律分布的随机有向图（load_json格式）"""
+    num_edges = num_nodes * edges_per_node
+    sources = rng.integers(0, num_nodes, num_edges)
+    targets = (rng.zipf(1.8, num_edges) - 1) % num_nodes
+    nodes = [{'id': f'n{i}', 'type': 'function'} for i in range(num_nodes)]
+    edges = [{'source': f'n{s}', 'target': f'n{t}'} for s, t in zip(sources.tolist(), targets.tolist())]
+    return {'metadata': {'generator': 'bench_incremental'}, 'graph': {'nodes': nodes, 'edges': edges}}
+
+
+def generate_delta(data, delta_size, rng):
+    """随机删除与添加少量边，并新增一个节点"""
+    edges = data['graph']['edges']
+    num_nodes = len(data['graph']['nodes'])
+    existing = {(e['source'], e['target']) for e in edges}
+
+    removed = set()
+    for k in rng.choice(len(edges), size=delta_size // 2, replace=False).tolist():
+        removed.add((edges[k]['source'], edges[k]['target']))
+
+    new_id = f'n{num_nodes}'
+    added = [{'source': new_id, 'target': f'n{int(rng.integers(num_nodes))}'}]
+    while len(added) < delta_size - len(removed):
+        pair = (f'n{int(rng.integers(num_nodes))}', f'n{int(rng.integers(num_nodes))}')
+        if pair not in existing and pair not in removed:
+            added.append({'source': pair[0], 'target': pair[1]})
+
+    return {
+        'add_nodes': [{'id': new_id, 'type': 'function'}],
+        'add_edges': added,
+        'remove_edges': [{'source': s, 'target': t} for s, t in removed],
+    }
+
+
+def apply_delta_to_document(data, delta):
+    """在JSON文档上应用增量，用于全量重算的对照组"""
+    removed = {(e['source'], e['target']) for e in delta.get('remove_edges', [])}
+    edges = [e for e in data['graph']['edges'] if (e['source'], e['target']) not in removed]
+    return {
+        'metadata': data['metadata'],
+        'graph': {
+            'nodes': data['graph']['nodes'] + delta.get('add_nodes', []),
+            'edges': edges + delta.get('add_edges', []),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='增量PageRank更新基准测试')
+    parser.add_argument('--nodes', type=int, default=20000, help='节点数量')
+    parser.add_argument('--edges-per-node', type=int, default=5, help='平均出度')
+    parser.add_argument('--delta-size', type=int, default=10, help='每次增量涉及的边数')
+    parser.add_argument('--trials', type=int, default=5, help='重复次数')
+    parser.add_argument('--tolerance', type=float, default=1e-6, help='收敛阈值')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = generate_graph(args.nodes, args.edges_per_node, rng)
+    config = {'tolerance': args.tolerance, 'max_iterations': 1000}
+
+    results = {'full': [], 'warm_start': [], 'push': []}
+    for _ in range(args.trials):
+        delta = generate_delta(data, args.delta_size, rng)
+        updated = apply_delta_to_document(data, delta)
+
+        # 对照组：与增量模式相同地在图存储上应用增量并重建计算模型，再从均匀分布开始求解；
+        # JSON解析不计入任何一组
+        base = PageRankRenderer(config)
+        base.load_json_from_dict(data)
+        base.calculate_pagerank()
+        start = time.perf_counter()
+        store, _ = base.store.apply_delta(delta)
+        full = solve_pagerank(PageRankModel.from_store(store), tolerance=args.tolerance, max_iterations=1000)
+        results['full'].append((full.iterations, time.perf_counter() - start))
+        reference = full.array
+
+        for update in (IncrementalUpdate.WARM_START, IncrementalUpdate.PUSH):
+            renderer = PageRankRenderer(config)
+            renderer.load_json_from_dict(data)
+            renderer.calculate_pagerank()
+
+            start = time.perf_counter()
+            result = renderer.apply_delta(delta, update)
+            elapsed = time.perf_counter() - start
+
+            order = [result.index[node_id] for node_id in full.node_ids]
+            error = np.abs(result.array[order] - reference).sum()
+            results[update.value].append((result.iterations, elapsed, error))
+
+        data = updated
+
+    print(f"nodes={args.nodes} edges={args.nodes * args.edges_per_node} "
+          f"delta={args.delta_size} trials={args.trials}")
+    print(f"{'mode':<12}{'iterations':>12}{'time(ms)':>12}{'L1 vs full':>14}")
+    for mode, rows in results.items():
+        iterations = np.mean([row[0] for row in rows])
+        elapsed = np.mean([row[1] for row in rows]) * 1000
+        error = np.mean([row[2] for row in rows]) if mode != 'full' else 0.0
+        print(f"{mode:<12}{iterations:>12.1f}{elapsed:>12.2f}{error:>14.2e}")
+    print("push模式的iterations为推送轮数（每轮同时推送所有超过阈值的节点；回退为热启动时加上幂迭代次数）")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+标签放置基准测试
+测量 place_labels 在不同候选数下的耗时（检验近线性），
+并在快速绘制模式下比较不绘制标签、绘制全部标签（label_collision关闭）与
+只绘制互不重叠的标签三种情况的导出耗时
+
+用法:
+    python benchmarks/bench_labels.py --candidates 1000 10000 100000 --render-nodes 500 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import generate  # noqa: E402
+from label_placement import place_labels  # noqa: E402
+from pagerank_renderer import LayoutAlgorithm, PageRankRenderer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='标签放置基准测试')
+    parser.add_argument('--candidates', type=int, nargs='+', default=[1000, 10000, 100000], help='候选标签数列表')
+    parser.add_argument('--render-nodes', type=int, nargs='+', default=[500, 2000], help='导出测试的节点数列表')
+    parser.add_argument('--family', default='modules', help='合成图结构')
+    args = parser.parse_args()
+
+    # 1200×800像素的画布上随机分布的候选，标签约 60×12 像素
+    rng = np.random.default_rng(0)
+    print(f"{'candidates':>12}{'placed':>10}{'time':>12}{'per label':>12}")
+    for m in args.candidates:
+        points = rng.random((m, 2)) * (1200, 800)
+        widths = rng.uniform(30, 90, m)
+        heights = np.full(m, 12.0)
+        start = time.perf_counter()
+        placed, _ = place_labels(points, widths, heights, offsets=8.0, bounds=(0, 0, 1200, 800))
+        elapsed = time.perf_counter() - start
+        print(f"{m:>12}{len(placed):>10}{elapsed * 1000:>10.1f}ms{elapsed / m * 1e6:>10.2f}us")
+
+    print(f"\n{'nodes':>10}{'mode':>12}{'labels':>8}{'export':>10}")
+    modes = {'none': {'show_labels': False}, 'all': {}, 'collision': {'label_collision': True}}
+    for n in args.render_nodes:
+        data = generate(args.family, n, seed=0).to_dict()
+        for mode, options in modes.items():
+            renderer = PageRankRenderer({'layout': LayoutAlgorithm.BARNES_HUT, 'fast_draw_threshold': 0,
+                                         'fast_label_limit': n, 'lod_budget': None, **options})
+            renderer.load_json_from_dict(data)
+            renderer.calculate_pagerank()
+            renderer.apply_layout()
+            with tempfile.TemporaryDirectory() as directory:
+                start = time.perf_counter()
+                fig = renderer.render()
+                labels = len(fig.axes[0].texts)
+                fig.savefig(os.path.join(directory, 'graph.png'), dpi=100)
+                elapsed = time.perf_counter() - start
+            print(f"{n:>10}{mode:>12}{labels:>8}{elapsed:>9.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+分层布局伸缩性基准测试
+在带少量回边的深层调用图上统计各规模的总耗时与层数
+
+用法:
+    python benchmarks/bench_layered.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layered_layout import layered_layout  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分层布局基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='节点数量列表')
+    parser.add_argument('--edges-per-node', type=int, default=3, help='平均出度')
+    parser.add_argument('--back-edges', type=float, default=0.02, help='回边（成环）比例')
+    parser.add_argument('--method', choices=['barycenter', 'median'], default='barycenter',
+                        help='交叉减少方法')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'nodes':>10}{'edges':>10}{'layers':>10}{'total(s)':>12}{'per node(us)':>15}")
+    for n in args.sizes:
+        m = n * args.edges_per_node
+        # 调用方索引较小、被调用方索引较大，形成较深的层次结构
+        sources = rng.integers(0, n, m)
+        targets = np.minimum(sources + rng.geometric(0.02, m), n - 1)
+        back = rng.random(m) < args.back_edges
+        sources[back], targets[back] = targets[back], sources[back]
+
+        start = time.perf_counter()
+        _, layers = layered_layout(n, sources, targets, method=args.method)
+        elapsed = time.perf_counter() - start
+
+        print(f"{n:>10}{m:>10}{layers.max() + 1:>10}{elapsed:>12.2f}{elapsed / n * 1e6:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Barnes-Hut力导向布局伸缩性基准测试
+统计不同规模下单次迭代的耗时，并与 n·log n 的增长趋势对比
+
+用法:
+    python benchmarks/bench_layout.py --sizes 1000 10000 100000 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from force_layout import force_directed_layout  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Barnes-Hut力导向布局基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 200000],
+                        help='节点数量列表')
+    parser.add_argument('--edges-per-node', type=int, default=2, help='平均出度')
+    parser.add_argument('--iterations', type=int, default=10, help='布局迭代次数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'nodes':>10}{'total(s)':>12}{'per iter(ms)':>15}{'/ n·log2 n (ns)':>18}")
+    for n in args.sizes:
+        sources = rng.integers(0, n, n * args.edges_per_node)
+        targets = rng.integers(0, n, n * args.edges_per_node)
+
+        start = time.perf_counter()
+        force_directed_layout(n, sources, targets, iterations=args.iterations,
+                              seed=args.seed, tolerance=0.0)
+        elapsed = time.perf_counter() - start
+
+        per_iteration = elapsed / args.iterations
+        normalized = per_iteration / (n * np.log2(n)) * 1e9
+        print(f"{n:>10}{elapsed:>12.2f}{per_iteration * 1000:>15.1f}{normalized:>18.1f}")
+    print("最后一列大致保持不变即表示耗时按 n·log n 增长")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+快照序列基准测试
+在逐步增长（并删除少量节点）的合成图序列上比较热启动与独立计算：
+PageRank迭代次数、加载与计算（PageRank和布局）的耗时，以及保留节点在相邻帧之间的平均位移（相对布局范围）
+
+用法:
+    python benchmarks/bench_series.py --nodes 5000 --snapshots 5 --growth 0.03
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import generate  # noqa: E402
+from pagerank_renderer import LayoutAlgorithm  # noqa: E402
+from snapshot_series import SnapshotSeries, match_nodes  # noqa: E402
+
+
+def evolving_snapshots(family, num_nodes, snapshots, growth, removal, seed=0):
+    """
+    生成快照序列：最终图的前若干节点导出的子图，每个快照增加 growth 比例的节点，
+    并随机删除 removal 比例的已有节点
+
+    Returns:
+        JSON字典列表
+    """
+    final = generate(family, int(num_nodes * (1 + growth) ** (snapshots - 1)) + 1, seed=seed).to_dict()
+    nodes, edges = final['graph']['nodes'], final['graph']['edges']
+    rng = np.random.default_rng(seed)
+    alive = np.ones(len(nodes), dtype=bool)
+    series = []
+    for k in range(snapshots):
+        size = int(num_nodes * (1 + growth) ** k)
+        if k:
+            existing = np.flatnonzero(alive[:size])
+            alive[rng.choice(existing, size=int(len(existing) * removal), replace=False)] = False
+        present = {node['id'] for node, keep in zip(nodes[:size], alive[:size]) if keep}
+        series.append({
+            'metadata': final['metadata'],
+            'graph': {
+                'nodes': [node for node in nodes[:size] if node['id'] in present],
+                'edges': [edge for edge in edges if edge['source'] in present and edge['target'] in present]
+            }
+        })
+    return series
+
+
+def run(snapshots, config, warm_start):
+    """依次计算每个快照，返回每帧的节点数、迭代次数、加载与计算耗时和相对位移"""
+    series = SnapshotSeries(config, warm_start=warm_start)
+    rows = []
+    previous_positions = None
+    for snapshot in snapshots:
+        previous = series.previous
+        start = time.perf_counter()
+        renderer = series.advance(snapshot)
+        elapsed = time.perf_counter() - start
+        positions = series._previous_positions
+
+        displacement = float('nan')
+        if previous is not None:
+            matched = match_nodes(previous, renderer)
+            kept = matched >= 0
+            extent = np.ptp(positions, axis=0).max()
+            displacement = np.linalg.norm(positions[kept] - previous_positions[matched[kept]], axis=1).mean() / extent
+        rows.append((renderer.store.num_nodes, renderer.pagerank_values.iterations,
+                     elapsed, displacement))
+        previous_positions = positions
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='快照序列基准测试')
+    parser.add_argument('--nodes', type=int, default=5000, help='第一个快照的节点数')
+    parser.add_argument('--snapshots', type=int, default=5, help='快照数量')
+    parser.add_argument('--growth', type=float, default=0.03, help='每个快照新增节点的比例')
+    parser.add_argument('--removal', type=float, default=0.005, help='每个快照删除节点的比例')
+    parser.add_argument('--family', default='power_law', help='合成图结构')
+    parser.add_argument('--layout', default='barnes_hut', choices=['barnes_hut', 'force_directed'], help='布局算法')
+    args = parser.parse_args()
+
+    snapshots = evolving_snapshots(args.family, args.nodes, args.snapshots, args.growth, args.removal)
+    config = {'layout': LayoutAlgorithm(args.layout), 'tolerance': 1e-8}
+    results = {mode: run(snapshots, config, mode == 'warm') for mode in ('cold', 'warm')}
+
+    print(f"{'frame':>6}{'nodes':>8}{'cold iter':>11}{'warm iter':>11}"
+          f"{'cold time':>11}{'warm time':>11}{'cold move':>11}{'warm move':>11}")
+    for k, (cold, warm) in enumerate(zip(results['cold'], results['warm'])):
+        print(f"{k:>6}{cold[0]:>8}{cold[1]:>11}{warm[1]:>11}{cold[2]:>10.2f}s{warm[2]:>10.2f}s"
+              f"{cold[3]:>11.4f}{warm[3]:>11.4f}")
+
+
+if __name__ == '__main__':
+    main()
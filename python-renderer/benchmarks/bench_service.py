@@ -0,0 +1,112 @@
+"""
+本地渲染服务负载基准测试
+在本进程中启动HTTP服务，并发发送小图请求（可同时持续发送大图渲染请求占用批量通道），
+输出小图请求的延迟分位数、被拒绝（503）的数量与请求合并次数
+
+用法:
+    python benchmarks/bench_service.py --clients 16 --requests 400 --background 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import generate  # noqa: E402
+from render_service import RenderService  # noqa: E402
+
+
+async def post(port: int, body: bytes):
+    """发送一个 POST /render 请求，返回 (状态码, 响应)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"POST /render HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, payload = data.partition(b'\r\n\r\n')
+    return int(head.split(b' ')[1]), json.loads(payload)
+
+
+def percentile(values, q):
+    """分位数（values已排序）"""
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float('nan')
+
+
+async def run(args):
+    service = RenderService(workers=args.workers, interactive_workers=args.interactive_workers,
+                            max_pending=args.max_pending, cache_entries=args.cache_entries)
+    await service.start()
+    server = asyncio.create_task(service.serve_http('127.0.0.1', args.port))
+    await asyncio.sleep(0.1)
+
+    # 小图请求：distinct 张不同的图循环使用，相同的并发请求会被合并
+    bodies = [json.dumps({'data': generate('modules', args.nodes, seed).to_dict(),
+                          'outputs': args.outputs}).encode('utf-8') for seed in range(args.distinct)]
+    big = json.dumps({'data': generate('power_law', args.background_nodes, 0).to_dict(),
+                      'outputs': ['png'], 'dpi': 50}).encode('utf-8')
+
+    latencies, statuses = [], []
+    counter = iter(range(args.requests))
+    stop = asyncio.Event()
+
+    async def client():
+        for i in counter:
+            start = time.perf_counter()
+            status, _ = await post(args.port, bodies[i % len(bodies)])
+            statuses.append(status)
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+
+    async def background(seed):
+        while not stop.is_set():
+            # 每次略微改动配置使请求不被缓存
+            body = big.replace(b'"dpi": 50', f'"dpi": {50 + seed}'.encode('ascii'))
+            await post(args.port, body)
+            seed += args.background
+
+    start = time.perf_counter()
+    loaders = [asyncio.create_task(background(k)) for k in range(args.background)]
+    await asyncio.gather(*[client() for _ in range(args.clients)])
+    elapsed = time.perf_counter() - start
+    # 等待后台请求完成当前的渲染后再关闭服务
+    stop.set()
+    await asyncio.gather(*loaders)
+    server.cancel()
+    service.close()
+
+    latencies.sort()
+    print(f"{len(statuses)} 个请求，{elapsed:.2f}s（{len(statuses) / elapsed:.0f} 请求/秒）")
+    print(f"成功 {statuses.count(200)}，拒绝(503) {statuses.count(503)}，其他 "
+          f"{len(statuses) - statuses.count(200) - statuses.count(503)}")
+    print(f"延迟 p50 {percentile(latencies, 0.5) * 1000:.1f}ms  p95 {percentile(latencies, 0.95) * 1000:.1f}ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f}ms")
+    stats = service.stats()
+    print(f"合并 {stats['coalesced']}，结果缓存命中 {stats['cache_hits']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地渲染服务负载基准测试')
+    parser.add_argument('--clients', type=int, default=16, help='并发客户端数')
+    parser.add_argument('--requests', type=int, default=400, help='小图请求总数')
+    parser.add_argument('--nodes', type=int, default=50, help='小图节点数')
+    parser.add_argument('--distinct', type=int, default=100, help='不同小图的数量')
+    parser.add_argument('--outputs', nargs='+', default=['pagerank', 'positions'], help='小图请求的输出')
+    parser.add_argument('--background', type=int, default=1, help='持续发送大图渲染请求的客户端数')
+    parser.add_argument('--background-nodes', type=int, default=20000, help='大图节点数')
+    parser.add_argument('--workers', type=int, default=None, help='批量通道的进程数')
+    parser.add_argument('--interactive-workers', type=int, default=2, help='交互通道的进程数')
+    parser.add_argument('--max-pending', type=int, default=32, help='每条通道的待处理请求上限')
+    parser.add_argument('--cache-entries', type=int, default=0, help='结果LRU的条目数')
+    parser.add_argument('--port', type=int, default=18765, help='端口')
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+样式数组基准测试
+比较逐节点的Python循环（原 _draw_nodes / _draw_edges / _add_legend 的实现方式）
+与向量化样式计算的耗时，以及缓存命中时的耗时
+
+用法:
+    python benchmarks/bench_styles.py --nodes 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import generate  # noqa: E402
+from pagerank_renderer import PageRankRenderer  # noqa: E402
+
+
+def legacy_styles(renderer: PageRankRenderer) -> None:
+    """按原实现逐节点、逐边计算PageRank大小、类型颜色、权重线宽与图例中的类型"""
+    graph = renderer.graph
+    config = renderer.config
+    values = [renderer.pagerank_values[node] for node in graph.nodes()]
+    low, high = min(values), max(values)
+    [config['node_min_size'] + (v - low) / (high - low) * (config['node_max_size'] - config['node_min_size'])
+     for v in values]
+    [renderer.type_color_map.get(graph.nodes[node].get('type', 'unknown'), 'gray') for node in graph.nodes()]
+    weights = [graph[u][v].get('weight', 1.0) for u, v in graph.edges()]
+    low, high = min(weights), max(weights)
+    [config['edge_min_width'] + (w - low) / max(high - low, 1e-12) * (config['edge_max_width'] - config['edge_min_width'])
+     for w in weights]
+    [any(graph.nodes[node].get('type') == node_type for node in graph.nodes())
+     for node_type in renderer.type_color_map]
+
+
+def timed(function) -> float:
+    """调用函数并返回耗时（秒）"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='样式数组基准测试')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10000, 100000, 1000000], help='节点数量列表')
+    parser.add_argument('--family', default='power_law', help='合成图结构')
+    parser.add_argument('--legacy-limit', type=int, default=200000, help='超过该节点数时跳过逐节点实现')
+    args = parser.parse_args()
+
+    print(f"{'nodes':>10}{'edges':>10}{'legacy':>10}{'arrays':>10}{'cached':>10}")
+    for n in args.nodes:
+        renderer = PageRankRenderer()
+        renderer.load_json_from_dict(generate(args.family, n, seed=0).to_dict())
+        renderer.calculate_pagerank()
+
+        legacy = float('nan')
+        if n <= args.legacy_limit:
+            renderer.graph  # NetworkX视图的构建不计入
+            legacy = timed(lambda: legacy_styles(renderer))
+        arrays = timed(renderer._style_arrays)
+        cached = timed(renderer._style_arrays)
+        print(f"{n:>10}{renderer.store.num_edges:>10}{legacy:>9.3f}s{arrays:>9.3f}s{cached * 1e6:>8.1f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+渲染流水线基准测试套件
+对每种合成图结构与规模，在独立进程中运行 PageRankRenderer 的各阶段与
+PageRankVisualizer 的迭代，记录耗时与峰值RSS，并可与保存的基线对比标记性能回退
+
+用法:
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 1000000 --output results.json
+    python benchmarks/bench_suite.py --sizes 1000 10000 --save-baseline baseline.json
+    python benchmarks/bench_suite.py --sizes 1000 10000 --baseline baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+import matplotlib
+matplotlib.use('Agg')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import GENERATORS, generate  # noqa: E402
+
+# 报告中的阶段：名称 -> 对应的剖析阶段
+STAGES = {
+    'load_json': ('load_json',),
+    'calculate_pagerank': ('calculate_pagerank',),
+    'apply_layout': ('apply_layout',),
+    'level_of_detail': ('level_of_detail',),
+    'draw': ('draw_fast', 'draw_edges', 'draw_nodes', 'draw_labels', 'add_legend', 'tight_layout'),
+    'savefig': ('savefig',),
+}
+
+
+def graph_path(data_dir: str, family: str, num_nodes: int, seed: int) -> str:
+    """生成（或复用已生成的）图文件，返回路径"""
+    path = os.path.join(data_dir, f"{family}-{num_nodes}-{seed}.json")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        generate(family, num_nodes, seed).write_json(temporary)
+        os.replace(temporary, path)
+    return path
+
+
+def run_case(path: str, config: Dict[str, Any], dpi: int, visualizer_iterations: int) -> Dict[str, Any]:
+    """
+    在当前（独立的）进程中运行一个测试用例
+
+    Returns:
+        {'nodes', 'edges', 'stages': {阶段: {'time', 'rss'}}}
+    """
+    import numpy as np
+    from pagerank_example import PageRankVisualizer
+    from pagerank_renderer import PageRankRenderer
+    from profiling import Profiler
+    from sparse_matrix import CSRMatrix
+
+    renderer = PageRankRenderer(config)
+    renderer.profiler = Profiler()
+    renderer.load_json(path)
+    with tempfile.TemporaryDirectory() as output_dir:
+        renderer.export(os.path.join(output_dir, 'graph.png'), dpi=dpi)
+
+        # 细节层次视图中 render 会嵌套，每个阶段只统计最外层的记录
+        stages = {}
+        for stage, names in STAGES.items():
+            records = [record for record in renderer.profiler.report
+                       if record.name in names and record.path.split('/').count(record.name) == 1]
+            if records:
+                stages[stage] = {
+                    'time': sum(record.duration for record in records),
+                    'rss': max(record.rss_peak or 0 for record in records)
+                }
+
+        # 可视化器的稀疏迭代，迭代历史写入帧流而不是保存在内存中
+        store = renderer.store
+        adjacency = CSRMatrix.from_edges(store.src, store.dst, store.num_nodes, store.weight)
+        visualizer = PageRankVisualizer(max_iterations=visualizer_iterations, sparse=True)
+        with visualizer.stream_history(os.path.join(output_dir, 'history.prf'), store.labels):
+            with renderer.profiler.span('visualizer_iterate') as record:
+                visualizer.iterate_pagerank(adjacency, np.full(store.num_nodes, 1.0 / store.num_nodes))
+        stages['visualizer_iterate'] = {'time': record.duration, 'rss': record.rss_peak or 0}
+
+    return {'nodes': store.num_nodes, 'edges': store.num_edges, 'stages': stages}
+
+
+def run_suite(families: List[str], sizes: List[int], seed: int, data_dir: str, config: Dict[str, Any],
+              dpi: int, visualizer_iterations: int, stream=sys.stdout) -> Dict[str, Any]:
+    """
+    依次运行全部测试用例，每个用例使用新的进程，峰值RSS互不影响
+
+    Returns:
+        结果字典，cases 中每项包含图结构、规模与各阶段的耗时和峰值RSS
+    """
+    cases = []
+    for num_nodes in sizes:
+        for family in families:
+            path = graph_path(data_dir, family, num_nodes, seed)
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                result = pool.submit(run_case, path, config, dpi, visualizer_iterations).result()
+            result.update({'family': family, 'size': num_nodes, 'wall_time': time.perf_counter() - start})
+            cases.append(result)
+            print_case(result, stream)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': seed,
+        'cases': cases
+    }
+
+
+def print_case(case: Dict[str, Any], stream=sys.stdout) -> None:
+    """输出一个用例各阶段的耗时与峰值RSS"""
+    print(f"{case['family']} n={case['nodes']} m={case['edges']} ({case['wall_time']:.1f}s)", file=stream)
+    for stage, value in case['stages'].items():
+        print(f"    {stage:<22}{value['time']:>10.3f}s{value['rss'] / 2 ** 20:>10.0f}MB", file=stream)
+    stream.flush()
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_time: float,
+            min_rss: int) -> List[Dict[str, Any]]:
+    """
+    与基线对比，找出耗时或峰值RSS超过基线 (1 + threshold) 倍的阶段
+
+    绝对差值小于 min_time 秒或 min_rss 字节的变化视为噪声，不计为回退。
+
+    Args:
+        results: 本次结果
+        baseline: 基线结果
+        threshold: 允许的相对增长
+        min_time: 耗时回退的最小绝对差值
+        min_rss: 内存回退的最小绝对差值
+
+    Returns:
+        回退列表
+    """
+    base_cases = {(case['family'], case['size']): case for case in baseline['cases']}
+    regressions = []
+    for case in results['cases']:
+        base = base_cases.get((case['family'], case['size']))
+        if base is None:
+            continue
+        for stage, value in case['stages'].items():
+            reference = base['stages'].get(stage)
+            if reference is None:
+                continue
+            for metric, floor in (('time', min_time), ('rss', min_rss)):
+                old, new = reference[metric], value[metric]
+                if new > old * (1 + threshold) and new - old > floor:
+                    regressions.append({
+                        'family': case['family'], 'size': case['size'], 'stage': stage,
+                        'metric': metric, 'baseline': old, 'current': new,
+                        'ratio': new / old if old else float('inf')
+                    })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='渲染流水线基准测试套件')
+    parser.add_argument('--families', nargs='+', default=list(GENERATORS), choices=list(GENERATORS),
+                        help='图结构列表')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000],
+                        help='节点数量列表')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'pagerank-bench'),
+                        help='生成的图文件目录，已存在的文件直接复用')
+    parser.add_argument('--layout', default='barnes_hut', help='布局算法')
+    parser.add_argument('--layout-iterations', type=int, default=20, help='布局迭代次数')
+    parser.add_argument('--dpi', type=int, default=100, help='输出图像分辨率')
+    parser.add_argument('--lod-budget', type=int, default=20000, help='细节层次的绘制元素预算，0表示关闭')
+    parser.add_argument('--visualizer-iterations', type=int, default=50, help='可视化器的最大迭代次数')
+    parser.add_argument('--output', default=None, help='结果JSON输出路径')
+    parser.add_argument('--baseline', default=None, help='对比的基线JSON')
+    parser.add_argument('--save-baseline', default=None, help='把本次结果保存为基线')
+    parser.add_argument('--threshold', type=float, default=0.25, help='判定回退的相对增长')
+    parser.add_argument('--min-time', type=float, default=0.05, help='判定耗时回退的最小绝对差值（秒）')
+    parser.add_argument('--min-rss', type=float, default=32, help='判定内存回退的最小绝对差值（MB）')
+    args = parser.parse_args(argv)
+
+    config = {'layout': args.layout, 'layout_iterations': args.layout_iterations,
+              'lod_budget': args.lod_budget or None}
+    from batch_render import load_config
+    results = run_suite(args.families, args.sizes, args.seed, args.data_dir, load_config(config),
+                        args.dpi, args.visualizer_iterations)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_time, int(args.min_rss * 2 ** 20))
+    if not regressions:
+        print(f"与基线 {args.baseline} 相比没有超过 {args.threshold:.0%} 的回退")
+        return 0
+
+    print(f"与基线 {args.baseline} 相比发现 {len(regressions)} 处回退:")
+    for item in regressions:
+        unit = 's' if item['metric'] == 'time' else 'MB'
+        scale = 1 if item['metric'] == 'time' else 2 ** -20
+        print(f"    {item['family']} n={item['size']} {item['stage']} {item['metric']}: "
+              f"{item['baseline'] * scale:.3f}{unit} -> {item['current'] * scale:.3f}{unit} ({item['ratio']:.2f}x)")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
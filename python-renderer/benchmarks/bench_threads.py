@@ -0,0 +1,74 @@
+"""
+多线程稀疏迭代扩展性基准测试
+在同一张图上用1到N个线程运行按行分块的并行乘法与完整的幂迭代，
+输出每次乘法的耗时与相对单线程的加速比，并与单线程的默认实现对比
+
+用法:
+    python benchmarks/bench_threads.py --nodes 1000000 --edges-per-node 10 --threads 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import generate  # noqa: E402
+from pagerank_solvers import PageRankModel, power_iteration  # noqa: E402
+from sparse_matrix import CSRMatrix  # noqa: E402
+
+
+def best_time(function, repeat: int) -> float:
+    """重复调用并返回最短耗时（秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='多线程稀疏迭代扩展性基准测试')
+    parser.add_argument('--nodes', type=int, default=1000000, help='节点数量')
+    parser.add_argument('--edges-per-node', type=float, default=10.0, help='平均出度')
+    parser.add_argument('--family', default='power_law', help='合成图结构')
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help='线程数列表')
+    parser.add_argument('--iterations', type=int, default=30, help='幂迭代的迭代次数')
+    parser.add_argument('--repeat', type=int, default=5, help='乘法计时的重复次数')
+    args = parser.parse_args()
+
+    options = {'edges_per_node': args.edges_per_node} if args.family in ('power_law', 'dangling') else {}
+    graph = generate(args.family, args.nodes, seed=0, **options)
+    adjacency = CSRMatrix.from_edges(graph.sources, graph.targets, graph.num_nodes, graph.weights)
+    model = PageRankModel.from_csr(range(graph.num_nodes), adjacency)
+    print(f"{args.family}: n={graph.num_nodes} m={adjacency.nnz}，CPU核心数 {os.cpu_count()}")
+
+    x = np.full(graph.num_nodes, 1.0 / graph.num_nodes)
+    pt = model.transition_t
+    serial = best_time(lambda: pt.dot(x), args.repeat)
+    # tolerance为0时固定运行iterations次
+    serial_solve = best_time(lambda: power_iteration(model, 0.85, 0.0, args.iterations), 1)
+    print(f"{'默认实现':<12}{'matvec':>12}{serial * 1000:>10.1f}ms{'':>10}"
+          f"{'power':>10}{serial_solve:>10.3f}s")
+
+    # 乘法的加速比相对单线程的分块内核，幂迭代的加速比相对默认实现
+    base = None
+    out = np.empty(graph.num_nodes)
+    for threads in args.threads:
+        kernel = model.parallel_transition_t(threads)
+        elapsed = best_time(lambda: kernel.dot(x, out), args.repeat)
+        solve_time = best_time(lambda: power_iteration(model, 0.85, 0.0, args.iterations,
+                                                       threads=threads), 1) if threads > 1 else serial_solve
+        base = base or elapsed
+        print(f"{f'{threads} 线程':<12}{'matvec':>12}{elapsed * 1000:>10.1f}ms{base / elapsed:>9.2f}x"
+              f"{'power':>10}{solve_time:>10.3f}s{serial_solve / solve_time:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+瓦片金字塔导出基准测试
+对每种规模的合成图计算PageRank与Barnes-Hut布局后导出瓦片金字塔，
+输出各工作进程数下的瓦片数、耗时与吞吐量
+
+用法:
+    python benchmarks/bench_tiles.py --nodes 10000 100000 --workers 1 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import generate  # noqa: E402
+from pagerank_renderer import LayoutAlgorithm, PageRankRenderer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='瓦片金字塔导出基准测试')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10000, 100000], help='节点数量列表')
+    parser.add_argument('--family', default='power_law', help='合成图结构')
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, os.cpu_count() or 1}),
+                        help='工作进程数列表')
+    parser.add_argument('--max-zoom', type=int, default=None, help='最大层级（默认按节点数估计）')
+    parser.add_argument('--tile-size', type=int, default=256, help='瓦片边长（像素）')
+    args = parser.parse_args()
+
+    print(f"{'nodes':>10}{'edges':>10}{'workers':>9}{'zoom':>6}{'tiles':>8}{'time':>10}{'tiles/s':>10}")
+    for n in args.nodes:
+        renderer = PageRankRenderer({'layout': LayoutAlgorithm.BARNES_HUT})
+        renderer.load_json_from_dict(generate(args.family, n, seed=0).to_dict())
+        renderer.calculate_pagerank()
+        renderer.apply_layout()
+
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as directory:
+                start = time.perf_counter()
+                manifest = renderer.export_tiles(directory, max_zoom=args.max_zoom, tile_size=args.tile_size,
+                                                 workers=workers)
+                elapsed = time.perf_counter() - start
+            tiles = sum(manifest['tiles'])
+            print(f"{n:>10}{renderer.store.num_edges:>10}{workers:>9}{manifest['max_zoom']:>6}{tiles:>8}"
+                  f"{elapsed:>9.2f}s{tiles / elapsed:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
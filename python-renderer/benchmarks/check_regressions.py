@@ -0,0 +1,327 @@
+"""
+回归检查
+在边界输入上运行渲染与计算流程，检查已修复的问题不再出现；任一检查失败时以非零状态退出
+
+用法:
+    python benchmarks/check_regressions.py
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import tempfile
+import tracemalloc
+from typing import Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_render  # noqa: E402
+import pagerank_solvers  # noqa: E402
+from history_animation import HistoryAnimator  # noqa: E402
+from pagerank_example import PageRankVisualizer  # noqa: E402
+from pagerank_renderer import NodeColorStrategy, PageRankRenderer  # noqa: E402
+from render_service import RenderService  # noqa: E402
+from sparse_matrix import CSRMatrix  # noqa: E402
+
+
+def check_edgeless_graphs() -> None:
+    """没有边的图（单节点、孤立节点）得到均匀的PageRank并能导出"""
+    for num_nodes in (1, 3):
+        renderer = PageRankRenderer()
+        renderer.load_json_from_dict({
+            'metadata': {},
+            'graph': {'nodes': [{'id': f'n{i}'} for i in range(num_nodes)], 'edges': []}
+        })
+        pagerank = renderer.get_pagerank_values()
+        # 公开的取值接口返回可以序列化、修改的普通字典
+        assert type(pagerank) is dict and json.loads(json.dumps(pagerank)) == pagerank
+        values = np.array([pagerank[f'n{i}'] for i in range(num_nodes)])
+        assert np.allclose(values, 1.0 / num_nodes), values
+        assert np.allclose(renderer.get_pagerank_result().array, values)
+        with tempfile.TemporaryDirectory() as directory:
+            renderer.export(os.path.join(directory, 'graph.png'), dpi=50)
+
+    for adjacency in (np.zeros((3, 3)), []):
+        visualizer = PageRankVisualizer(sparse=True)
+        result = visualizer.iterate_pagerank(adjacency, visualizer.initialize_pagerank(3))
+        assert np.allclose(result, 1.0 / 3), result
+
+
+_render_one = batch_render._render_one
+
+
+def _crashing_render_one(source, output, dpi):
+    """渲染 crash.json 时直接结束工作进程，模拟内存不足被杀或段错误"""
+    if os.path.basename(source) == 'crash.json':
+        if batch_render._started is not None:
+            batch_render._started.put(source)
+        os._exit(1)
+    return _render_one(source, output, dpi)
+
+
+def check_batch_worker_crash() -> None:
+    """批量渲染中一个工作进程崩溃只记为该文件的失败"""
+    data = {'metadata': {}, 'graph': {'nodes': [{'id': 'a'}, {'id': 'b'}],
+                                      'edges': [{'source': 'a', 'target': 'b'}]}}
+    # 工作进程按名称查找任务函数，替换模块属性后fork出的进程使用同一个函数
+    _crashing_render_one.__module__, _crashing_render_one.__qualname__ = 'batch_render', '_render_one'
+    batch_render._render_one = _crashing_render_one
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for name in [f'g{i}' for i in range(8)] + ['crash']:
+                with open(os.path.join(directory, f'{name}.json'), 'w') as f:
+                    json.dump(data, f)
+            jobs = batch_render.collect_jobs([directory], os.path.join(directory, 'out'), 'png')
+            with open(os.devnull, 'w') as stream:
+                summary = batch_render.run_batch(jobs, {}, 2, 50, stream=stream)
+    finally:
+        batch_render._render_one = _render_one
+    assert summary['succeeded'] == 8 and [os.path.basename(f[0]) for f in summary['failures']] == ['crash.json'], \
+        summary['failures']
+
+
+async def _service_after_worker_kill() -> list:
+    service = RenderService(workers=1, interactive_workers=1)
+    try:
+        await service.start()
+        for pid in list(service.interactive.executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        await asyncio.sleep(0.5)
+        requests = [{'id': k, 'metadata': {}, 'graph': {'nodes': [{'id': f'a{k}'}, {'id': 'b'}],
+                                                         'edges': [{'source': f'a{k}', 'target': 'b'}]}}
+                    for k in range(3)]
+        return await asyncio.gather(*[service.handle(request) for request in requests])
+    finally:
+        service.close()
+
+
+async def _service_after_failed_submit() -> Tuple[int, list]:
+    service = RenderService(workers=1, interactive_workers=1)
+    try:
+        await service.start()
+        lane = service.interactive
+        working = lane.executor
+        # 已关闭的进程池在提交时抛出RuntimeError，不会注册完成回调
+        closed = lane._new_executor()
+        closed.shutdown()
+        lane.executor = closed
+        graph = {'metadata': {}, 'graph': {'nodes': [{'id': 'a'}, {'id': 'b'}],
+                                           'edges': [{'source': 'a', 'target': 'b'}]}}
+        failed = await asyncio.gather(*[service.handle({'id': k, **graph}) for k in range(lane.max_pending)])
+        pending = lane.pending
+        lane.executor = working
+        return pending, failed + [await service.handle({'id': 'after', **graph})]
+    finally:
+        service.close()
+
+
+def check_service_failed_submit() -> None:
+    """提交到进程池失败时归还通道名额，之后的请求仍能得到处理"""
+    pending, responses = asyncio.run(_service_after_failed_submit())
+    assert pending == 0, pending
+    assert not any(response['ok'] for response in responses[:-1]) and responses[-1]['ok'], responses
+
+
+def check_service_worker_kill() -> None:
+    """渲染服务的工作进程被杀后，后续请求由新的进程池处理"""
+    responses = asyncio.run(_service_after_worker_kill())
+    assert all(response['ok'] for response in responses), responses
+
+
+def check_animation_from_generator() -> None:
+    """给出value_range时，一次性的帧生成器只遍历一次，全部帧都写入动画"""
+    rng = np.random.default_rng(0)
+    history = [rng.dirichlet(np.ones(5)) for _ in range(6)]
+    animator = HistoryAnimator(rng.random((5, 2)), [0, 1, 2], [1, 2, 3], dpi=40)
+    with tempfile.TemporaryDirectory() as directory:
+        count = animator.animate((frame for frame in history), directory, value_range=(0.0, 1.0))
+        assert count == 6 and len(os.listdir(directory)) == 6, count
+
+
+def check_threaded_iteration_allocations() -> None:
+    """多线程幂迭代未启用加速时，每次迭代（含残差计算）不分配新的向量"""
+    n = 50000
+    rng = np.random.default_rng(0)
+    # 一半节点没有出边，悬挂节点质量的计算也在检查范围内
+    sources = rng.integers(0, n // 2, 4 * n)
+    targets = rng.integers(0, n, 4 * n)
+    model = pagerank_solvers.PageRankModel.from_csr(range(n), CSRMatrix.from_edges(sources, targets, n))
+    model.parallel_transition_t(2)
+
+    peaks = []
+    accelerated_iteration = pagerank_solvers.accelerated_iteration
+
+    def measured(step, *args, **kwargs):
+        # 记录相邻两次调用G之间的内存峰值增量，即一次完整迭代的临时分配
+        def wrapped(x):
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+            tracemalloc.reset_peak()
+            return step(x)
+        return accelerated_iteration(wrapped, *args, **kwargs)
+
+    pagerank_solvers.accelerated_iteration = measured
+    tracemalloc.start()
+    try:
+        pagerank_solvers.power_iteration(model, 0.85, 1e-15, 20, threads=2)
+    finally:
+        tracemalloc.stop()
+        pagerank_solvers.accelerated_iteration = accelerated_iteration
+    assert max(peaks[2:]) < n * 8 // 4, peaks
+
+
+def check_opt_in_defaults() -> None:
+    """改变已有输出的功能默认关闭：默认配置下不生成细节层次视图，每个节点都绘制标签"""
+    renderer = PageRankRenderer()
+    renderer.load_json_from_dict({'metadata': {}, 'graph': {
+        'nodes': [{'id': f'n{i}'} for i in range(30)],
+        'edges': [{'source': f'n{i}', 'target': f'n{(i + 1) % 30}'} for i in range(30)]
+    }})
+    renderer.calculate_pagerank()
+    renderer.apply_layout()
+    assert renderer.config['lod_budget'] is None and renderer.level_of_detail() is None
+    fig = renderer.render()
+    assert len(fig.axes[0].texts) == 30, len(fig.axes[0].texts)
+
+
+def check_frozen_graph_view() -> None:
+    """就地修改NetworkX视图会报错，复制修改后重新赋值才会生效"""
+    import networkx as nx
+
+    renderer = PageRankRenderer()
+    renderer.load_json_from_dict({'metadata': {}, 'graph': {'nodes': [{'id': 'a'}, {'id': 'b'}],
+                                                            'edges': [{'source': 'a', 'target': 'b'}]}})
+    try:
+        renderer.graph.add_edge('b', 'c')
+    except nx.NetworkXError:
+        pass
+    else:
+        raise AssertionError("冻结的视图被就地修改")
+
+    graph = nx.DiGraph(renderer.graph)
+    graph.add_edge('b', 'c')
+    renderer.graph = graph
+    pagerank = renderer.get_pagerank_values()
+    assert set(pagerank) == {'a', 'b', 'c'} and pagerank['c'] > pagerank['a'], pagerank
+
+
+def check_fast_draw_arrow_geometry() -> None:
+    """快速绘制添加颜色条、tight_layout并以其他dpi保存后，箭头尖端仍在目标节点边缘外的间隙处"""
+    n = 40
+    renderer = PageRankRenderer({'fast_draw_threshold': 0, 'node_color': NodeColorStrategy.PAGERANK,
+                                 'show_labels': False})
+    renderer.load_json_from_dict({'metadata': {}, 'graph': {
+        'nodes': [{'id': f'n{i}'} for i in range(n)],
+        'edges': [{'source': f'n{i}', 'target': f'n{(i * 7 + 3) % n}'} for i in range(n)]
+    }})
+    fig = renderer.render()
+    fig.set_dpi(150)
+    fig.canvas.draw()
+    ax = fig.axes[0]
+    edges = ax.collections[0]
+
+    positions = np.array([renderer.node_positions[node] for node in renderer.store.node_ids])
+    sizes = renderer._style_arrays().node_sizes
+    targets = renderer.store.dst
+    tips = ax.transData.transform(np.array([segment[-2] for segment in edges.get_segments()]))
+    distance = np.sqrt(((tips - ax.transData.transform(positions[targets])) ** 2).sum(axis=1))
+    pixels_per_point = fig.dpi / 72.0
+    expected = (np.sqrt(sizes[targets]) / 2 + 2) * pixels_per_point
+    assert np.abs(distance - expected).max() < 1.5, np.abs(distance - expected).max()
+
+
+def check_linear_solvers() -> None:
+    """Gauss-Seidel与GMRES求解结果与幂迭代一致，GMRES报告实际迭代次数并受max_iterations限制"""
+    n = 2000
+    rng = np.random.default_rng(1)
+    sources = (rng.pareto(1.2, 8 * n) * 20).astype(np.int64) % n
+    targets = rng.integers(0, n, 8 * n)
+    model = pagerank_solvers.PageRankModel.from_csr(range(n), CSRMatrix.from_edges(sources, targets, n))
+    reference = pagerank_solvers.power_iteration(model, 0.85, 1e-13, 1000).array
+
+    for method in (pagerank_solvers.SolverMethod.GAUSS_SEIDEL, pagerank_solvers.SolverMethod.LINEAR):
+        result = pagerank_solvers.solve_pagerank(model, method, tolerance=1e-10, max_iterations=500)
+        assert result.converged and 1 < result.iterations < 500, (method, result.iterations)
+        assert np.abs(result.array - reference).sum() < 1e-5, (method, np.abs(result.array - reference).sum())
+
+    limited = pagerank_solvers.solve_pagerank(model, pagerank_solvers.SolverMethod.LINEAR,
+                                              tolerance=1e-14, max_iterations=5)
+    assert not limited.converged and limited.iterations == 5, limited.iterations
+
+
+def check_residual_push() -> None:
+    """局部残差推送（含回退为热启动的情况）与从头求解的结果一致"""
+    n = 400
+    rng = np.random.default_rng(2)
+    sources = rng.integers(0, n, 5 * n)
+    targets = (rng.zipf(1.8, 5 * n) - 1) % n
+    edges = [{'source': f'n{s}', 'target': f'n{t}'} for s, t in zip(sources.tolist(), targets.tolist())]
+    data = {'metadata': {}, 'graph': {'nodes': [{'id': f'n{i}'} for i in range(n)], 'edges': edges}}
+    delta = {'add_nodes': [{'id': 'new'}],
+             'add_edges': [{'source': 'new', 'target': 'n3'}, {'source': 'n5', 'target': 'new'}]}
+
+    for damping in (0.85, 0.95):
+        config = {'damping_factor': damping, 'tolerance': 1e-8, 'max_iterations': 1000}
+        renderer = PageRankRenderer(config)
+        renderer.load_json_from_dict(data)
+        renderer.calculate_pagerank()
+        old_values = renderer.pagerank_values.array
+        old_model = renderer._pagerank_model
+        store, remap = renderer.store.apply_delta(delta)
+        model = pagerank_solvers.PageRankModel.from_store(store)
+        reference = pagerank_solvers.power_iteration(model, damping, 1e-15, 5000).array
+
+        kept = remap >= 0
+        y0 = np.zeros(store.num_nodes)
+        y0[remap[kept]] = pagerank_solvers.unnormalized_scores(old_values, old_model.dangling, damping)[kept]
+        affected = renderer.store.affected_nodes(store, remap, delta)
+        for frontier_limit in (0.1, np.inf):
+            result = pagerank_solvers.residual_push(model, damping, 1e-8, y0, affected, 1000, frontier_limit)
+            assert result.converged and np.abs(result.array - reference).sum() < 1e-4, \
+                (damping, frontier_limit, np.abs(result.array - reference).sum())
+
+
+def check_null_metadata() -> None:
+    """"metadata": null 的文件与字典两种加载方式都接受，缺少metadata字段时都拒绝"""
+    graph = {'nodes': [{'id': 'a'}, {'id': 'b'}], 'edges': [{'source': 'a', 'target': 'b'}]}
+    with tempfile.TemporaryDirectory() as directory:
+        for document, accepted in (({'metadata': None, 'graph': graph}, True), ({'graph': graph}, False)):
+            path = os.path.join(directory, 'graph.json')
+            with open(path, 'w') as f:
+                json.dump(document, f)
+            for load in (lambda renderer: renderer.load_json(path),
+                         lambda renderer: renderer.load_json_from_dict(document)):
+                renderer = PageRankRenderer()
+                try:
+                    load(renderer)
+                except (ValueError, RuntimeError):
+                    # 文件加载把格式错误包装为RuntimeError
+                    assert not accepted, document
+                else:
+                    assert accepted and renderer.metadata is None and renderer.store.num_nodes == 2, document
+
+
+CHECKS = [check_edgeless_graphs, check_batch_worker_crash, check_service_worker_kill,
+          check_service_failed_submit, check_animation_from_generator, check_threaded_iteration_allocations,
+          check_opt_in_defaults, check_frozen_graph_view, check_fast_draw_arrow_geometry,
+          check_linear_solvers, check_residual_push, check_null_metadata]
+
+
+def main() -> int:
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"ok    {check.__name__}")
+        except Exception as exc:
+            failed += 1
+            print(f"FAIL  {check.__name__}: {type(exc).__name__}: {exc}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+基准测试用的合成图生成器
+按固定随机种子生成常见的图结构，输出 load_json 接受的 metadata / graph.nodes / graph.edges 格式
+
+    power_law   幂律网页图：出度与入度都服从重尾分布
+    call_dag    深调用图：按调用深度分层的有向无环图，边只指向更深的层
+    modules     稠密小模块：模块内部稠密连接，模块之间只有少量导入边
+    dangling    大量悬挂节点：多数节点没有出边
+"""
+
+import gzip
+import json
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+
+NODE_TYPES = ['function', 'class', 'module', 'variable', 'statement', 'import']
+
+
+class SyntheticGraph:
+    """
+    数组形式的合成图
+
+    节点ID为 "n{下标}"；node_types 为 NODE_TYPES 中的下标，modules 为所属模块编号。
+    """
+
+    def __init__(self, family: str, seed: int, node_types: np.ndarray, modules: np.ndarray,
+                 sources: np.ndarray, targets: np.ndarray, weights: np.ndarray):
+        self.family = family
+        self.seed = seed
+        self.node_types = node_types
+        self.modules = modules
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+
+    @property
+    def num_nodes(self) -> int:
+        """节点数量"""
+        return len(self.node_types)
+
+    @property
+    def num_edges(self) -> int:
+        """边数量"""
+        return len(self.sources)
+
+    def metadata(self) -> Dict[str, Any]:
+        """生成元数据"""
+        return {
+            'generator': self.family,
+            'seed': self.seed,
+            'num_nodes': self.num_nodes,
+            'num_edges': self.num_edges
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为 load_json_from_dict 接受的字典
+
+        Returns:
+            图JSON数据
+        """
+        return {
+            'metadata': self.metadata(),
+            'graph': {
+                'nodes': [
+                    {'id': f'n{i}', 'type': NODE_TYPES[t], 'properties': {'module': f'm{m}'}}
+                    for i, (t, m) in enumerate(zip(self.node_types.tolist(), self.modules.tolist()))
+                ],
+                'edges': [
+                    {'source': f'n{s}', 'target': f'n{t}', 'type': 'calls', 'weight': w}
+                    for s, t, w in zip(self.sources.tolist(), self.targets.tolist(), self.weights.tolist())
+                ]
+            }
+        }
+
+    def write_json(self, path: str, chunk_size: int = 100000) -> None:
+        """
+        逐块写出JSON文件（.gz 后缀时以最快的级别gzip压缩），不在内存中构建完整文档
+
+        Args:
+            path: 输出路径
+            chunk_size: 每次写入的记录数
+        """
+        if path.endswith('.gz'):
+            f = gzip.open(path, 'wt', encoding='utf-8', compresslevel=1)
+        else:
+            f = open(path, 'w', encoding='utf-8')
+        with f:
+            f.write('{"metadata":')
+            json.dump(self.metadata(), f)
+            f.write(',"graph":{"nodes":[')
+            types = self.node_types.tolist()
+            modules = self.modules.tolist()
+            for start in range(0, self.num_nodes, chunk_size):
+                if start:
+                    f.write(',')
+                f.write(','.join(
+                    f'{{"id":"n{i}","type":"{NODE_TYPES[types[i]]}","properties":{{"module":"m{modules[i]}"}}}}'
+                    for i in range(start, min(start + chunk_size, self.num_nodes))
+                ))
+            f.write('],"edges":[')
+            sources = self.sources.tolist()
+            targets = self.targets.tolist()
+            weights = self.weights.tolist()
+            for start in range(0, self.num_edges, chunk_size):
+                if start:
+                    f.write(',')
+                f.write(','.join(
+                    f'{{"source":"n{sources[k]}","target":"n{targets[k]}","type":"calls","weight":{weights[k]!r}}}'
+                    for k in range(start, min(start + chunk_size, self.num_edges))
+                ))
+            f.write(']}}')
+
+
+def _zipf_choice(rng: np.random.Generator, n: int, size: int, exponent: float) -> np.ndarray:
+    """按排名服从Zipf分布抽取节点，排名与节点下标随机对应"""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    cumulative = np.cumsum(weights)
+    ranks = np.searchsorted(cumulative, rng.random(size) * cumulative[-1], side='right')
+    return rng.permutation(n)[np.minimum(ranks, n - 1)]
+
+
+def _node_types(rng: np.random.Generator, n: int) -> np.ndarray:
+    """按代码图中常见的比例分配节点类型"""
+    return rng.choice(len(NODE_TYPES), n, p=[0.45, 0.1, 0.05, 0.2, 0.15, 0.05])
+
+
+def power_law_graph(num_nodes: int, seed: int = 0, edges_per_node: float = 8.0,
+                    exponent: float = 1.0) -> SyntheticGraph:
+    """
+    幂律网页图
+
+    出度服从Pareto分布，目标节点按Zipf分布的流行度抽取。
+
+    Args:
+        num_nodes: 节点数量
+        seed: 随机种子
+        edges_per_node: 平均出度
+        exponent: 入度Zipf分布的指数
+
+    Returns:
+        合成图
+    """
+    rng = np.random.default_rng(seed)
+    n = num_nodes
+    out_degree = rng.pareto(2.0, n) + 1
+    out_degree = np.floor(out_degree * edges_per_node / out_degree.mean()).astype(np.int64)
+    sources = np.repeat(np.arange(n), out_degree)
+    targets = _zipf_choice(rng, n, len(sources), exponent)
+    weights = np.ones(len(sources))
+    return SyntheticGraph('power_law', seed, _node_types(rng, n), np.arange(n) // 50,
+                          sources, targets, weights)
+
+
+def call_dag(num_nodes: int, seed: int = 0, depth: Optional[int] = None,
+             calls_per_function: float = 3.0) -> SyntheticGraph:
+    """
+    深调用图
+
+    节点按调用深度分为depth层（默认约 √n 层），每个函数调用的函数
+    位于更深的层，跨越的层数服从几何分布（多数调用只跨一层）。
+
+    Args:
+        num_nodes: 节点数量
+        seed: 随机种子
+        depth: 层数
+        calls_per_function: 平均调用数
+
+    Returns:
+        合成图
+    """
+    rng = np.random.default_rng(seed)
+    n = num_nodes
+    depth = depth or max(2, int(np.sqrt(n)))
+    level = np.sort(rng.integers(0, depth, n))
+    level_start = np.searchsorted(level, np.arange(depth + 1))
+
+    calls = rng.poisson(calls_per_function, n)
+    sources = np.repeat(np.arange(n), calls)
+    target_level = level[sources] + rng.geometric(0.6, len(sources))
+    keep = target_level < depth
+    sources, target_level = sources[keep], target_level[keep]
+    # 目标层为空时向更深的层顺延
+    lo = level_start[target_level]
+    hi = level_start[np.minimum(target_level + 1, depth)]
+    nonempty = hi > lo
+    sources, lo, hi = sources[nonempty], lo[nonempty], hi[nonempty]
+    targets = lo + (rng.random(len(sources)) * (hi - lo)).astype(np.int64)
+    weights = rng.integers(1, 5, len(sources)).astype(np.float64)
+    return SyntheticGraph('call_dag', seed, _node_types(rng, n), level * 20 // depth,
+                          sources, targets, weights)
+
+
+def dense_modules(num_nodes: int, seed: int = 0, module_size: int = 20, density: float = 0.3,
+                  imports_per_module: float = 2.0) -> SyntheticGraph:
+    """
+    稠密小模块
+
+    每个节点连向约 density × module_size 个同模块节点，模块之间以少量导入边相连，
+    导入目标偏向少数基础模块。
+
+    Args:
+        num_nodes: 节点数量
+        seed: 随机种子
+        module_size: 每个模块的节点数
+        density: 模块内部的连边比例
+        imports_per_module: 每个模块的平均导入边数
+
+    Returns:
+        合成图
+    """
+    rng = np.random.default_rng(seed)
+    n = num_nodes
+    modules = np.arange(n) // module_size
+    num_modules = int(modules[-1]) + 1 if n else 0
+
+    # 模块内部：每个节点抽取 density·module_size 个同模块节点
+    per_node = max(1, int(round(density * module_size)))
+    sources = np.repeat(np.arange(n), per_node)
+    start = modules[sources] * module_size
+    size = np.minimum(start + module_size, n) - start
+    targets = start + (rng.random(len(sources)) * size).astype(np.int64)
+    internal = sources != targets
+
+    imports = rng.poisson(imports_per_module * num_modules)
+    import_sources = rng.integers(0, n, imports)
+    import_targets = _zipf_choice(rng, num_modules, imports, 1.2) * module_size
+    sources = np.concatenate((sources[internal], import_sources))
+    targets = np.minimum(np.concatenate((targets[internal], import_targets)), n - 1)
+    weights = np.ones(len(sources))
+    return SyntheticGraph('modules', seed, _node_types(rng, n), modules, sources, targets, weights)
+
+
+def dangling_graph(num_nodes: int, seed: int = 0, dangling_fraction: float = 0.7,
+                   edges_per_node: float = 10.0) -> SyntheticGraph:
+    """
+    大量悬挂节点的图
+
+    只有 1 - dangling_fraction 比例的节点有出边（如只调用外部库的叶子函数很多的代码库）。
+
+    Args:
+        num_nodes: 节点数量
+        seed: 随机种子
+        dangling_fraction: 没有出边的节点比例
+        edges_per_node: 有出边节点的平均出度
+
+    Returns:
+        合成图
+    """
+    rng = np.random.default_rng(seed)
+    n = num_nodes
+    active = rng.permutation(n)[:max(1, int(round(n * (1 - dangling_fraction))))]
+    sources = np.repeat(active, rng.poisson(edges_per_node, len(active)))
+    targets = rng.integers(0, n, len(sources))
+    weights = np.ones(len(sources))
+    return SyntheticGraph('dangling', seed, _node_types(rng, n), np.arange(n) // 50,
+                          sources, targets, weights)
+
+
+GENERATORS: Dict[str, Callable[..., SyntheticGraph]] = {
+    'power_law': power_law_graph,
+    'call_dag': call_dag,
+    'modules': dense_modules,
+    'dangling': dangling_graph,
+}
+
+
+def generate(family: str, num_nodes: int, seed: int = 0, **options: Any) -> SyntheticGraph:
+    """
+    按名称生成合成图
+
+    Args:
+        family: 图结构名称，见 GENERATORS
+        num_nodes: 节点数量
+        seed: 随机种子
+        options: 传给生成函数的其他参数
+
+    Returns:
+        合成图
+    """
+    if family not in GENERATORS:
+        raise ValueError(f"未知的图结构: {family}，可选: {', '.join(GENERATORS)}")
+    if num_nodes < 2:
+        raise ValueError("节点数量至少为2")
+    return GENERATORS[family](num_nodes, seed, **options)
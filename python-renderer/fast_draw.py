@@ -0,0 +1,194 @@
+"""
+快速绘制模块
+把全部边合并为一个LineCollection、全部节点合并为一个PathCollection，
+曲线与箭头几何一次性向量化计算，适用于上万条边的大图
+"""
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection, PathCollection
+from typing import Any, Optional, Union
+
+
+def edge_polylines(start: np.ndarray, end: np.ndarray, rad: float = 0.1, shrink_start: Union[float, np.ndarray] = 0.0,
+                   shrink_end: Union[float, np.ndarray] = 0.0, head_length: float = 8.0, head_width: float = 4.0,
+                   samples: int = 8) -> np.ndarray:
+    """
+    计算带箭头的弧形边折线（像素坐标）
+
+    曲线与matplotlib的 arc3 连接样式一致：二次贝塞尔曲线，控制点为弦的中点
+    沿法向偏移 rad·弦长。两端按节点半径裁掉，末端追加 '->' 样式的两条箭头线，
+    每条边是一条折线：曲线采样点、箭头左翼、尖端、右翼。
+
+    Args:
+        start: m×2 的起点
+        end: m×2 的终点
+        rad: 弧度系数，0为直线
+        shrink_start: 起点端裁掉的长度（标量或长度为m的数组）
+        shrink_end: 终点端裁掉的长度
+        head_length: 箭头长度
+        head_width: 箭头半宽
+        samples: 每条曲线的分段数
+
+    Returns:
+        m×(samples+4)×2 的折线顶点数组
+    """
+    delta = end - start
+    chord = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-9)
+    control = (start + end) / 2 + rad * np.column_stack((delta[:, 1], -delta[:, 0]))
+
+    # 按弦长比例把裁剪长度换算为曲线参数，首尾至少保留一半曲线
+    t0 = np.minimum(np.broadcast_to(shrink_start, chord.shape) / chord, 0.5)
+    t1 = np.maximum(1.0 - np.broadcast_to(shrink_end, chord.shape) / chord, t0)
+    t = t0[:, None] + (t1 - t0)[:, None] * np.linspace(0.0, 1.0, samples + 1)[None, :]
+
+    a = ((1 - t) ** 2)[:, :, None]
+    b = (2 * (1 - t) * t)[:, :, None]
+    c = (t ** 2)[:, :, None]
+    curve = a * start[:, None, :] + b * control[:, None, :] + c * end[:, None, :]
+
+    # 尖端处的切线方向：B'(t) = 2(1-t)(P1-P0) + 2t(P2-P1)
+    tip_t = t1[:, None]
+    tangent = 2 * (1 - tip_t) * (control - start) + 2 * tip_t * (end - control)
+    tangent /= np.maximum(np.sqrt((tangent ** 2).sum(axis=1)), 1e-9)[:, None]
+    normal = np.column_stack((-tangent[:, 1], tangent[:, 0]))
+
+    tip = curve[:, -1, :]
+    base = tip - head_length * tangent
+    head = np.stack((base + head_width * normal, tip, base - head_width * normal), axis=1)
+    return np.concatenate((curve, head), axis=1)
+
+
+class _EdgeCollection(LineCollection):
+    """
+    弧形有向边的集合，几何在每次绘制时按当时的坐标变换与分辨率计算
+
+    边的弧度、箭头与节点边缘处的截断都以像素为单位，颜色条、tight_layout、
+    窗口缩放或以不同dpi保存都会改变数据坐标到像素的映射，因此在绘制前
+    检查变换是否变化并重新计算折线。
+    """
+
+    def __init__(self, positions: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+                 radius: np.ndarray, rad: float, arrowsize: float, samples: int, **kwargs):
+        super().__init__([], **kwargs)
+        self._positions = positions
+        self._sources = sources
+        self._targets = targets
+        self._radius = radius
+        self._rad = rad
+        self._arrowsize = arrowsize
+        self._samples = samples
+        self._geometry_key = None
+
+    def update_geometry(self) -> None:
+        """坐标变换或分辨率变化时重新计算折线（数据坐标）"""
+        transform = self.axes.transData
+        key = (transform.get_affine().get_matrix().tobytes(), self.figure.dpi)
+        if key == self._geometry_key:
+            return
+        self._geometry_key = key
+
+        pixels_per_point = self.figure.dpi / 72.0
+        pixels = transform.transform(self._positions)
+        # 节点半径（像素），外加少量间隙
+        radius = self._radius * pixels_per_point + 2 * pixels_per_point
+        src, dst = self._sources, self._targets
+        lines = edge_polylines(
+            pixels[src], pixels[dst], self._rad,
+            shrink_start=radius[src],
+            shrink_end=radius[dst],
+            head_length=0.4 * self._arrowsize * pixels_per_point,
+            head_width=0.2 * self._arrowsize * pixels_per_point,
+            samples=self._samples
+        )
+        shape = lines.shape
+        self.set_segments(transform.inverted().transform(lines.reshape(-1, 2)).reshape(shape))
+
+    def draw(self, renderer: Any) -> None:
+        """绘制前按当前的坐标变换更新折线"""
+        self.update_geometry()
+        super().draw(renderer)
+
+
+def draw_edges(ax: Axes, positions: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+               widths: Union[float, np.ndarray] = 1.5, node_sizes: Union[float, np.ndarray] = 300.0,
+               color: Any = 'gray', alpha: float = 0.6, rad: float = 0.1, arrowsize: float = 20.0,
+               samples: int = 8) -> LineCollection:
+    """
+    用单个LineCollection绘制全部有向边
+
+    几何在像素坐标中计算（与FancyArrowPatch一致，弧度与箭头大小不受
+    坐标轴纵横比影响），再转换回数据坐标。计算推迟到绘制时进行，并在坐标轴
+    大小或分辨率改变后重新计算，因此之后添加颜色条、调用tight_layout或以其他
+    dpi保存都不会使箭头与节点错位；绘制时坐标轴范围须已确定（见 fit_axes）。
+    自环（源节点与目标节点相同的边）不绘制。
+
+    Args:
+        ax: 坐标轴
+        positions: n×2 的节点位置（数据坐标）
+        sources: 边的源节点索引
+        targets: 边的目标节点索引
+        widths: 线宽（标量或每条边一个值）
+        node_sizes: 节点面积（scatter的s，单位为点²），用于在节点边缘处截断边
+        color: 边颜色
+        alpha: 透明度
+        rad: 弧度系数
+        arrowsize: 箭头大小（点），与 nx.draw_networkx_edges 的 arrowsize 含义相同
+        samples: 每条曲线的分段数
+
+    Returns:
+        添加到坐标轴上的LineCollection
+    """
+    src = np.asarray(sources, dtype=np.int64)
+    dst = np.asarray(targets, dtype=np.int64)
+    loops = src == dst
+    src, dst = src[~loops], dst[~loops]
+    if np.ndim(widths):
+        widths = np.asarray(widths)[~loops]
+
+    # 节点半径（点）
+    radius = np.broadcast_to(np.sqrt(node_sizes) / 2, (len(positions),))
+    collection = _EdgeCollection(np.asarray(positions, dtype=np.float64), src, dst, radius, rad, arrowsize,
+                                 samples, linewidths=widths, colors=color, alpha=alpha, zorder=1)
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def draw_nodes(ax: Axes, positions: np.ndarray, sizes: Union[float, np.ndarray],
+               colors: Any, cmap: Optional[Any] = None, alpha: float = 0.8) -> PathCollection:
+    """
+    用单个PathCollection绘制全部节点
+
+    Args:
+        ax: 坐标轴
+        positions: n×2 的节点位置
+        sizes: 节点面积（点²）
+        colors: 颜色列表，或配合cmap使用的数值数组
+        cmap: 颜色映射
+        alpha: 透明度
+
+    Returns:
+        节点集合
+    """
+    collection = ax.scatter(positions[:, 0], positions[:, 1], s=sizes, c=colors, cmap=cmap,
+                            alpha=alpha, edgecolors='face')
+    collection.set_zorder(2)
+    return collection
+
+
+def fit_axes(ax: Axes, positions: np.ndarray, margin: float = 0.05) -> None:
+    """
+    按节点位置设置坐标轴范围并隐藏刻度，与networkx绘图函数的默认效果一致
+
+    Args:
+        ax: 坐标轴
+        positions: n×2 的节点位置
+        margin: 相对于数据范围的边距
+    """
+    low = positions.min(axis=0)
+    high = positions.max(axis=0)
+    pad = np.maximum((high - low) * margin, 1e-3)
+    ax.set_xlim(low[0] - pad[0], high[0] + pad[0])
+    ax.set_ylim(low[1] - pad[1], high[1] + pad[1])
+    ax.tick_params(axis='both', which='both', bottom=False, left=False,
+                   labelbottom=False, labelleft=False)
@@ -0,0 +1,265 @@
+"""
+帧流模块
+把PageRank迭代历史写成float32二进制帧流（可选增量编码），标签表只保存一次；
+读取时可以逐帧生成或直接内存映射，并可导出为分块的 pagerank-steps.json
+"""
+
+import json
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+
+_MAGIC = b'PRF1'
+_VERSION = 1
+_FLAG_DELTA = 1
+# 魔数、版本、标志、节点数、帧数、标签表偏移
+_HEADER = struct.Struct('<4sHHQQQ')
+
+
+class FrameStreamWriter:
+    """
+    帧流写入器
+
+    文件布局：32字节头部、num_frames×num_nodes 个小端float32、UTF-8 JSON标签表。
+    增量编码时第0帧为原值，其后每帧保存与上一帧重建值之差，
+    差值以重建值为基准计算，解码时不会累积舍入误差。
+    """
+
+    def __init__(self, path: str, num_nodes: int, labels: Optional[List[Any]] = None, delta: bool = False):
+        """
+        创建帧流文件
+
+        Args:
+            path: 输出路径
+            num_nodes: 每帧的节点数
+            labels: 节点标签表，长度须等于num_nodes
+            delta: 是否增量编码
+        """
+        if labels is not None and len(labels) != num_nodes:
+            raise ValueError("标签数量与节点数量不一致")
+
+        self.path = path
+        self.num_nodes = num_nodes
+        self.labels = list(labels) if labels is not None else None
+        self.delta = delta
+        self.num_frames = 0
+        self._previous: Optional[np.ndarray] = None
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, 0, num_nodes, 0, 0))
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        追加一帧
+
+        Args:
+            frame: 长度为num_nodes的PageRank向量
+        """
+        frame = np.asarray(frame, dtype=np.float64)
+        if frame.shape != (self.num_nodes,):
+            raise ValueError(f"帧的长度应为{self.num_nodes}")
+
+        if self.delta and self._previous is not None:
+            encoded = (frame - self._previous).astype('<f4')
+            self._previous = self._previous + encoded
+        else:
+            encoded = frame.astype('<f4')
+            self._previous = encoded.astype(np.float64)
+
+        self._file.write(encoded.tobytes())
+        self.num_frames += 1
+
+    def close(self) -> None:
+        """写入标签表并回填头部"""
+        if self._file.closed:
+            return
+        label_offset = self._file.tell()
+        self._file.write(json.dumps(self.labels, ensure_ascii=False, default=str).encode('utf-8'))
+        self._file.seek(0)
+        flags = _FLAG_DELTA if self.delta else 0
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, flags, self.num_nodes, self.num_frames, label_offset))
+        self._file.close()
+
+    def __enter__(self) -> 'FrameStreamWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FrameStreamReader:
+    """
+    帧流读取器
+
+    只读取头部与标签表，帧数据按需从内存映射中取出。
+    """
+
+    def __init__(self, path: str):
+        """
+        打开帧流文件
+
+        Args:
+            path: 帧流文件路径
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("帧流文件不完整")
+            magic, version, flags, num_nodes, num_frames, label_offset = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError("不是有效的帧流文件")
+            if version != _VERSION:
+                raise ValueError(f"不支持的帧流版本: {version}")
+            if label_offset == 0:
+                raise ValueError("帧流文件未正确关闭")
+            f.seek(label_offset)
+            self.labels: Optional[List[Any]] = json.loads(f.read().decode('utf-8'))
+
+        self.path = path
+        self.num_nodes = num_nodes
+        self.num_frames = num_frames
+        self.delta = bool(flags & _FLAG_DELTA)
+        self._memmap: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        return self.num_frames
+
+    def memmap(self) -> np.ndarray:
+        """
+        以内存映射方式访问原始帧数据
+
+        Returns:
+            num_frames×num_nodes 的只读float32数组；增量编码时第1帧起为差值
+        """
+        if self._memmap is None:
+            if self.num_frames == 0:
+                return np.zeros((0, self.num_nodes), dtype='<f4')
+            self._memmap = np.memmap(self.path, dtype='<f4', mode='r', offset=_HEADER.size,
+                                     shape=(self.num_frames, self.num_nodes))
+        return self._memmap
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        逐帧生成解码后的PageRank向量
+
+        Args:
+            start: 起始帧
+            stop: 结束帧（不含），默认到最后一帧
+
+        Returns:
+            float64向量的生成器
+        """
+        stop = self.num_frames if stop is None else min(stop, self.num_frames)
+        if start >= stop:
+            return
+        data = self.memmap()
+
+        if not self.delta:
+            for i in range(start, stop):
+                yield np.asarray(data[i], dtype=np.float64)
+            return
+
+        # 增量编码需要从第0帧开始累加
+        current = np.zeros(self.num_nodes)
+        for i in range(stop):
+            current = current + data[i]
+            if i >= start:
+                yield current.copy()
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        """
+        读取单帧
+
+        Args:
+            i: 帧序号，支持负数
+
+        Returns:
+            解码后的float64向量
+        """
+        if i < 0:
+            i += self.num_frames
+        if not 0 <= i < self.num_frames:
+            raise IndexError("帧序号超出范围")
+        if self.delta:
+            return self.memmap()[:i + 1].sum(axis=0, dtype=np.float64)
+        return np.asarray(self.memmap()[i], dtype=np.float64)
+
+    def to_array(self) -> np.ndarray:
+        """
+        一次性读取全部帧
+
+        Returns:
+            num_frames×num_nodes 的float64数组
+        """
+        data = np.asarray(self.memmap(), dtype=np.float64)
+        return np.cumsum(data, axis=0) if self.delta else data
+
+
+def export_steps(frames: Iterable[np.ndarray], labels: List[Any], output_dir: str, chunk_size: int = 64,
+                 converged: bool = False, final_ranking: Optional[List[Any]] = None,
+                 name: str = 'pagerank-steps') -> Dict[str, Any]:
+    """
+    导出为分块的步骤数据，供Web端按需分块加载
+
+    生成 {name}.json 清单（标签表只出现一次，steps只含步骤元信息，
+    chunks列出各分块文件及其帧范围）与若干 {name}-NNNN.json 分块文件，
+    分块文件的 values 为该范围内各帧的PageRank值（7位有效数字，即float32精度）。
+    帧逐个消费，内存占用只与分块大小有关。
+
+    Args:
+        frames: PageRank向量的可迭代对象（如 FrameStreamReader.frames()）
+        labels: 节点标签表
+        output_dir: 输出目录
+        chunk_size: 每个分块的帧数
+        converged: 最后一帧是否已收敛
+        final_ranking: 最终排名
+        name: 文件名前缀
+
+    Returns:
+        清单字典
+    """
+    if chunk_size <= 0:
+        raise ValueError("分块大小必须为正数")
+    os.makedirs(output_dir, exist_ok=True)
+
+    steps = []
+    chunks = []
+    buffer = []
+
+    def flush() -> None:
+        start = len(steps) - len(buffer)
+        file_name = f"{name}-{len(chunks):04d}.json"
+        with open(os.path.join(output_dir, file_name), 'w', encoding='utf-8') as f:
+            f.write(f'{{"start":{start},"values":[')
+            f.write(','.join(buffer))
+            f.write(']}')
+        chunks.append({'file': file_name, 'start': start, 'stop': len(steps)})
+        buffer.clear()
+
+    for i, frame in enumerate(frames):
+        steps.append({'step': i, 'description': '初始分配' if i == 0 else f'迭代计算 {i}'})
+        # 7位有效数字即float32精度，避免float64表示带来的冗长数字
+        values = np.asarray(frame, dtype=np.float32).tolist()
+        buffer.append('[' + ','.join(f'{v:.7g}' for v in values) + ']')
+        if len(buffer) == chunk_size:
+            flush()
+    if buffer:
+        flush()
+    if steps:
+        steps[-1]['convergence'] = converged
+
+    manifest = {
+        'format': 'pagerank-frames',
+        'version': _VERSION,
+        'num_nodes': len(labels),
+        'num_frames': len(steps),
+        'node_labels': list(labels),
+        'steps': steps,
+        'chunks': chunks,
+        'final_ranking': final_ranking or []
+    }
+    with open(os.path.join(output_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, default=str)
+    return manifest
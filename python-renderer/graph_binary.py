@@ -0,0 +1,397 @@
+"""
+二进制图格式模块
+把 load_json 格式的图转换为可内存映射的二进制文件（CSR偏移、目标下标、float32权重、
+驻留的节点ID表与节点属性列），重新加载时直接映射文件而不复制数组，
+多个进程打开同一文件时共享操作系统的页缓存
+
+用法:
+    python graph_binary.py graph.json.gz graph.prg
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from graph_store import GraphStore, GraphStoreBuilder
+from result_cache import graph_fingerprint
+from streaming_loader import open_json_file, stream_graph
+
+
+_MAGIC = b'PRG1'
+_VERSION = 1
+# 魔数、版本、保留、节点数、边数、目录偏移、目录长度
+_HEADER = struct.Struct('<4sHHQQQQ')
+# 各数组段按缓存行对齐
+_ALIGNMENT = 64
+
+GRAPH_SUFFIX = '.prg'
+
+
+def _encode(value: Any, encoding: str) -> bytes:
+    """按字符串表的编码方式编码一个值"""
+    if encoding == 'str':
+        return value.encode('utf-8')
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _hashable(value: Any) -> Any:
+    """JSON解码得到的列表转换为元组，使其可以作为节点ID"""
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+class StringTable(Sequence):
+    """
+    内存映射的变长字符串表
+
+    offsets[i]:offsets[i+1] 为第i项在 data 中的字节区间；encoding 为 'str' 时
+    每项是UTF-8字符串，为 'json' 时每项是JSON编码的任意值。访问时才解码；
+    hashable 为True时（节点ID表）解码得到的列表转换为元组。
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray, encoding: str, hashable: bool = False):
+        self.offsets = offsets
+        self.data = data
+        self.encoding = encoding
+        self.hashable = hashable
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _decode(self, raw: bytes) -> Any:
+        text = raw.decode('utf-8')
+        if self.encoding == 'str':
+            return text
+        value = json.loads(text)
+        return _hashable(value) if self.hashable else value
+
+    def raw(self, i: int) -> bytes:
+        """第i项的原始字节"""
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("字符串表下标超出范围")
+        return self._decode(self.raw(i))
+
+    def __iter__(self) -> Iterator[Any]:
+        buffer = memoryview(self.data)
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            yield self._decode(bytes(buffer[start:end]))
+
+
+class InternedIndex(Mapping):
+    """
+    节点ID到下标的只读映射
+
+    按ID编码字节排序的下标数组 order 保存在文件中，查找时二分搜索，
+    不需要在加载时构建Python字典。
+    """
+
+    def __init__(self, ids: StringTable, order: np.ndarray):
+        self.ids = ids
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.ids)
+
+    def __getitem__(self, node_id: Hashable) -> int:
+        if self.ids.encoding == 'str' and not isinstance(node_id, str):
+            raise KeyError(node_id)
+        try:
+            key = _encode(node_id, self.ids.encoding)
+        except (TypeError, ValueError):
+            raise KeyError(node_id)
+
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ids.raw(int(self.order[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.order):
+            i = int(self.order[lo])
+            if self.ids.raw(i) == key:
+                return i
+        raise KeyError(node_id)
+
+
+class CategoricalColumn(Sequence):
+    """
+    字典编码的节点属性列
+
+    codes 为每个节点在取值表中的编号，-1 表示无此属性（None）。
+    """
+
+    def __init__(self, codes: np.ndarray, values: StringTable):
+        self.codes = codes
+        self.values = values
+        self._decoded: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _value(self, code: int) -> Any:
+        if code < 0:
+            return None
+        if code not in self._decoded:
+            self._decoded[code] = self.values[code]
+        return self._decoded[code]
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self._value(code) for code in self.codes[i].tolist()]
+        return self._value(int(self.codes[i]))
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self._value(code) for code in self.codes.tolist())
+
+
+class MappedGraph:
+    """
+    打开的二进制图文件
+
+    store 的数组都是文件映射上的只读视图；fingerprint 为转换时计算的
+    图结构哈希与规范顺序（与 graph_fingerprint 的结果一致），未保存时为None。
+    """
+
+    def __init__(self, store: GraphStore, metadata: Optional[Dict[str, Any]],
+                 fingerprint: Optional[Tuple[str, np.ndarray]]):
+        self.store = store
+        self.metadata = metadata
+        self.fingerprint = fingerprint
+
+
+class _SectionWriter:
+    """按对齐要求顺序写入数组段，并记录段目录"""
+
+    def __init__(self, f: Any):
+        self.f = f
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+    def write(self, name: str, array: np.ndarray, dtype: str) -> None:
+        array = np.ascontiguousarray(array, dtype=np.dtype(dtype))
+        position = self.f.tell()
+        padding = -position % _ALIGNMENT
+        self.f.write(b'\0' * padding)
+        self.sections[name] = {'offset': position + padding, 'dtype': dtype, 'count': int(array.size)}
+        self.f.write(array.data)
+
+    def write_strings(self, name: str, values: Any, encoding: str) -> List[bytes]:
+        encoded = [_encode(value, encoding) for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        self.write(f"{name}.offsets", offsets, '<i8')
+        self.write(f"{name}.data", np.frombuffer(b''.join(encoded), dtype=np.uint8), '|u1')
+        return encoded
+
+
+def write_graph(path: str, store: GraphStore, metadata: Optional[Dict[str, Any]] = None,
+                fingerprint: bool = True) -> None:
+    """
+    把图存储写为二进制图文件
+
+    文件布局：48字节头部、按64字节对齐的数组段、UTF-8 JSON段目录。
+    数组段包括CSR偏移与目标下标（节点与边数都小于2³¹时为int32，否则为int64）、
+    源下标、float32权重、CSC顺序的入边排列、类型编码、节点ID表及其排序下标、
+    标签表（与ID相同时省略）与各节点属性列。数值属性列直接保存为数组，
+    其他属性列按JSON编码后字典编码。
+
+    Args:
+        path: 输出路径
+        store: 图存储
+        metadata: 图元数据
+        fingerprint: 是否计算并保存图结构哈希，设置 cache_dir 的渲染器加载后无需重新计算
+    """
+    n, m = store.num_nodes, store.num_edges
+    index_dtype = '<i4' if max(n, m) < 2 ** 31 else '<i8'
+    weight = np.asarray(store.weight, dtype=np.float32)
+    id_encoding = 'str' if all(isinstance(node_id, str) for node_id in store.node_ids) else 'json'
+
+    directory: Dict[str, Any] = {
+        'metadata': metadata,
+        'node_type_names': list(store.node_type_names),
+        'edge_type_names': list(store.edge_type_names),
+        'id_encoding': id_encoding,
+        'columns': {},
+        'edge_properties': {str(e): props for e, props in store.edge_properties.items()},
+        'fingerprint': None,
+    }
+
+    with open(path, 'wb') as f:
+        f.write(b'\0' * _HEADER.size)
+        writer = _SectionWriter(f)
+        writer.write('out_indptr', store.out_indptr, index_dtype)
+        writer.write('dst', store.dst, index_dtype)
+        writer.write('src', store.src, index_dtype)
+        writer.write('weight', weight, '<f4')
+        writer.write('edge_type', store.edge_type, '<i4')
+        writer.write('in_indptr', store.in_indptr, index_dtype)
+        writer.write('in_perm', store.in_perm, index_dtype)
+        writer.write('node_type', store.node_type, '<i4')
+
+        encoded = writer.write_strings('ids', store.node_ids, id_encoding)
+        order = sorted(range(n), key=encoded.__getitem__)
+        writer.write('id_order', np.asarray(order, dtype=np.int64), index_dtype)
+        del encoded, order
+
+        labels = store.labels
+        directory['labels_are_ids'] = all(
+            label == node_id for label, node_id in zip(labels, store.node_ids)
+        ) and len(labels) == n
+        if not directory['labels_are_ids']:
+            writer.write_strings('labels', labels, 'json')
+
+        for name, column in store.columns.items():
+            if isinstance(column, np.ndarray) and column.dtype.kind in 'biuf':
+                dtype = column.dtype.newbyteorder('<').str
+                writer.write(f"column.{name}", column, dtype)
+                directory['columns'][name] = 'array'
+                continue
+            codes = np.empty(n, dtype=np.int32)
+            table: Dict[str, int] = {}
+            for i, value in enumerate(column):
+                if value is None:
+                    codes[i] = -1
+                else:
+                    key = json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+                    codes[i] = table.setdefault(key, len(table))
+            writer.write(f"column.{name}.codes", codes, '<i4')
+            writer.write_strings(f"column.{name}.values", [json.loads(key) for key in table], 'json')
+            directory['columns'][name] = 'categorical'
+
+        if fingerprint:
+            digest, canonical = graph_fingerprint(store.node_ids, store.src, store.dst, weight)
+            writer.write('canonical', canonical, '<i8')
+            directory['fingerprint'] = digest
+
+        directory['sections'] = writer.sections
+        directory_offset = f.tell()
+        payload = json.dumps(directory, ensure_ascii=False, default=str).encode('utf-8')
+        f.write(payload)
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, n, m, directory_offset, len(payload)))
+
+
+def convert_json(json_path: str, output_path: str, fingerprint: bool = True) -> MappedGraph:
+    """
+    把 load_json 格式的图文件（支持gzip）流式解析后转换为二进制图文件
+
+    Args:
+        json_path: 输入JSON路径
+        output_path: 输出路径
+        fingerprint: 是否计算并保存图结构哈希
+
+    Returns:
+        映射打开的输出文件
+    """
+    builder = GraphStoreBuilder()
+    with open_json_file(json_path) as f:
+        metadata = stream_graph(f, builder)
+    write_graph(output_path, builder.build(), metadata, fingerprint)
+    return open_graph(output_path)
+
+
+def open_graph(path: str) -> MappedGraph:
+    """
+    以只读内存映射打开二进制图文件，数组不复制
+
+    只有头部与JSON段目录在打开时被解析；节点ID、标签与属性列在访问时解码。
+
+    Args:
+        path: 二进制图文件路径
+
+    Returns:
+        映射的图
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("二进制图文件不完整")
+        magic, version, _, num_nodes, num_edges, directory_offset, directory_length = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError("不是有效的二进制图文件")
+        if version != _VERSION:
+            raise ValueError(f"不支持的二进制图版本: {version}")
+        f.seek(directory_offset)
+        directory = json.loads(f.read(directory_length).decode('utf-8'))
+        # 空文件区间无法映射，只有头部与目录的空图也映射整个文件
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    sections = directory['sections']
+
+    def section(name: str) -> np.ndarray:
+        info = sections[name]
+        return np.frombuffer(buffer, dtype=np.dtype(info['dtype']), count=info['count'], offset=info['offset'])
+
+    def strings(name: str, encoding: str, hashable: bool = False) -> StringTable:
+        return StringTable(section(f"{name}.offsets"), section(f"{name}.data"), encoding, hashable)
+
+    node_ids = strings('ids', directory['id_encoding'], hashable=True)
+    index = InternedIndex(node_ids, section('id_order'))
+    labels = node_ids if directory['labels_are_ids'] else strings('labels', 'json')
+
+    columns: Dict[str, Any] = {}
+    for name, kind in directory['columns'].items():
+        if kind == 'array':
+            columns[name] = section(f"column.{name}")
+        else:
+            columns[name] = CategoricalColumn(section(f"column.{name}.codes"),
+                                              strings(f"column.{name}.values", 'json'))
+
+    store = GraphStore(
+        node_ids=node_ids,
+        index=index,
+        node_type=section('node_type'),
+        node_type_names=directory['node_type_names'],
+        labels=labels,
+        columns=columns,
+        src=section('src'),
+        dst=section('dst'),
+        weight=section('weight'),
+        edge_type=section('edge_type'),
+        edge_type_names=directory['edge_type_names'],
+        edge_properties={int(e): props for e, props in directory['edge_properties'].items()},
+        out_indptr=section('out_indptr'),
+        in_perm=section('in_perm'),
+        in_indptr=section('in_indptr'),
+    )
+    if store.num_nodes != num_nodes or store.num_edges != num_edges:
+        raise ValueError("二进制图文件的头部与数组段不一致")
+
+    fingerprint = None
+    if directory['fingerprint']:
+        fingerprint = (directory['fingerprint'], section('canonical'))
+    return MappedGraph(store, directory['metadata'], fingerprint)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='把图JSON文件转换为可内存映射的二进制图文件')
+    parser.add_argument('input', help='输入JSON文件（支持 .json.gz）')
+    parser.add_argument('output', help=f'输出文件（通常以 {GRAPH_SUFFIX} 结尾）')
+    parser.add_argument('--no-fingerprint', action='store_true', help='不计算图结构哈希')
+    args = parser.parse_args(argv)
+
+    graph = convert_json(args.input, args.output, fingerprint=not args.no_fingerprint)
+    print(f"{args.output}: {graph.store.num_nodes} 个节点，{graph.store.num_edges} 条边")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,574 @@
+"""
+紧凑的数组图存储模块
+节点ID映射为整数，边以并行数组按CSR/CSC顺序保存，节点属性按列保存
+"""
+
+import numpy as np
+from array import array
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class GraphStoreBuilder:
+    """
+    图存储构建器
+
+    逐个接收节点和边并追加到紧凑数组中，最后一次性排序生成GraphStore。
+    语义与NetworkX的DiGraph保持一致：重复节点或重复边会更新属性，
+    边引用的未声明节点会被自动创建（不带任何属性）。
+    """
+
+    def __init__(self):
+        """初始化构建器"""
+        self.node_ids: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        self._node_type = array('i')
+        self._labels: List[Any] = []
+        self._columns: Dict[str, List[Any]] = {}
+        self._node_type_names: List[str] = []
+        self._node_type_codes: Dict[str, int] = {}
+
+        self._src = array('i')
+        self._dst = array('i')
+        self._weight = array('d')
+        self._edge_type = array('i')
+        self._edge_properties: Dict[int, Dict[str, Any]] = {}
+        self._edge_type_names: List[str] = []
+        self._edge_type_codes: Dict[str, int] = {}
+
+    @classmethod
+    def from_store(cls, store: 'GraphStore', node_mask: Optional[np.ndarray] = None,
+                   edge_mask: Optional[np.ndarray] = None) -> 'GraphStoreBuilder':
+        """
+        以已有图存储的数组批量初始化构建器，可按掩码剔除节点和边
+
+        Args:
+            store: 图存储
+            node_mask: 保留节点的布尔掩码，默认全部保留
+            edge_mask: 保留边的布尔掩码，默认全部保留；端点被剔除的边总是被剔除
+
+        Returns:
+            构建器
+        """
+        n = store.num_nodes
+        keep = np.arange(n) if node_mask is None else np.flatnonzero(node_mask)
+        remap = np.full(n, -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+
+        edges = (remap[store.src] >= 0) & (remap[store.dst] >= 0)
+        if edge_mask is not None:
+            edges &= edge_mask
+        edge_positions = np.flatnonzero(edges)
+
+        builder = cls()
+        keep_list = keep.tolist()
+        builder.node_ids = [store.node_ids[i] for i in keep_list]
+        builder.index = {node_id: i for i, node_id in enumerate(builder.node_ids)}
+        builder._node_type.frombytes(store.node_type[keep].astype(np.int32).tobytes())
+        builder._labels = [store.labels[i] for i in keep_list]
+        builder._columns = {key: [column[i] for i in keep_list] for key, column in store.columns.items()}
+        builder._node_type_names = list(store.node_type_names)
+        builder._node_type_codes = {name: i for i, name in enumerate(builder._node_type_names)}
+
+        builder._src.frombytes(remap[store.src[edges]].astype(np.int32).tobytes())
+        builder._dst.frombytes(remap[store.dst[edges]].astype(np.int32).tobytes())
+        builder._weight.frombytes(store.weight[edges].astype(np.float64).tobytes())
+        builder._edge_type.frombytes(store.edge_type[edges].astype(np.int32).tobytes())
+        builder._edge_type_names = list(store.edge_type_names)
+        builder._edge_type_codes = {name: i for i, name in enumerate(builder._edge_type_names)}
+        if store.edge_properties:
+            position = {int(e): k for k, e in enumerate(edge_positions.tolist())}
+            builder._edge_properties = {position[e]: props for e, props in store.edge_properties.items()
+                                        if e in position}
+        return builder
+
+    def _intern(self, node_id: Hashable) -> int:
+        """获取节点的整数索引，不存在时创建无属性节点"""
+        i = self.index.get(node_id)
+        if i is None:
+            i = len(self.node_ids)
+            self.index[node_id] = i
+            self.node_ids.append(node_id)
+            self._node_type.append(-1)
+            self._labels.append(None)
+        return i
+
+    @staticmethod
+    def _type_code(name: Optional[str], names: List[str], codes: Dict[str, int]) -> int:
+        """获取类型名称的整数编码，None编码为-1"""
+        if name is None:
+            return -1
+        code = codes.get(name)
+        if code is None:
+            code = len(names)
+            codes[name] = code
+            names.append(name)
+        return code
+
+    def add_node(self, node_id: Hashable, node_type: Optional[str] = None, label: Any = None,
+                 properties: Optional[Dict[str, Any]] = None) -> int:
+        """
+        添加节点
+
+        Args:
+            node_id: 节点ID
+            node_type: 节点类型，None表示无此属性
+            label: 节点标签，None表示无此属性
+            properties: 其他节点属性
+
+        Returns:
+            节点的整数索引
+        """
+        i = self._intern(node_id)
+        if node_type is not None:
+            self._node_type[i] = self._type_code(node_type, self._node_type_names,
+                                                 self._node_type_codes)
+        if label is not None:
+            self._labels[i] = label
+
+        if properties:
+            for key, value in properties.items():
+                column = self._columns.get(key)
+                if column is None:
+                    column = self._columns[key] = []
+                if len(column) <= i:
+                    column.extend([None] * (i + 1 - len(column)))
+                column[i] = value
+        return i
+
+    def add_edge(self, source: Hashable, target: Hashable, edge_type: Optional[str] = None,
+                 weight: float = 1.0, properties: Optional[Dict[str, Any]] = None) -> None:
+        """
+        添加边
+
+        Args:
+            source: 源节点ID
+            target: 目标节点ID
+            edge_type: 边类型，None表示无此属性
+            weight: 边权重
+            properties: 其他边属性
+        """
+        self._src.append(self._intern(source))
+        self._dst.append(self._intern(target))
+        self._weight.append(weight)
+        self._edge_type.append(self._type_code(edge_type, self._edge_type_names,
+                                               self._edge_type_codes))
+        if properties:
+            self._edge_properties[len(self._src) - 1] = properties
+
+    def add_node_record(self, node_data: Dict[str, Any]) -> int:
+        """
+        按JSON格式的节点记录添加节点，缺省类型为unknown、缺省标签为节点ID
+
+        Args:
+            node_data: graph.nodes中的一项
+
+        Returns:
+            节点的整数索引
+        """
+        node_id = node_data['id']
+        return self.add_node(
+            node_id,
+            node_data.get('type', 'unknown'),
+            node_data.get('label', node_id),
+            node_data.get('properties')
+        )
+
+    def add_edge_record(self, edge_data: Dict[str, Any]) -> None:
+        """
+        按JSON格式的边记录添加边，缺省类型为unknown、缺省权重为1.0
+
+        Args:
+            edge_data: graph.edges中的一项
+        """
+        self.add_edge(
+            edge_data['source'],
+            edge_data['target'],
+            edge_data.get('type', 'unknown'),
+            edge_data.get('weight', 1.0),
+            edge_data.get('properties')
+        )
+
+    def build(self) -> 'GraphStore':
+        """
+        生成图存储
+
+        Returns:
+            图存储对象
+        """
+        n = len(self.node_ids)
+        src = np.frombuffer(self._src, dtype=np.int32).astype(np.int64)
+        dst = np.frombuffer(self._dst, dtype=np.int32).astype(np.int64)
+        weight = np.frombuffer(self._weight, dtype=np.float64).copy()
+        edge_type = np.frombuffer(self._edge_type, dtype=np.int32).copy()
+        edge_properties = self._edge_properties
+
+        # 合并重复边：保留首次出现的位置，类型与权重取最后一次，其他属性依次合并
+        keys = src * max(n, 1) + dst
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+        if len(starts) < len(keys):
+            ends = np.append(starts[1:], len(keys))
+            first = order[starts]
+            last = order[ends - 1]
+            if edge_properties:
+                merged = {}
+                for s, e in zip(starts, ends):
+                    if e - s > 1:
+                        # 稳定排序保证组内仍按插入顺序排列
+                        props = {}
+                        for k in order[s:e].tolist():
+                            props.update(edge_properties.get(k, {}))
+                        if props:
+                            merged[int(order[s])] = props
+                edge_properties = {**edge_properties, **merged}
+            keep = np.argsort(first, kind='stable')
+            first, last = first[keep], last[keep]
+            weight, edge_type = weight[last], edge_type[last]
+            src, dst = src[first], dst[first]
+            edge_properties = {new: edge_properties[old] for new, old in enumerate(first.tolist())
+                               if old in edge_properties}
+
+        # CSR顺序：按源节点稳定排序，与NetworkX的边遍历顺序一致
+        csr = np.argsort(src, kind='stable')
+        src, dst, weight, edge_type = src[csr], dst[csr], weight[csr], edge_type[csr]
+        if edge_properties:
+            position = np.empty(len(csr), dtype=np.int64)
+            position[csr] = np.arange(len(csr))
+            edge_properties = {int(position[k]): v for k, v in edge_properties.items()}
+
+        columns = {key: column + [None] * (n - len(column)) for key, column in self._columns.items()}
+
+        return GraphStore(
+            node_ids=self.node_ids,
+            index=self.index,
+            node_type=np.frombuffer(self._node_type, dtype=np.int32).copy(),
+            node_type_names=self._node_type_names,
+            labels=self._labels,
+            columns=columns,
+            src=src.astype(np.int32),
+            dst=dst.astype(np.int32),
+            weight=weight,
+            edge_type=edge_type,
+            edge_type_names=self._edge_type_names,
+            edge_properties=edge_properties,
+        )
+
+
+class GraphStore:
+    """
+    数组存储的有向图
+
+    边按源节点排序（CSR顺序）保存为并行数组 src/dst/weight/edge_type，
+    out_indptr 给出每个节点出边的区间；in_perm 与 in_indptr 给出CSC顺序的入边。
+    """
+
+    def __init__(self, node_ids: List[Hashable], index: Dict[Hashable, int], node_type: np.ndarray,
+                 node_type_names: List[str], labels: List[Any], columns: Dict[str, List[Any]],
+                 src: np.ndarray, dst: np.ndarray, weight: np.ndarray, edge_type: np.ndarray,
+                 edge_type_names: List[str], edge_properties: Dict[int, Dict[str, Any]],
+                 out_indptr: Optional[np.ndarray] = None, in_perm: Optional[np.ndarray] = None,
+                 in_indptr: Optional[np.ndarray] = None):
+        """
+        初始化图存储，通常通过 GraphStoreBuilder.build 创建
+
+        节点ID、标签与属性列可以是任意序列、index可以是任意映射（如内存映射的二进制图）；
+        out_indptr、in_perm 与 in_indptr 已知时（如从二进制图文件加载）直接使用，不再重新计算。
+
+        Args:
+            node_ids: 节点ID列表
+            index: 节点ID到整数索引的映射
+            node_type: 节点类型编码数组，-1表示无类型
+            node_type_names: 节点类型名称表
+            labels: 节点标签列
+            columns: 其他节点属性列
+            src: 边源节点索引（CSR顺序）
+            dst: 边目标节点索引
+            weight: 边权重
+            edge_type: 边类型编码数组
+            edge_type_names: 边类型名称表
+            edge_properties: 边位置到其他边属性的稀疏映射
+            out_indptr: 出边区间偏移，默认由src计算
+            in_perm: CSC顺序的入边排列，默认由dst计算
+            in_indptr: 入边区间偏移，默认由dst计算
+        """
+        self.node_ids = node_ids
+        self.index = index
+        self.node_type = node_type
+        self.node_type_names = node_type_names
+        self.labels = labels
+        self.columns = columns
+        self.src = src
+        self.dst = dst
+        self.weight = weight
+        self.edge_type = edge_type
+        self.edge_type_names = edge_type_names
+        self.edge_properties = edge_properties
+
+        n = len(node_ids)
+        if out_indptr is None:
+            out_indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(src, minlength=n), out=out_indptr[1:])
+        if in_perm is None:
+            in_perm = np.argsort(dst, kind='stable').astype(np.int32)
+        if in_indptr is None:
+            in_indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(dst, minlength=n), out=in_indptr[1:])
+        self.out_indptr = out_indptr
+        self.in_perm = in_perm
+        self.in_indptr = in_indptr
+
+        self._nx_view = None
+
+    @classmethod
+    def from_networkx(cls, graph: Any) -> 'GraphStore':
+        """
+        从NetworkX有向图构建图存储
+
+        Args:
+            graph: NetworkX有向图
+
+        Returns:
+            图存储对象
+        """
+        builder = GraphStoreBuilder()
+        for node_id, attrs in graph.nodes(data=True):
+            properties = {k: v for k, v in attrs.items() if k not in ('type', 'label')}
+            builder.add_node(node_id, attrs.get('type'), attrs.get('label'), properties)
+        for u, v, attrs in graph.edges(data=True):
+            properties = {k: val for k, val in attrs.items() if k not in ('type', 'weight')}
+            builder.add_edge(u, v, attrs.get('type'), attrs.get('weight', 1.0), properties)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def edge_positions(self, pairs: List[Any]) -> np.ndarray:
+        """
+        查找边在CSR顺序中的位置
+
+        Args:
+            pairs: (源节点ID, 目标节点ID) 列表
+
+        Returns:
+            边位置数组
+        """
+        positions = []
+        for source, target in pairs:
+            i, j = self.index.get(source), self.index.get(target)
+            if i is not None and j is not None:
+                start, end = self.out_indptr[i], self.out_indptr[i + 1]
+                hits = np.flatnonzero(self.dst[start:end] == j)
+                if len(hits):
+                    positions.append(start + hits[0])
+                    continue
+            raise ValueError(f"要删除的边不存在: {source} -> {target}")
+        return np.asarray(positions, dtype=np.int64)
+
+    def apply_delta(self, delta: Dict[str, Any]) -> Tuple['GraphStore', np.ndarray]:
+        """
+        应用图增量，返回新的图存储
+
+        增量格式与JSON图数据一致：add_nodes与add_edges为节点/边记录列表，
+        remove_nodes为节点ID列表，remove_edges为含source与target的记录列表。
+        先执行删除再执行添加；已存在的节点或边被添加时更新其属性。
+
+        Args:
+            delta: 图增量
+
+        Returns:
+            (新的图存储, 旧节点索引到新节点索引的映射数组，被删除的节点为-1)
+        """
+        node_mask = np.ones(self.num_nodes, dtype=bool)
+        for node_id in delta.get('remove_nodes', []):
+            if node_id not in self.index:
+                raise ValueError(f"要删除的节点不存在: {node_id}")
+            node_mask[self.index[node_id]] = False
+
+        edge_mask = np.ones(self.num_edges, dtype=bool)
+        removed = [(e['source'], e['target']) for e in delta.get('remove_edges', [])]
+        edge_mask[self.edge_positions(removed)] = False
+
+        builder = GraphStoreBuilder.from_store(self, node_mask, edge_mask)
+        for node_data in delta.get('add_nodes', []):
+            builder.add_node_record(node_data)
+        for edge_data in delta.get('add_edges', []):
+            builder.add_edge_record(edge_data)
+
+        remap = np.full(self.num_nodes, -1, dtype=np.int64)
+        remap[node_mask] = np.arange(int(node_mask.sum()))
+        return builder.build(), remap
+
+    def affected_nodes(self, new_store: 'GraphStore', remap: np.ndarray,
+                       delta: Dict[str, Any]) -> np.ndarray:
+        """
+        计算增量影响到入边贡献的节点（以新图索引表示）
+
+        出边集合发生变化的源节点，其全部新旧后继都会受影响；
+        此外新加入的节点也计入受影响集合。
+
+        Args:
+            new_store: 应用增量后的图存储
+            remap: 旧节点索引到新节点索引的映射
+            delta: 图增量
+
+        Returns:
+            受影响节点的新索引数组
+        """
+        changed_old = set()
+        for edge_data in delta.get('remove_edges', []):
+            changed_old.add(self.index[edge_data['source']])
+        for node_id in delta.get('remove_nodes', []):
+            i = self.index[node_id]
+            changed_old.add(i)
+            changed_old.update(self.predecessors(i).tolist())
+
+        affected = set()
+        changed_new = set()
+        for i in changed_old:
+            affected.update(remap[self.successors(i)].tolist())
+            if remap[i] >= 0:
+                changed_new.add(int(remap[i]))
+        for edge_data in delta.get('add_edges', []):
+            changed_new.add(new_store.index[edge_data['source']])
+        for i in changed_new:
+            affected.update(new_store.successors(i).tolist())
+
+        # 新节点：索引位于保留的旧节点之后
+        affected.update(range(int((remap >= 0).sum()), new_store.num_nodes))
+        affected.discard(-1)
+        return np.fromiter(sorted(affected), dtype=np.int64, count=len(affected))
+
+    @property
+    def num_nodes(self) -> int:
+        """节点数量"""
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        """边数量"""
+        return len(self.src)
+
+    def out_degree(self) -> np.ndarray:
+        """出度数组"""
+        return np.diff(self.out_indptr)
+
+    def in_degree(self) -> np.ndarray:
+        """入度数组"""
+        return np.diff(self.in_indptr)
+
+    def degree(self) -> np.ndarray:
+        """总度数组（入度+出度）"""
+        return self.out_degree() + self.in_degree()
+
+    def successors(self, i: int) -> np.ndarray:
+        """
+        获取后继节点索引
+
+        Args:
+            i: 节点索引
+
+        Returns:
+            后继节点索引数组
+        """
+        return self.dst[self.out_indptr[i]:self.out_indptr[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        """
+        获取前驱节点索引
+
+        Args:
+            i: 节点索引
+
+        Returns:
+            前驱节点索引数组
+        """
+        return self.src[self.in_perm[self.in_indptr[i]:self.in_indptr[i + 1]]]
+
+    def type_names(self) -> List[Optional[str]]:
+        """
+        获取每个节点的类型名称
+
+        Returns:
+            类型名称列表，无类型的节点为None
+        """
+        names = self.node_type_names + [None]
+        return [names[code] for code in self.node_type.tolist()]
+
+    def node_attributes(self, i: int) -> Dict[str, Any]:
+        """
+        获取单个节点的属性字典
+
+        Args:
+            i: 节点索引
+
+        Returns:
+            属性字典
+        """
+        attrs = {}
+        if self.node_type[i] >= 0:
+            attrs['type'] = self.node_type_names[self.node_type[i]]
+        if self.labels[i] is not None:
+            attrs['label'] = self.labels[i]
+        for key, column in self.columns.items():
+            if column[i] is not None:
+                attrs[key] = column[i]
+        return attrs
+
+    def edge_attributes(self, e: int) -> Dict[str, Any]:
+        """
+        获取单条边的属性字典
+
+        Args:
+            e: 边在CSR顺序中的位置
+
+        Returns:
+            属性字典
+        """
+        attrs = {}
+        if self.edge_type[e] >= 0:
+            attrs['type'] = self.edge_type_names[self.edge_type[e]]
+        attrs['weight'] = float(self.weight[e])
+        attrs.update(self.edge_properties.get(e, {}))
+        return attrs
+
+    def set_node_column(self, name: str, values: Any) -> None:
+        """
+        设置节点属性列，已生成的NetworkX视图会同步更新
+
+        Args:
+            name: 属性名
+            values: 与节点一一对应的数组或列表
+        """
+        if len(values) != self.num_nodes:
+            raise ValueError("属性列长度必须等于节点数量")
+        self.columns[name] = values
+
+        if self._nx_view is not None:
+            for node_id, value in zip(self.node_ids, values):
+                self._nx_view.nodes[node_id][name] = value
+
+    def to_networkx(self) -> Any:
+        """
+        获取NetworkX有向图视图（首次调用时构建并缓存）
+
+        视图是只读的（nx.freeze），增删节点或边会抛出NetworkXError，而不是
+        修改一个与数组存储不再同步的副本；节点与边的属性也不会写回存储。
+
+        Returns:
+            冻结的NetworkX有向图
+        """
+        if self._nx_view is None:
+            import networkx as nx
+
+            graph = nx.DiGraph()
+            graph.add_nodes_from(
+                (node_id, self.node_attributes(i)) for i, node_id in enumerate(self.node_ids)
+            )
+            ids = self.node_ids
+            graph.add_edges_from(
+                (ids[s], ids[d], self.edge_attributes(e))
+                for e, (s, d) in enumerate(zip(self.src.tolist(), self.dst.tolist()))
+            )
+            self._nx_view = nx.freeze(graph)
+        return self._nx_view
@@ -0,0 +1,362 @@
+"""
+迭代动画导出模块
+把PageRank迭代历史导出为动画：图只完整绘制一次（边、坐标轴与颜色条作为静态背景缓存），
+之后每帧恢复背景，只重绘节点集合与标题并把像素缓冲直接送入编码器，
+每帧的耗时与边数无关，帧也不会在内存中累积
+
+用法:
+    animator = HistoryAnimator(positions, sources, targets, labels)
+    animator.animate(visualizer.pagerank_history, 'pagerank.gif', fps=4)
+"""
+
+import itertools
+import os
+import shutil
+import subprocess
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from fast_draw import draw_edges, draw_nodes, fit_axes
+from frame_stream import FrameStreamReader
+
+
+# 通过ffmpeg编码的视频格式
+VIDEO_FORMATS = {'.mp4', '.webm', '.mkv', '.mov'}
+# 超过该节点数时不绘制标签
+_LABEL_LIMIT = 200
+
+
+class ImageSequenceWriter:
+    """把每帧写为目录中的一张图片（frame-NNNN.png）"""
+
+    def __init__(self, output_dir: str, image_format: str = 'png'):
+        """
+        Args:
+            output_dir: 输出目录
+            image_format: 图片格式，PIL支持的任意格式
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self.num_frames = 0
+
+    def write(self, rgba: np.ndarray) -> None:
+        """
+        写入一帧
+
+        Args:
+            rgba: 高×宽×4 的uint8像素
+        """
+        from PIL import Image
+
+        image = Image.fromarray(rgba, 'RGBA')
+        if self.image_format.lower() in ('jpg', 'jpeg', 'bmp'):
+            image = image.convert('RGB')
+        image.save(os.path.join(self.output_dir, f"frame-{self.num_frames:04d}.{self.image_format}"))
+        self.num_frames += 1
+
+    def close(self) -> None:
+        """图片已逐帧写出，无需收尾"""
+
+    def __enter__(self) -> 'ImageSequenceWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class GifWriter:
+    """
+    逐帧写出GIF动画
+
+    每帧量化为自己的局部调色板后立即编码写入文件，
+    不像 PIL 的 save_all 或 matplotlib 的 PillowWriter 那样先在内存中收集全部帧。
+    """
+
+    def __init__(self, path: str, fps: float = 4.0, loop: int = 0):
+        """
+        Args:
+            path: 输出路径
+            fps: 帧率
+            loop: 循环次数，0为无限循环
+        """
+        self.path = path
+        self.duration = int(round(1000.0 / fps))
+        self.loop = loop
+        self.num_frames = 0
+        self._file = open(path, 'wb')
+
+    def write(self, rgba: np.ndarray) -> None:
+        """
+        写入一帧
+
+        Args:
+            rgba: 高×宽×4 的uint8像素
+        """
+        from PIL import GifImagePlugin, Image
+
+        frame = Image.fromarray(rgba, 'RGBA').convert('RGB').quantize(256, method=Image.Quantize.FASTOCTREE)
+        if not self.num_frames:
+            header, _ = GifImagePlugin.getheader(frame, info={'loop': self.loop, 'duration': self.duration})
+            self._file.write(b''.join(header))
+        for chunk in GifImagePlugin.getdata(frame, duration=self.duration, include_color_table=True):
+            self._file.write(chunk)
+        self.num_frames += 1
+
+    def close(self) -> None:
+        """写入文件结束符并关闭文件"""
+        if not self._file.closed:
+            self._file.write(b';')
+            self._file.close()
+
+    def __enter__(self) -> 'GifWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FFmpegWriter:
+    """
+    通过管道把原始RGBA像素送入ffmpeg编码视频
+
+    与 matplotlib 的 FFMpegWriter 不同，帧不经过 savefig 重新绘制整张图。
+    """
+
+    def __init__(self, path: str, size: Tuple[int, int], fps: float = 4.0, codec: str = 'libx264'):
+        """
+        Args:
+            path: 输出路径
+            size: 帧的 (宽, 高) 像素
+            fps: 帧率
+            codec: 视频编码器
+        """
+        executable = shutil.which('ffmpeg')
+        if executable is None:
+            raise ValueError("导出视频需要ffmpeg，请安装ffmpeg或改为导出GIF/图片序列")
+
+        width, height = size
+        self.path = path
+        self.num_frames = 0
+        # yuv420p要求宽高为偶数，必要时裁掉最后一行或一列
+        self._crop = (height - height % 2, width - width % 2)
+        self._process = subprocess.Popen(
+            [executable, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+             '-s', f'{self._crop[1]}x{self._crop[0]}', '-r', str(fps), '-i', '-',
+             '-c:v', codec, '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE
+        )
+
+    def write(self, rgba: np.ndarray) -> None:
+        """
+        写入一帧
+
+        Args:
+            rgba: 高×宽×4 的uint8像素
+        """
+        self._process.stdin.write(np.ascontiguousarray(rgba[:self._crop[0], :self._crop[1]]).tobytes())
+        self.num_frames += 1
+
+    def close(self) -> None:
+        """关闭管道并等待ffmpeg完成编码"""
+        if self._process.stdin.closed:
+            return
+        self._process.stdin.close()
+        if self._process.wait():
+            raise ValueError(f"ffmpeg编码失败，退出码 {self._process.returncode}")
+
+    def __enter__(self) -> 'FFmpegWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_writer(output: str, size: Tuple[int, int], fps: float = 4.0):
+    """
+    按输出路径选择写入器：.gif 为GIF动画，.mp4/.webm/.mkv/.mov 由ffmpeg编码，
+    没有扩展名时作为目录写出PNG图片序列
+
+    Args:
+        output: 输出路径
+        size: 帧的 (宽, 高) 像素
+        fps: 帧率
+
+    Returns:
+        写入器
+    """
+    extension = os.path.splitext(output)[1].lower()
+    if extension == '.gif':
+        return GifWriter(output, fps)
+    if extension in VIDEO_FORMATS:
+        return FFmpegWriter(output, size, fps)
+    if not extension:
+        return ImageSequenceWriter(output)
+    raise ValueError(f"不支持的动画格式: {extension}，可选: .gif, {', '.join(sorted(VIDEO_FORMATS))} 或目录")
+
+
+def frame_range(frames: Union[Iterable[np.ndarray], FrameStreamReader]) -> Tuple[float, float, np.ndarray, int]:
+    """
+    扫描一遍全部帧，得到所有帧的最小值、最大值、最后一帧与帧数，
+    动画的大小与颜色按这一固定范围映射，不同帧之间可以直接比较
+
+    Args:
+        frames: 帧序列或帧流读取器
+
+    Returns:
+        (最小值, 最大值, 最后一帧, 帧数)
+    """
+    if isinstance(frames, FrameStreamReader):
+        frames = frames.frames()
+    low, high, last, count = np.inf, -np.inf, None, 0
+    for frame in frames:
+        low = min(low, float(np.min(frame)))
+        high = max(high, float(np.max(frame)))
+        last = frame
+        count += 1
+    if last is None:
+        raise ValueError("迭代历史为空")
+    return low, high, np.asarray(last, dtype=np.float64), count
+
+
+class HistoryAnimator:
+    """
+    PageRank迭代动画
+
+    节点位置与边固定，第一帧完整绘制后缓存背景，
+    之后每帧只更新节点集合的大小与颜色并重绘节点、标签与标题。
+    """
+
+    def __init__(self, positions: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+                 labels: Optional[List[Any]] = None, edge_widths: Union[float, np.ndarray] = 1.0,
+                 figsize: Tuple[float, float] = (12, 8), dpi: int = 100, cmap: str = 'viridis',
+                 min_size: float = 100.0, max_size: float = 2000.0, title: str = 'PageRank Iteration'):
+        """
+        Args:
+            positions: n×2 的节点位置
+            sources: 边的源节点索引
+            targets: 边的目标节点索引
+            labels: 节点标签，节点数不超过200时绘制
+            edge_widths: 边线宽（标量或每条边一个值）
+            figsize: 图形尺寸（英寸）
+            dpi: 分辨率
+            cmap: 节点颜色映射
+            min_size: 最小节点面积（点²）
+            max_size: 最大节点面积（点²）
+            title: 标题，每帧后接当前帧的说明
+        """
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        if labels is not None and len(labels) != len(self.positions):
+            raise ValueError("标签数量与节点数量不一致")
+        self.labels = labels
+        self.edge_widths = edge_widths
+        self.figsize = figsize
+        self.dpi = dpi
+        self.cmap = cmap
+        self.min_size = min_size
+        self.max_size = max_size
+        self.title = title
+
+    def _sizes(self, values: np.ndarray, low: float, high: float) -> np.ndarray:
+        """按固定范围把PageRank值映射为节点面积"""
+        scale = (np.asarray(values, dtype=np.float64) - low) / max(high - low, 1e-12)
+        return self.min_size + scale * (self.max_size - self.min_size)
+
+    def _setup(self, low: float, high: float, final: np.ndarray):
+        """
+        绘制静态背景并缓存，返回 (画布, 背景, 节点集合, 动态文本)
+
+        边按最后一帧的节点大小在节点边缘处截断，与收敛后的画面一致。
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        fit_axes(ax, self.positions, margin=0.08)
+
+        final_sizes = self._sizes(final, low, high)
+        draw_edges(ax, self.positions, self.sources, self.targets, widths=self.edge_widths,
+                   node_sizes=final_sizes, color='gray', alpha=0.5)
+        nodes = draw_nodes(ax, self.positions, final_sizes, final, cmap=self.cmap)
+        nodes.set_clim(low, high)
+        colorbar = fig.colorbar(nodes, ax=ax)
+        colorbar.set_label('PageRank Value')
+
+        texts = [ax.set_title(self.title, fontsize=14)]
+        if self.labels is not None and len(self.labels) <= _LABEL_LIMIT:
+            texts += [ax.text(x, y, str(label), fontsize=8, ha='center', va='center', zorder=3)
+                      for (x, y), label in zip(self.positions.tolist(), self.labels)]
+        for artist in [nodes] + texts:
+            artist.set_animated(True)
+
+        fig.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.94)
+        canvas.draw()
+        return canvas, canvas.copy_from_bbox(fig.bbox), nodes, texts
+
+    def animate(self, frames: Union[Iterable[np.ndarray], FrameStreamReader], output: Union[str, Any],
+                fps: float = 4.0, value_range: Optional[Tuple[float, float]] = None,
+                caption: Optional[Callable[[int], str]] = None) -> int:
+        """
+        导出动画
+
+        Args:
+            frames: 帧序列（如 pagerank_history）、帧流读取器或一次性的帧迭代器；
+                未给出value_range时先遍历一遍确定取值范围，此时不接受一次性的迭代器
+            output: 输出路径（见 open_writer），或带 write(rgba) 与 close() 方法的写入器
+            fps: 帧率
+            value_range: 大小与颜色映射的 (最小值, 最大值)，给出时帧只遍历一次
+            caption: 由帧序号生成标题说明的函数，默认为 "step k"
+
+        Returns:
+            写出的帧数
+        """
+        one_shot = iter(frames) is frames
+        if value_range is None:
+            if one_shot:
+                raise ValueError("一次性的帧迭代器无法预先确定取值范围，请提供value_range")
+            low, high, final, _ = frame_range(frames)
+        else:
+            low, high = value_range
+            # 边按最后一帧的节点大小截断；不能按下标取最后一帧（如一次性迭代器）时改用第一帧
+            final = None
+            if not one_shot:
+                try:
+                    final = frames[-1]
+                except (TypeError, IndexError):
+                    final = None
+
+        if isinstance(frames, FrameStreamReader):
+            frames = frames.frames()
+        frames = iter(frames)
+        first = next(frames, None)
+        if first is None:
+            raise ValueError("迭代历史为空")
+        final = np.asarray(first if final is None else final, dtype=np.float64)
+        if len(first) != len(self.positions) or len(final) != len(self.positions):
+            raise ValueError("帧的长度与节点数量不一致")
+
+        canvas, background, nodes, texts = self._setup(low, high, final)
+        title, labels = texts[0], texts[1:]
+        width, height = canvas.get_width_height()
+        writer = open_writer(output, (width, height), fps) if isinstance(output, str) else output
+
+        count = 0
+        try:
+            for step, values in enumerate(itertools.chain([first], frames)):
+                canvas.restore_region(background)
+                nodes.set_sizes(self._sizes(values, low, high))
+                nodes.set_array(np.asarray(values, dtype=np.float64))
+                title.set_text(f"{self.title} - {caption(step) if caption else f'step {step}'}")
+                for artist in [nodes] + labels + [title]:
+                    artist.axes.draw_artist(artist)
+                # 背景与动态元素都绘制在整张图的缓冲上，直接交给写入器，不经过savefig
+                writer.write(np.asarray(canvas.buffer_rgba()))
+                count += 1
+        finally:
+            writer.close()
+        return count
@@ -0,0 +1,135 @@
+"""
+标签放置模块
+按优先级（通常为PageRank降序）逐个尝试放置标签，标签范围插入均匀网格索引，
+与已放置标签重叠的候选依次尝试其他锚点，全部冲突时丢弃；放置数量达到预算即停止
+"""
+
+import math
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# 锚点：(水平对齐, 垂直对齐, x方向偏移符号, y方向偏移符号)，第一个为居中于节点
+ANCHORS = (
+    ('center', 'center', 0, 0),
+    ('left', 'center', 1, 0),
+    ('right', 'center', -1, 0),
+    ('center', 'bottom', 0, 1),
+    ('center', 'top', 0, -1),
+)
+
+# 字符宽度相对字号的估计值：全角字符约为1个字号，其余约为0.6个字号
+_WIDE_CHAR = 1.0
+_NARROW_CHAR = 0.6
+# 行高相对字号
+_LINE_HEIGHT = 1.2
+
+
+def estimate_extents(labels: Sequence[str], font_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按字符数估计标签的宽高，不调用字体排版
+
+    Args:
+        labels: 标签文本
+        font_size: 字号（与返回值使用相同单位，通常为像素）
+
+    Returns:
+        (宽度数组, 高度数组)
+    """
+    widths = np.empty(len(labels))
+    heights = np.empty(len(labels))
+    for i, text in enumerate(labels):
+        lines = text.split('\n')
+        widths[i] = font_size * max(
+            sum(_WIDE_CHAR if unicodedata.east_asian_width(char) in 'WF' else _NARROW_CHAR for char in line)
+            for line in lines
+        )
+        heights[i] = font_size * _LINE_HEIGHT * len(lines)
+    return widths, heights
+
+
+def label_box(x: float, y: float, width: float, height: float, offset: float,
+              anchor: int) -> Tuple[float, float, float, float]:
+    """
+    标签在给定锚点下的范围
+
+    Args:
+        x: 节点中心横坐标
+        y: 节点中心纵坐标（向上为正）
+        width: 标签宽度
+        height: 标签高度
+        offset: 非居中锚点下标签与节点中心的距离
+        anchor: ANCHORS中的下标
+
+    Returns:
+        (xmin, ymin, xmax, ymax)
+    """
+    _, _, sx, sy = ANCHORS[anchor]
+    cx = x + sx * (offset + width / 2)
+    cy = y + sy * (offset + height / 2)
+    return cx - width / 2, cy - height / 2, cx + width / 2, cy + height / 2
+
+
+def place_labels(points: np.ndarray, widths: np.ndarray, heights: np.ndarray,
+                 offsets: Optional[np.ndarray] = None, budget: Optional[int] = None, anchors: bool = True,
+                 bounds: Optional[Tuple[float, float, float, float]] = None,
+                 padding: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按给定顺序贪心放置互不重叠的标签
+
+    标签范围插入边长约为标签中位尺寸的均匀网格，每次检查只访问标签覆盖的
+    少数网格单元；已放置的标签互不重叠，每个单元中的标签数有上界，
+    因此总耗时与候选数近似线性。
+
+    Args:
+        points: m×2 的候选节点位置（像素，y向上），按优先级从高到低排列
+        widths: 标签宽度
+        heights: 标签高度
+        offsets: 非居中锚点下标签与节点中心的距离（通常为节点半径加间隙），默认为0
+        budget: 最多放置的标签数，None为不限
+        anchors: 居中位置冲突时是否尝试节点右侧、左侧、上方与下方
+        bounds: 可见范围 (xmin, ymin, xmax, ymax)，超出范围的标签不放置
+        padding: 标签之间的最小间距
+
+    Returns:
+        (放置的候选下标数组（升序，即优先级顺序）, 对应的锚点下标数组)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if budget is not None and budget <= 0 or len(points) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # 网格单元取候选标签的中位尺寸，每个标签通常只覆盖1~4个单元
+    cell = max(float(np.median(np.maximum(widths, heights))) + padding, 1.0)
+    grid: Dict[Tuple[int, int], List[Tuple[float, float, float, float]]] = {}
+    tries = range(len(ANCHORS)) if anchors else range(1)
+    xs, ys = points[:, 0].tolist(), points[:, 1].tolist()
+    widths, heights = np.asarray(widths).tolist(), np.asarray(heights).tolist()
+    offsets = [0.0] * len(xs) if offsets is None else np.broadcast_to(offsets, (len(xs),)).tolist()
+    half = padding / 2
+
+    placed, placed_anchors = [], []
+    for i in range(len(xs)):
+        for anchor in tries:
+            xmin, ymin, xmax, ymax = label_box(xs[i], ys[i], widths[i], heights[i], offsets[i], anchor)
+            if bounds is not None and (xmin < bounds[0] or ymin < bounds[1] or xmax > bounds[2] or ymax > bounds[3]):
+                continue
+            xmin, ymin, xmax, ymax = xmin - half, ymin - half, xmax + half, ymax + half
+            cells = [(gx, gy)
+                     for gx in range(math.floor(xmin / cell), math.floor(xmax / cell) + 1)
+                     for gy in range(math.floor(ymin / cell), math.floor(ymax / cell) + 1)]
+            if any(xmin < other[2] and other[0] < xmax and ymin < other[3] and other[1] < ymax
+                   for key in cells for other in grid.get(key, ())):
+                continue
+
+            box = (xmin, ymin, xmax, ymax)
+            for key in cells:
+                grid.setdefault(key, []).append(box)
+            placed.append(i)
+            placed_anchors.append(anchor)
+            break
+        if budget is not None and len(placed) >= budget:
+            break
+
+    return np.array(placed, dtype=np.int64), np.array(placed_anchors, dtype=np.int64)
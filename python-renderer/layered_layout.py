@@ -0,0 +1,272 @@
+"""
+分层布局引擎模块
+Sugiyama风格的层次布局：破环、最长路径分层、长边虚拟节点、交叉减少与坐标压缩
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+
+def layered_layout(num_nodes: int, sources: np.ndarray, targets: np.ndarray, sweeps: int = 4,
+                   method: str = 'barycenter', compaction_passes: int = 4,
+                   max_dummies: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算分层布局
+
+    1. 破环：以入度为0的节点优先作为DFS根，反转回边使图成为DAG
+    2. 分层：按拓扑前沿逐轮剥离，得到最长路径分层
+    3. 跨越多层的边插入虚拟节点，使每条边只连接相邻两层；虚拟节点总数
+       超出预算时，跨度最大的边不参与后续排序与坐标分配
+    4. 交叉减少：逐层向下、向上交替按重心（或中位数）排序
+    5. 坐标分配：在保持层内顺序与最小间距的前提下向邻居的平均位置压缩
+
+    Args:
+        num_nodes: 节点数量
+        sources: 边的源节点索引
+        targets: 边的目标节点索引
+        sweeps: 交叉减少的往返扫描次数
+        method: 排序依据，'barycenter' 或 'median'
+        compaction_passes: 坐标压缩的往返次数
+        max_dummies: 虚拟节点数量上限，默认为 2·(节点数 + 边数)
+
+    Returns:
+        (n×2 的位置数组，x位于[0.1, 0.9]、y从上到下递减；每个节点的层号)
+    """
+    if method not in ('barycenter', 'median'):
+        raise ValueError(f"不支持的交叉减少方法: {method}")
+
+    n = num_nodes
+    if n == 0:
+        return np.zeros((0, 2)), np.zeros(0, dtype=np.int64)
+
+    src = np.asarray(sources, dtype=np.int64)
+    dst = np.asarray(targets, dtype=np.int64)
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+
+    src, dst = _break_cycles(n, src, dst)
+    layer = _assign_layers(n, src, dst)
+    if max_dummies is None:
+        max_dummies = 2 * (n + len(src))
+    total, layer, src, dst = _insert_dummies(n, layer, src, dst, max_dummies)
+    order_pos, layer_nodes = _reduce_crossings(total, layer, src, dst, sweeps, method)
+    x = _assign_coordinates(layer, layer_nodes, order_pos, src, dst, compaction_passes)
+
+    x = x[:n]
+    span = x.max() - x.min()
+    x = 0.1 + 0.8 * (x - x.min()) / span if span > 0 else np.full(n, 0.5)
+    max_layer = layer[:n].max()
+    y = 1.0 - layer[:n] / (max_layer + 1)
+    return np.column_stack((x, y)), layer[:n]
+
+
+def _csr(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """按源节点排序的邻接数组"""
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def _break_cycles(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """迭代DFS找出回边并将其反转，时间复杂度O(n + m)"""
+    order = np.argsort(src, kind='stable')
+    src, dst = src[order], dst[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+    ptr = indptr.tolist()
+    targets = dst.tolist()
+    state = [0] * n  # 0: 未访问, 1: 在栈上, 2: 已完成
+    back = []
+
+    # 入度为0的节点优先作为根，减少被反转的边
+    indegree = np.bincount(dst, minlength=n)
+    roots = np.concatenate((np.flatnonzero(indegree == 0), np.flatnonzero(indegree > 0))).tolist()
+    for root in roots:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [root]
+        cursor = [ptr[root]]
+        while stack:
+            u = stack[-1]
+            e = cursor[-1]
+            if e < ptr[u + 1]:
+                cursor[-1] = e + 1
+                v = targets[e]
+                if state[v] == 0:
+                    state[v] = 1
+                    stack.append(v)
+                    cursor.append(ptr[v])
+                elif state[v] == 1:
+                    back.append(e)
+            else:
+                state[u] = 2
+                stack.pop()
+                cursor.pop()
+
+    if back:
+        back = np.asarray(back, dtype=np.int64)
+        src, dst = src.copy(), dst.copy()
+        src[back], dst[back] = dst[back], src[back].copy()
+    return src, dst
+
+
+def _assign_layers(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """逐轮剥离入度为0的前沿节点，轮次即最长路径层号"""
+    indptr, targets = _csr(n, src, dst)
+    remaining = np.bincount(dst, minlength=n)
+    layer = np.zeros(n, dtype=np.int64)
+
+    frontier = np.flatnonzero(remaining == 0)
+    level = 0
+    while len(frontier):
+        layer[frontier] = level
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+
+        # 拼接前沿节点的全部出边区间
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        successors, hits = np.unique(targets[np.arange(total) + offsets], return_counts=True)
+        remaining[successors] -= hits
+        frontier = successors[remaining[successors] == 0]
+        level += 1
+
+    return layer
+
+
+def _insert_dummies(n: int, layer: np.ndarray, src: np.ndarray, dst: np.ndarray,
+                    max_dummies: int) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    """为跨越多层的边插入虚拟节点链，返回 (节点总数, 层号, 源, 目标)"""
+    span = layer[dst] - layer[src]
+    extra = span - 1
+    num_dummies = int(extra.sum())
+    if num_dummies > max_dummies:
+        # 按跨度从小到大展开，直到用完预算；更长的边被舍弃
+        ranked = np.sort(extra)
+        fits = np.searchsorted(np.cumsum(ranked), max_dummies, side='right')
+        cutoff = ranked[fits] - 1 if fits < len(ranked) else ranked[-1]
+        keep = extra <= cutoff
+        src, dst, span, extra = src[keep], dst[keep], span[keep], extra[keep]
+        num_dummies = int(extra.sum())
+    if num_dummies == 0:
+        return n, layer, src, dst
+
+    # 每条边展开为 span+1 个节点组成的路径：源、若干虚拟节点、目标
+    path_length = span + 1
+    path_start = np.concatenate(([0], np.cumsum(path_length)[:-1]))
+    step = np.arange(int(path_length.sum())) - np.repeat(path_start, path_length)
+    edge_of = np.repeat(np.arange(len(src)), path_length)
+
+    dummy_start = n + np.concatenate(([0], np.cumsum(extra)[:-1]))
+    path = dummy_start[edge_of] + step - 1
+    first = step == 0
+    last = step == span[edge_of]
+    path[first] = src[edge_of[first]]
+    path[last] = dst[edge_of[last]]
+
+    is_dummy = ~(first | last)
+    dummy_layer = np.empty(num_dummies, dtype=np.int64)
+    dummy_layer[path[is_dummy] - n] = layer[src[edge_of[is_dummy]]] + step[is_dummy]
+
+    # 同一条路径上相邻的两个节点构成一条新边
+    link = ~last
+    new_src = path[link]
+    new_dst = path[np.flatnonzero(link) + 1]
+    return n + num_dummies, np.concatenate((layer, dummy_layer)), new_src, new_dst
+
+
+def _reduce_crossings(total: int, layer: np.ndarray, src: np.ndarray, dst: np.ndarray,
+                      sweeps: int, method: str) -> Tuple[np.ndarray, list]:
+    """逐层按重心或中位数排序以减少交叉，返回每个节点的层内序号与每层的节点顺序"""
+    num_layers = int(layer.max()) + 1
+    by_layer = np.argsort(layer, kind='stable')
+    layer_ptr = np.zeros(num_layers + 1, dtype=np.int64)
+    np.cumsum(np.bincount(layer, minlength=num_layers), out=layer_ptr[1:])
+    layer_nodes = [by_layer[layer_ptr[i]:layer_ptr[i + 1]] for i in range(num_layers)]
+
+    pos = np.empty(total, dtype=np.int64)
+    for nodes in layer_nodes:
+        pos[nodes] = np.arange(len(nodes))
+
+    # 边按下层端点所在层分组（向下扫描）与按上层端点所在层分组（向上扫描）
+    down = np.argsort(layer[dst], kind='stable')
+    down_ptr = np.zeros(num_layers + 1, dtype=np.int64)
+    np.cumsum(np.bincount(layer[dst], minlength=num_layers), out=down_ptr[1:])
+    up = np.argsort(layer[src], kind='stable')
+    up_ptr = np.zeros(num_layers + 1, dtype=np.int64)
+    np.cumsum(np.bincount(layer[src], minlength=num_layers), out=up_ptr[1:])
+
+    for _ in range(sweeps):
+        for i in range(1, num_layers):
+            edges = down[down_ptr[i]:down_ptr[i + 1]]
+            layer_nodes[i] = _sort_layer(layer_nodes[i], pos, dst[edges], src[edges], method)
+        for i in range(num_layers - 2, -1, -1):
+            edges = up[up_ptr[i]:up_ptr[i + 1]]
+            layer_nodes[i] = _sort_layer(layer_nodes[i], pos, src[edges], dst[edges], method)
+
+    return pos, layer_nodes
+
+
+def _sort_layer(nodes: np.ndarray, pos: np.ndarray, members: np.ndarray, neighbors: np.ndarray,
+                method: str) -> np.ndarray:
+    """按相邻层邻居的重心或中位数重新排序一层节点，并更新层内序号"""
+    size = len(nodes)
+    if size < 2 or len(members) == 0:
+        return nodes
+
+    # nodes始终按层内序号排列，key以层内序号为下标，无邻居的节点保持原位置
+    local = pos[members]
+    count = np.bincount(local, minlength=size)
+    key = np.arange(size, dtype=np.float64)
+    has = count > 0
+
+    if method == 'barycenter':
+        total = np.bincount(local, weights=pos[neighbors], minlength=size)
+        key[has] = total[has] / count[has]
+    else:
+        order = np.lexsort((pos[neighbors], local))
+        start = np.concatenate(([0], np.cumsum(count)[:-1]))
+        median = pos[neighbors][order][start[has] + (count[has] - 1) // 2]
+        key[has] = median
+
+    # 并列时保持原顺序
+    ranked = nodes[np.argsort(key, kind='stable')]
+    pos[ranked] = np.arange(size)
+    return ranked
+
+
+def _assign_coordinates(layer: np.ndarray, layer_nodes: list, pos: np.ndarray, src: np.ndarray,
+                        dst: np.ndarray, passes: int) -> np.ndarray:
+    """
+    在保持层内顺序且相邻节点间距至少为1的前提下，把节点拉向邻居的平均横坐标
+
+    约束 x[i] >= x[i-1] + 1 等价于 z = x - i 单调不减；分别取目标值的
+    左侧上包络与右侧下包络并取平均，得到满足约束的平衡解。
+    """
+    total = len(layer)
+    x = pos.astype(np.float64)
+    degree = np.bincount(src, minlength=total) + np.bincount(dst, minlength=total)
+
+    # 按 (层, 层内序号) 排列全部节点，各层的包络通过分段累积一次算出：
+    # 每层加上递增的偏移量，使累积运算不会跨越层边界
+    ordered = np.concatenate(layer_nodes)
+    index = pos[ordered].astype(np.float64)
+    offset = layer[ordered].astype(np.float64)
+
+    for _ in range(passes):
+        neighbor_sum = np.bincount(src, weights=x[dst], minlength=total) \
+            + np.bincount(dst, weights=x[src], minlength=total)
+        desired = np.where(degree > 0, neighbor_sum / np.maximum(degree, 1), x)
+
+        z = desired[ordered] - index
+        shift = offset * (z.max() - z.min() + 1)
+        left = np.maximum.accumulate(z + shift)
+        right = np.minimum.accumulate((z + shift)[::-1])[::-1]
+        x[ordered] = (left + right) / 2 - shift + index
+
+    return x
@@ -0,0 +1,190 @@
+"""
+细节层次模块
+按PageRank保留最重要的节点，其余节点按模块属性或社区聚合为簇节点，
+簇之间的平行边合并并累加权重，使绘制的元素数量不随图规模增长
+"""
+
+import numpy as np
+from typing import Hashable, List, Optional, Tuple
+
+from graph_store import GraphStore, GraphStoreBuilder
+
+
+CLUSTER_TYPE = 'cluster'
+
+
+def label_propagation(num_nodes: int, sources: np.ndarray, targets: np.ndarray,
+                      weights: Optional[np.ndarray] = None, iterations: int = 10,
+                      seed: int = 0) -> np.ndarray:
+    """
+    标签传播社区发现（视为无向图）
+
+    每轮随机选取一半节点，把标签更新为邻居中权重和最大的标签；
+    半同步更新避免了同步更新在二部结构上的振荡。
+
+    Args:
+        num_nodes: 节点数量
+        sources: 边的源节点索引
+        targets: 边的目标节点索引
+        weights: 边权重
+        iterations: 最大轮数
+        seed: 随机种子
+
+    Returns:
+        社区编号数组，编号为 0..k-1
+    """
+    n = num_nodes
+    labels = np.arange(n, dtype=np.int64)
+    if n == 0:
+        return labels
+
+    src = np.asarray(sources, dtype=np.int64)
+    dst = np.asarray(targets, dtype=np.int64)
+    w = np.ones(len(src)) if weights is None else np.asarray(weights, dtype=np.float64)
+    nodes = np.concatenate((src, dst))
+    neighbors = np.concatenate((dst, src))
+    w = np.concatenate((w, w))
+
+    rng = np.random.default_rng(seed)
+    for _ in range(iterations):
+        # 每个 (节点, 邻居标签) 的权重和，取每个节点得分最高的标签
+        keys, inverse = np.unique(nodes * n + labels[neighbors], return_inverse=True)
+        scores = np.bincount(inverse, weights=w)
+        owner = keys // n
+        order = np.lexsort((-scores, owner))
+        first = order[np.concatenate(([True], owner[order][1:] != owner[order][:-1]))]
+
+        best = labels.copy()
+        best[owner[first]] = keys[first] % n
+        update = rng.random(n) < 0.5
+        changed = update & (best != labels)
+        if not changed.any():
+            break
+        labels[changed] = best[changed]
+
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def aggregate_graph(store: GraphStore, pagerank: np.ndarray, positions: np.ndarray, budget: int,
+                    group_by: Optional[str] = 'module',
+                    seed: int = 0) -> Optional[Tuple[GraphStore, np.ndarray, np.ndarray]]:
+    """
+    生成细节层次视图
+
+    约三分之一的预算用于节点：其中固定比例留给簇节点，其余保留PageRank
+    最高的节点；剩余节点按 group_by 属性分组（缺少该属性的节点按社区分组），
+    分组数超出上限时PageRank总和较小的分组合并为一个 other 簇。
+    簇的PageRank为成员之和，位置为成员按PageRank加权的质心。
+    边映射到保留节点或簇上，簇内部的边被丢弃，同向平行边合并且权重相加，
+    边数仍超出预算时只保留权重最大的边。
+
+    Args:
+        store: 图存储
+        pagerank: 按节点下标排列的PageRank值
+        positions: n×2 的节点位置
+        budget: 绘制元素（节点+边）数量上限
+        group_by: 用于分组的节点属性名，None表示全部按社区分组
+        seed: 社区发现的随机种子
+
+    Returns:
+        (视图图存储, 视图PageRank值, 视图节点位置)；图本身未超出预算时返回None
+    """
+    n = store.num_nodes
+    if n + store.num_edges <= budget:
+        return None
+    if budget < 3:
+        raise ValueError("细节层次预算至少为3")
+
+    node_budget = max(2, budget // 3)
+    max_clusters = max(1, node_budget // 5)
+    keep_count = min(n, node_budget - max_clusters)
+
+    ranked = np.argsort(-pagerank, kind='stable')
+    kept, rest = ranked[:keep_count], ranked[keep_count:]
+
+    group, names = _group_nodes(store, rest, group_by, seed)
+    group, names = _limit_groups(group, names, pagerank[rest], max_clusters)
+    num_groups = len(names)
+
+    # 新下标：保留节点在前，簇节点在后
+    view_index = np.empty(n, dtype=np.int64)
+    view_index[kept] = np.arange(keep_count)
+    view_index[rest] = keep_count + group
+
+    mass = np.bincount(group, weights=pagerank[rest], minlength=num_groups)
+    count = np.bincount(group, minlength=num_groups)
+    # PageRank全为0的簇退化为普通质心
+    weight = np.where(mass[group] > 0, pagerank[rest], 1.0)
+    total = np.bincount(group, weights=weight, minlength=num_groups)
+    centroid = np.column_stack([
+        np.bincount(group, weights=weight * positions[rest, axis], minlength=num_groups) / total
+        for axis in range(2)
+    ]) if num_groups else np.zeros((0, 2))
+
+    src, dst, edge_weight = _merge_edges(view_index[store.src], view_index[store.dst], store.weight,
+                                         keep_count, budget - keep_count - num_groups)
+
+    builder = GraphStoreBuilder()
+    type_names = store.type_names()
+    for i in kept.tolist():
+        builder.add_node(store.node_ids[i], type_names[i], store.labels[i])
+    for g, name in enumerate(names):
+        builder.add_node((CLUSTER_TYPE, name), CLUSTER_TYPE, f"{name} ({count[g]})")
+
+    view_ids = builder.node_ids
+    for a, b, w in zip(src.tolist(), dst.tolist(), edge_weight.tolist()):
+        builder.add_edge(view_ids[a], view_ids[b], weight=w)
+
+    view_pagerank = np.concatenate((pagerank[kept], mass))
+    view_positions = np.concatenate((positions[kept], centroid))
+    return builder.build(), view_pagerank, view_positions
+
+
+def _group_nodes(store: GraphStore, nodes: np.ndarray, group_by: Optional[str],
+                 seed: int) -> Tuple[np.ndarray, List[Hashable]]:
+    """为待聚合的节点分组，返回 (每个节点的分组编号, 分组名称列表)"""
+    column = store.columns.get(group_by) if group_by else None
+    values = [column[i] for i in nodes.tolist()] if column is not None else [None] * len(nodes)
+
+    missing = np.array([value is None for value in values], dtype=bool)
+    if missing.any():
+        # 缺少分组属性的节点按社区划分
+        community = label_propagation(store.num_nodes, store.src, store.dst, store.weight, seed=seed)
+        for i in np.flatnonzero(missing).tolist():
+            values[i] = f"community {community[nodes[i]]}"
+
+    names = list(dict.fromkeys(values))
+    code = {name: g for g, name in enumerate(names)}
+    return np.array([code[value] for value in values], dtype=np.int64), names
+
+
+def _limit_groups(group: np.ndarray, names: List[Hashable], pagerank: np.ndarray,
+                  max_groups: int) -> Tuple[np.ndarray, List[Hashable]]:
+    """分组数超过上限时，保留PageRank总和最大的分组，其余合并为 other"""
+    if len(names) <= max_groups:
+        return group, names
+
+    mass = np.bincount(group, weights=pagerank, minlength=len(names))
+    top = np.argsort(-mass, kind='stable')[:max_groups - 1]
+    remap = np.full(len(names), len(top), dtype=np.int64)
+    remap[top] = np.arange(len(top))
+    return remap[group], [names[g] for g in top.tolist()] + ['other']
+
+
+def _merge_edges(src: np.ndarray, dst: np.ndarray, weight: np.ndarray, keep_count: int,
+                 edge_budget: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """丢弃簇内部的边，合并平行边并累加权重，超出预算时保留权重最大的边"""
+    internal = (src == dst) & (src >= keep_count)
+    src, dst, weight = src[~internal], dst[~internal], weight[~internal]
+
+    size = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+    keys, first, inverse = np.unique(src * size + dst, return_index=True, return_inverse=True)
+    merged = np.bincount(inverse, weights=weight, minlength=len(keys))
+
+    # 保持原边的先后顺序
+    order = np.argsort(first, kind='stable')
+    if len(order) > edge_budget:
+        heaviest = np.argsort(-merged[order], kind='stable')[:max(edge_budget, 0)]
+        order = order[np.sort(heaviest)]
+    keys = keys[order]
+    return keys // size, keys % size, merged[order]
@@ -1,12 +1,26 @@
+from contextlib import contextmanager
+
 import numpy as np
 
+from frame_stream import FrameStreamReader, FrameStreamWriter, export_steps
+from pagerank_solvers import (
+    Acceleration,
+    StoppingRule,
+    accelerated_iteration,
+    batch_power_iteration,
+    stopping_threshold,
+)
+from result_cache import ResultCache, array_fingerprint, make_key
+from sparse_matrix import ParallelCSR, as_csr, build_transition
+
 class PageRankVisualizer:
     """
     PageRank算法可视化类
     展示初始分配→重新分配→迭代计算→收敛判断→排名判断的流程
     """
     
-    def __init__(self, damping_factor=0.85, max_iterations=4, tolerance=1e-6):
+    def __init__(self, damping_factor=0.85, max_iterations=4, tolerance=1e-6, sparse=False, cache_dir=None,
+                 acceleration=Acceleration.NONE, stopping=StoppingRule.DIFFERENCE, threads=1):
         """
         初始化PageRank计算器
         
@@ -14,13 +28,26 @@ class PageRankVisualizer:
             damping_factor: 阻尼系数，通常为0.85
             max_iterations: 最大迭代次数
             tolerance: 收敛阈值
+            sparse: 是否使用稀疏模式（CSR转移矩阵），适用于大规模图
+            cache_dir: 结果缓存目录，设置后相同图与参数的迭代结果直接从磁盘读取
+            acceleration: 收敛加速方式（Aitken外推、二次外推或Anderson加速）
+            stopping: 停止规则，DIFFERENCE 为相邻两次迭代的L1差小于tolerance，
+                RESIDUAL 为残差不超过 (1 - damping_factor) × tolerance，保证与真解的误差不超过tolerance
+            threads: 稀疏模式下矩阵向量乘的线程数，None或0表示使用全部CPU核心
         """
         self.damping_factor = damping_factor
         self.max_iterations = max_iterations
         self.tolerance = tolerance
+        self.sparse = sparse
+        self.acceleration = Acceleration(acceleration)
+        self.stopping = StoppingRule(stopping)
+        self.threads = threads
         self.pagerank_history = []  # 存储每次迭代的PageRank值
+        self.residual_history = []  # 存储每次迭代的残差 ‖G(x) - x‖₁
         self.convergence_reached = False
         self.iteration_count = 0
+        self.cache = ResultCache(cache_dir) if cache_dir else None
+        self.frame_writer = None  # 设置后迭代历史写入帧流而不是pagerank_history
         
     def initialize_pagerank(self, num_nodes):
         """
@@ -34,9 +61,79 @@ class PageRankVisualizer:
         """
         # 初始均匀分配PageRank值
         initial_pagerank = np.ones(num_nodes) / num_nodes
-        self.pagerank_history.append(initial_pagerank.copy())
+        self._record_frame(initial_pagerank)
         return initial_pagerank
     
+    def _record_frame(self, pagerank):
+        """
+        记录一帧迭代结果：写入帧流，或追加到pagerank_history
+        
+        Args:
+            pagerank: 当前PageRank值
+        """
+        if self.frame_writer is not None:
+            self.frame_writer.write(pagerank)
+        else:
+            self.pagerank_history.append(pagerank.copy())
+    
+    @contextmanager
+    def stream_history(self, path, node_labels, delta=False):
+        """
+        在上下文内把迭代历史写入float32帧流文件，而不是保存在内存中
+        
+        进入时已在pagerank_history中的帧会先写入帧流并从列表中移除；
+        帧流方式下迭代结果不写入结果缓存。
+        
+        Args:
+            path: 帧流文件路径
+            node_labels: 节点标签表，只保存一次
+            delta: 是否增量编码
+            
+        Returns:
+            帧流写入器
+        """
+        writer = FrameStreamWriter(path, len(node_labels), node_labels, delta)
+        for frame in self.pagerank_history:
+            writer.write(frame)
+        self.pagerank_history = []
+        self.frame_writer = writer
+        try:
+            yield writer
+        finally:
+            self.frame_writer = None
+            writer.close()
+    
+    def export_animation_chunks(self, output_dir, node_labels, chunk_size=64, frame_path=None):
+        """
+        导出分块的动画步骤数据（pagerank-steps.json清单与分块文件）
+        
+        与get_animation_data不同，标签表只出现一次，数值按float32精度
+        分块写出，Web端可以先加载清单再按需加载分块。
+        
+        Args:
+            output_dir: 输出目录
+            node_labels: 节点标签列表
+            chunk_size: 每个分块的帧数
+            frame_path: 帧流文件路径，默认使用内存中的pagerank_history
+            
+        Returns:
+            清单字典
+        """
+        if frame_path is not None:
+            reader = FrameStreamReader(frame_path)
+            frames = reader.frames()
+            final_pagerank = reader[-1] if len(reader) else None
+        else:
+            frames = iter(self.pagerank_history)
+            final_pagerank = self.pagerank_history[-1] if self.pagerank_history else None
+        
+        final_ranking = []
+        if final_pagerank is not None:
+            final_ranking = [[label, float(score)] for label, score in self.rank_nodes(final_pagerank, node_labels)]
+        
+        return export_steps(frames, node_labels, output_dir, chunk_size,
+                            converged=self.convergence_reached, final_ranking=final_ranking)
+    
     def create_sample_graph(self):
         """
         创建示例图结构
@@ -83,10 +180,103 @@ class PageRankVisualizer:
         
         return transition_matrix
     
+    def calculate_sparse_transition(self, adjacency, num_nodes=None):
+        """
+        计算稀疏的出度概率转移矩阵（稀疏模式下的重新分配）
+        
+        悬挂节点不再物化为 1/n 的稠密行，而是返回掩码，
+        迭代时把悬挂节点的总PageRank作为秩一修正均匀加回。
+        
+        Args:
+            adjacency: 邻接结构，可以是边列表、CSR矩阵或稠密邻接矩阵
+            num_nodes: 节点数量，边列表输入时使用
+            
+        Returns:
+            (CSR转移矩阵, 悬挂节点掩码)
+        """
+        return build_transition(adjacency, num_nodes)
+    
     def iterate_pagerank(self, adjacency_matrix, initial_pagerank):
         """
         迭代计算PageRank值（迭代计算）
         
+        稠密路径保留作为小型教学图的参考实现；开启sparse或传入
+        边列表/CSR邻接结构时使用稀疏路径。
+        
+        Args:
+            adjacency_matrix: 邻接矩阵（稀疏模式下也可以是边列表或CSR矩阵）
+            initial_pagerank: 初始PageRank值
+            
+        Returns:
+            最终PageRank值
+        """
+        sparse = self.sparse or not isinstance(adjacency_matrix, np.ndarray)
+        if self.cache is not None and sparse:
+            # 边列表可能是一次性迭代器，先转换为CSR再同时用于哈希与计算
+            adjacency_matrix = as_csr(adjacency_matrix, len(initial_pagerank))
+        key = self._cache_key(adjacency_matrix, initial_pagerank, sparse)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                # 命中时恢复迭代历史与收敛状态，与重新计算的效果相同
+                for frame in cached['history']:
+                    self._record_frame(frame)
+                self.residual_history.extend(cached['residuals'].tolist())
+                self.iteration_count = int(cached['iterations'][0])
+                self.convergence_reached = bool(cached['converged'][0])
+                return cached['final']
+        
+        start = len(self.pagerank_history)
+        residual_start = len(self.residual_history)
+        # 帧流方式下历史不在内存中，不写入缓存
+        if self.frame_writer is not None:
+            key = None
+        if sparse:
+            result = self._iterate_pagerank_sparse(adjacency_matrix, initial_pagerank)
+        else:
+            result = self._iterate_pagerank_dense(adjacency_matrix, initial_pagerank)
+        
+        if key:
+            self.cache.put(key, {
+                'final': result,
+                'history': np.array(self.pagerank_history[start:], dtype=np.float64).reshape(-1, len(result)),
+                'residuals': np.array(self.residual_history[residual_start:], dtype=np.float64),
+                'iterations': np.array([self.iteration_count], dtype=np.int64),
+                'converged': np.array([self.convergence_reached], dtype=np.uint8)
+            })
+        return result
+    
+    def _cache_key(self, adjacency, initial_pagerank, sparse):
+        """
+        生成迭代结果的缓存键
+        
+        Args:
+            adjacency: 邻接结构
+            initial_pagerank: 初始PageRank值
+            sparse: 是否走稀疏路径
+            
+        Returns:
+            缓存键，未启用缓存时返回None
+        """
+        if self.cache is None:
+            return None
+        
+        initial_pagerank = np.asarray(initial_pagerank, dtype=np.float64)
+        csr = as_csr(adjacency, len(initial_pagerank))
+        fingerprint = array_fingerprint(csr.indptr, csr.indices, csr.data, initial_pagerank)
+        return make_key('visualizer', fingerprint, {
+            'damping_factor': self.damping_factor,
+            'tolerance': self.tolerance,
+            'max_iterations': self.max_iterations,
+            'sparse': sparse,
+            'acceleration': self.acceleration,
+            'stopping': self.stopping
+        })
+    
+    def _iterate_pagerank_dense(self, adjacency_matrix, initial_pagerank):
+        """
+        稠密模式下迭代计算PageRank值
+        
         Args:
             adjacency_matrix: 邻接矩阵
             initial_pagerank: 初始PageRank值
@@ -95,25 +285,97 @@ class PageRankVisualizer:
             最终PageRank值
         """
         n = adjacency_matrix.shape[0]
-        current_pagerank = initial_pagerank.copy()
         
         # 计算转移概率矩阵
         transition_matrix = self.calculate_outgoing_probabilities(adjacency_matrix)
         
-        # 迭代计算PageRank值
+        def step(pagerank):
+            # PageRank迭代公式
+            return (1 - self.damping_factor) / n + \
+                   self.damping_factor * np.dot(transition_matrix.T, pagerank)
+        
+        return self._run_iterations(step, initial_pagerank.copy())
+    
+    def _iterate_pagerank_sparse(self, adjacency, initial_pagerank):
+        """
+        稀疏模式下迭代计算PageRank值
+        
+        Args:
+            adjacency: 邻接结构
+            initial_pagerank: 初始PageRank值
+            
+        Returns:
+            最终PageRank值
+        """
+        n = len(initial_pagerank)
+        transition, dangling = self.calculate_sparse_transition(adjacency, n)
+        
+        if self.threads == 1:
+            def step(pagerank):
+                # 稀疏矩阵向量乘，悬挂节点的PageRank作为秩一修正均匀分配
+                dangling_mass = pagerank[dangling].sum()
+                return (1 - self.damping_factor) / n + \
+                       self.damping_factor * (transition.transpose_dot(pagerank) + dangling_mass / n)
+            
+            return self._run_iterations(step, np.asarray(initial_pagerank, dtype=np.float64).copy())
+        
+        # 多线程模式：转置矩阵按行分块并行相乘，常数项在各块内一并写入输出；
+        # 未启用加速时两个输出缓冲区交替使用（每帧记录时会复制）
+        kernel = ParallelCSR(transition.transpose(), self.threads)
+        buffers = (np.empty(n), np.empty(n)) if self.acceleration == Acceleration.NONE else None
+        dangling_index = np.flatnonzero(dangling)
+        dangling_values = np.empty(len(dangling_index))
+        
+        def step(pagerank):
+            dangling_mass = np.take(pagerank, dangling_index, out=dangling_values, mode='clip').sum()
+            out = None if buffers is None else buffers[pagerank is buffers[0]]
+            return kernel.dot(pagerank, out, self.damping_factor,
+                              (1 - self.damping_factor) / n + self.damping_factor * dangling_mass / n)
+        
+        try:
+            result = self._run_iterations(step, np.asarray(initial_pagerank, dtype=np.float64).copy())
+        finally:
+            kernel.close()
+        return result if buffers is None else result.copy()
+    
+    def _run_iterations(self, step, current_pagerank):
+        """
+        执行迭代并记录每次迭代的PageRank值与残差
+        
+        未启用加速时保持原有的迭代过程：收敛时返回上一次的迭代值；
+        启用加速时返回满足停止规则的 G(x)。
+        
+        Args:
+            step: 迭代映射，输入当前PageRank值，返回下一次的PageRank值
+            current_pagerank: 初始PageRank值
+            
+        Returns:
+            最终PageRank值
+        """
+        # DIFFERENCE 规则沿用原有阈值；RESIDUAL 规则按压缩系数换算为误差上界
+        threshold = stopping_threshold(self.stopping, self.tolerance, self.damping_factor)
+        
+        if self.acceleration != Acceleration.NONE:
+            result, self.iteration_count, self.convergence_reached, residuals = accelerated_iteration(
+                step, current_pagerank, threshold, self.max_iterations, self.acceleration,
+                callback=self._record_frame
+            )
+            self.residual_history.extend(residuals.tolist())
+            return result
+        
+        work = np.empty(len(current_pagerank))
         for iteration in range(self.max_iterations):
             self.iteration_count = iteration + 1
             
-            # PageRank迭代公式
-            new_pagerank = (1 - self.damping_factor) / n + \
-                          self.damping_factor * np.dot(transition_matrix.T, current_pagerank)
+            new_pagerank = step(current_pagerank)
             
             # 保存每次迭代的结果
-            self.pagerank_history.append(new_pagerank.copy())
+            self._record_frame(new_pagerank)
             
             # 检查收敛（收敛判断）
-            diff = np.linalg.norm(new_pagerank - current_pagerank, 1)
-            if diff < self.tolerance:
+            diff = np.abs(np.subtract(new_pagerank, current_pagerank, out=work), out=work).sum()
+            self.residual_history.append(float(diff))
+            if diff < threshold:
                 self.convergence_reached = True
                 break
                 
@@ -121,6 +383,47 @@ class PageRankVisualizer:
         
         return current_pagerank
     
+    def iterate_pagerank_batch(self, adjacency, num_nodes=None, damping_factors=None, personalizations=None):
+        """
+        批量迭代计算多组参数下的PageRank值（稀疏模式）
+        
+        每一步对所有未收敛的参数组共享一次稀疏矩阵乘法，各组独立判断收敛；
+        批量结果不写入 pagerank_history。
+        
+        Args:
+            adjacency: 邻接结构，可以是边列表、CSR矩阵或稠密邻接矩阵
+            num_nodes: 节点数量，边列表输入时使用
+            damping_factors: 阻尼系数列表，默认使用 self.damping_factor
+            personalizations: 个性化向量列表，每个长度为节点数量
+            
+        Returns:
+            (n×k 的PageRank矩阵, 每组的迭代次数)
+        """
+        transition, dangling = self.calculate_sparse_transition(adjacency, num_nodes)
+        n = transition.shape[0]
+        
+        if damping_factors is None:
+            damping_factors = [self.damping_factor]
+        if personalizations is None:
+            personalizations = [np.ones(n)] * len(damping_factors)
+        elif len(damping_factors) == 1:
+            damping_factors = list(damping_factors) * len(personalizations)
+        if len(damping_factors) != len(personalizations):
+            raise ValueError("阻尼系数与个性化向量的数量不一致")
+        
+        personalization = np.column_stack([np.asarray(p, dtype=np.float64) for p in personalizations])
+        personalization = personalization / personalization.sum(axis=0)
+        
+        pagerank, iterations, converged = batch_power_iteration(
+            transition.transpose(),
+            dangling,
+            np.asarray(damping_factors, dtype=np.float64),
+            personalization,
+            self.tolerance,
+            self.max_iterations
+        )
+        return pagerank, iterations
+    
     def rank_nodes(self, pagerank_values, node_labels):
         """
         根据PageRank值对节点进行排名（排名判断）
@@ -170,7 +473,48 @@ class PageRankVisualizer:
         
         plt.tight_layout()
         plt.show()
-    
+
+    def export_history_animation(self, output, adjacency, node_labels, fps=2, frame_path=None, positions=None,
+                                 **options):
+        """
+        把迭代历史导出为图上的动画（GIF、视频或图片序列）
+
+        图只绘制一次，之后每帧只更新节点的大小与颜色，帧逐个写入编码器，
+        不在内存中保存。
+
+        Args:
+            output: 输出路径，.gif、.mp4 等视频格式，或没有扩展名的图片序列目录
+            adjacency: 邻接结构（稠密矩阵、边列表或CSR矩阵）
+            node_labels: 节点标签列表
+            fps: 帧率
+            frame_path: 帧流文件路径，默认使用内存中的pagerank_history
+            positions: n×2 的节点位置，默认使用力导向布局
+            options: 传给 HistoryAnimator 的其他参数（figsize、dpi、cmap 等）
+
+        Returns:
+            写出的帧数
+        """
+        from force_layout import force_directed_layout
+        from history_animation import HistoryAnimator
+
+        csr = as_csr(adjacency, len(node_labels))
+        sources = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+        targets = csr.indices
+        if positions is None:
+            positions = force_directed_layout(len(node_labels), sources, targets, csr.data)
+
+        frames = FrameStreamReader(frame_path) if frame_path is not None else self.pagerank_history
+        converged = self.convergence_reached
+        last = (len(frames) if frame_path is not None else len(self.pagerank_history)) - 1
+
+        def caption(step):
+            if step == 0:
+                return 'Initial'
+            return f'Iter {step}' + (' (converged)' if converged and step == last else '')
+
+        animator = HistoryAnimator(positions, sources, targets, node_labels, **options)
+        return animator.animate(frames, output, fps=fps, caption=caption)
+
     def get_animation_data(self, node_labels):
         """
         获取动画数据，用于可视化展示
@@ -1,15 +1,44 @@
 """
 PageRank图形渲染程序的主模块
+
+networkx与matplotlib只在首次布局或绘图时导入，只计算PageRank的调用方不需要承担它们的导入开销
 """
 
+from __future__ import annotations
+
+import io
 import json
-import networkx as nx
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from typing import Dict, List, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 from enum import Enum
+from contextlib import nullcontext
 import os
+import sys
+
+from force_layout import force_directed_layout
+from graph_binary import open_graph, write_graph
+from graph_store import GraphStore, GraphStoreBuilder
+from layered_layout import layered_layout
+from level_of_detail import CLUSTER_TYPE, aggregate_graph
+from profiling import Profiler, profiled
+from pagerank_solvers import (
+    Acceleration,
+    IncrementalUpdate,
+    PageRankModel,
+    PageRankResult,
+    SolverMethod,
+    StoppingRule,
+    residual_push,
+    solve_pagerank,
+    solve_pagerank_batch,
+    unnormalized_scores,
+)
+from result_cache import ResultCache, graph_fingerprint, make_key
+from streaming_loader import open_json_file, stream_graph
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import networkx as nx
 
 
 class LayoutAlgorithm(Enum):
@@ -19,6 +48,7 @@ class LayoutAlgorithm(Enum):
     HIERARCHICAL = "hierarchical"
     SPRING = "spring"
     RANDOM = "random"
+    BARNES_HUT = "barnes_hut"
 
 
 class NodeSizeStrategy(Enum):
@@ -41,6 +71,68 @@ class EdgeWidthStrategy(Enum):
     WEIGHT = "weight"
 
 
+class StyleArrays:
+    """按节点与边下标排列的样式数组，由 PageRankRenderer._style_arrays 计算并缓存"""
+    
+    def __init__(self, node_sizes: np.ndarray, node_colors: np.ndarray, cmap: Optional[str],
+                 edge_widths: np.ndarray, node_types: List[str]):
+        """
+        Args:
+            node_sizes: 节点面积（点²）
+            node_colors: n×4 的RGBA颜色；cmap不为None时为映射到颜色的数值
+            cmap: 颜色映射名称
+            edge_widths: 边宽度
+            node_types: 图中出现的节点类型，按 type_color_map 的顺序排列
+        """
+        self.node_sizes = node_sizes
+        self.node_colors = node_colors
+        self.cmap = cmap
+        self.edge_widths = edge_widths
+        self.node_types = node_types
+
+
+# 结果确定、可以缓存的布局算法（未固定种子的随机布局不缓存）
+CACHEABLE_LAYOUTS = {LayoutAlgorithm.FORCE_DIRECTED, LayoutAlgorithm.HIERARCHICAL, LayoutAlgorithm.BARNES_HUT}
+# 由networkx实现的布局算法，使用时才导入networkx
+NETWORKX_LAYOUTS = {LayoutAlgorithm.FORCE_DIRECTED, LayoutAlgorithm.CIRCULAR,
+                    LayoutAlgorithm.SPRING, LayoutAlgorithm.RANDOM}
+# 可以从给定的初始位置热启动的布局算法
+WARM_START_LAYOUTS = {LayoutAlgorithm.FORCE_DIRECTED, LayoutAlgorithm.SPRING, LayoutAlgorithm.BARNES_HUT}
+# 热启动时Barnes-Hut布局的初始温度（相对布局范围），只做局部调整
+_WARM_TEMPERATURE = 0.02
+# 决定样式数组的配置项，变化时重新计算
+_STYLE_CONFIG = ('node_size', 'node_color', 'edge_width', 'node_min_size', 'node_max_size',
+                 'edge_min_width', 'edge_max_width')
+# 标签预算的倍数，有预算时只为PageRank最高的这么多个候选估计标签范围
+_LABEL_CANDIDATES = 20
+# 非居中标签与节点边缘的间隙（点）
+_LABEL_GAP = 2.0
+
+
+def _is_headless() -> bool:
+    """未指定MPLBACKEND且（Linux等平台上）没有图形显示环境时视为无界面环境"""
+    if os.environ.get('MPLBACKEND'):
+        return False
+    if sys.platform in ('win32', 'darwin'):
+        return False
+    return not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def _pyplot():
+    """
+    导入matplotlib.pyplot，首次导入时若处于无界面环境则强制使用Agg后端，
+    避免在服务进程中初始化GUI后端
+
+    Returns:
+        pyplot模块
+    """
+    if 'matplotlib.pyplot' not in sys.modules and _is_headless():
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
 class PageRankRenderer:
     """PageRank图形渲染器主类"""
     
@@ -65,6 +157,27 @@ class PageRankRenderer:
             'damping_factor': 0.85,
             'max_iterations': 100,
             'tolerance': 1e-6,
+            'pagerank_solver': SolverMethod.POWER,
+            'pagerank_acceleration': Acceleration.NONE,
+            'pagerank_stopping': StoppingRule.DIFFERENCE,
+            'pagerank_threads': 1,
+            'layout_seed': 42,
+            'layout_iterations': 50,
+            'warm_layout_iterations': 15,
+            'layered_sweeps': 4,
+            'layered_ordering': 'barycenter',
+            'fast_draw_threshold': 2000,
+            'lod_budget': None,
+            'lod_group_by': 'module',
+            'fast_label_limit': 100,
+            'label_collision': False,
+            'label_budget': None,
+            'label_anchors': True,
+            'cache_dir': None,
+            'cache_max_bytes': 256 * 1024 * 1024,
+            'profile': False,
+            'profile_memory': False,
+            'profile_output': None,
             'node_min_size': 300,
             'node_max_size': 1500,
             'edge_min_width': 1.0,
@@ -79,10 +192,24 @@ class PageRankRenderer:
             self.config.update(config)
         
         # 初始化变量
-        self.graph = nx.DiGraph()
+        self.store: GraphStore = GraphStoreBuilder().build()
         self.json_data = None
+        self.metadata: Optional[Dict[str, Any]] = None
         self.node_positions = None
-        self.pagerank_values = None
+        self.pagerank_values: Optional[PageRankResult] = None
+        self._pagerank_model: Optional[PageRankModel] = None
+        self._fingerprint: Optional[Tuple[str, np.ndarray]] = None
+        self._styles: Optional[Tuple[Any, ...]] = None
+        
+        # 结果缓存，未配置cache_dir时不启用
+        self.cache: Optional[ResultCache] = None
+        if self.config['cache_dir']:
+            self.cache = ResultCache(self.config['cache_dir'], self.config['cache_max_bytes'])
+        
+        # 阶段剖析器，未配置profile时为None，各阶段只多一次属性判断
+        self.profiler: Optional[Profiler] = None
+        if self.config['profile']:
+            self.profiler = Profiler(memory=self.config['profile_memory'], output=self.config['profile_output'])
         
         # 节点类型颜色映射
         self.type_color_map = {
@@ -91,22 +218,115 @@ class PageRankRenderer:
             'variable': '#2ecc71',
             'statement': '#f39c12',
             'module': '#9b59b6',
-            'import': '#1abc9c'
+            'import': '#1abc9c',
+            CLUSTER_TYPE: '#95a5a6'
         }
     
-    def load_json(self, file_path: str) -> None:
+    @property
+    def graph(self) -> nx.DiGraph:
+        """
+        图的NetworkX视图，首次访问时由数组存储惰性构建
+        
+        视图是冻结的，就地增删节点或边会抛出NetworkXError；需要修改时复制后
+        重新赋值，如 graph = nx.DiGraph(renderer.graph); ...; renderer.graph = graph
+        
+        Returns:
+            冻结的NetworkX有向图
+        """
+        return self.store.to_networkx()
+    
+    @graph.setter
+    def graph(self, graph: nx.DiGraph) -> None:
         """
-        加载JSON数据
+        从NetworkX图替换当前图
+        
+        Args:
+            graph: NetworkX有向图
+        """
+        self.store = GraphStore.from_networkx(graph)
+        self._reset_derived()
+    
+    def _reset_derived(self) -> None:
+        """清空由图派生的计算结果"""
+        self._pagerank_model = None
+        self._fingerprint = None
+        self._styles = None
+        self.pagerank_values = None
+        self.node_positions = None
+    
+    def _cache_key(self, kind: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        生成当前图在给定配置下的缓存键
+        
+        Args:
+            kind: 结果类型
+            params: 影响结果的配置项
+            
+        Returns:
+            缓存键，未启用缓存时返回None
+        """
+        if self.cache is None:
+            return None
+        
+        # 图结构哈希只在图变化后计算一次
+        if self._fingerprint is None:
+            self._fingerprint = graph_fingerprint(
+                self.store.node_ids, self.store.src, self.store.dst, self.store.weight
+            )
+        return make_key(kind, self._fingerprint[0], params)
+    
+    def _to_canonical(self, values: np.ndarray) -> np.ndarray:
+        """按节点下标排列的数组转换为缓存使用的规范顺序"""
+        return values[self._fingerprint[1]]
+    
+    def _from_canonical(self, values: np.ndarray) -> np.ndarray:
+        """缓存中规范顺序的数组转换为按节点下标排列"""
+        result = np.empty_like(values)
+        result[self._fingerprint[1]] = values
+        return result
+    
+    def _stage(self, name: str, **attributes: Any):
+        """
+        启用剖析时把代码块记录为一个阶段，未启用时返回空上下文
+        
+        Args:
+            name: 阶段名称
+            attributes: 附加属性
+            
+        Returns:
+            上下文管理器
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.span(name, **attributes)
+    
+    @profiled()
+    def load_json(self, file_path: str, streaming: bool = True) -> None:
+        """
+        加载JSON数据，支持gzip压缩文件
+        
+        默认以流式方式逐个解析节点和边并直接构建图，边解析边校验，
+        不保留完整文档（json_data为None，metadata单独保存）。
         
         Args:
             file_path: JSON文件路径
+            streaming: 是否流式加载，为False时整体解析并保留json_data
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open_json_file(file_path) as f:
+                if streaming:
+                    builder = GraphStoreBuilder()
+                    self.metadata = stream_graph(f, builder)
+                    self.json_data = None
+                    self.store = builder.build()
+                    self._reset_derived()
+                    return
+                
                 self.json_data = json.load(f)
             
             # 验证数据格式
             self._validate_json_data()
+            self.metadata = self.json_data['metadata']
             
             # 构建图
             self._build_graph()
@@ -118,6 +338,7 @@ class PageRankRenderer:
         except Exception as e:
             raise RuntimeError(f"加载JSON数据时出错: {str(e)}")
     
+    @profiled()
     def load_json_from_dict(self, data: Dict[str, Any]) -> None:
         """
         从字典加载JSON数据
@@ -129,10 +350,41 @@ class PageRankRenderer:
         
         # 验证数据格式
         self._validate_json_data()
+        self.metadata = self.json_data['metadata']
         
         # 构建图
         self._build_graph()
     
+    @profiled()
+    def load_binary(self, file_path: str) -> None:
+        """
+        加载由 graph_binary 转换的二进制图文件
+        
+        文件以只读方式内存映射，图存储的数组直接指向映射的页面而不复制，
+        重新加载几乎不耗时，多个进程加载同一文件时共享页缓存；
+        PageRank直接在映射的CSR数组上计算。文件中保存了图结构哈希时，
+        启用缓存的渲染器不再重新计算哈希。
+        
+        Args:
+            file_path: 二进制图文件路径
+        """
+        graph = open_graph(file_path)
+        self.store = graph.store
+        self.metadata = graph.metadata
+        self.json_data = None
+        self._reset_derived()
+        self._fingerprint = graph.fingerprint
+    
+    def save_binary(self, file_path: str) -> None:
+        """
+        把当前图保存为可内存映射的二进制图文件
+        
+        Args:
+            file_path: 输出路径
+        """
+        write_graph(file_path, self.store, self.metadata)
+    
+    @profiled()
     def _validate_json_data(self) -> None:
         """验证JSON数据格式"""
         if not self.json_data:
@@ -147,144 +399,297 @@ class PageRankRenderer:
         if not isinstance(self.json_data['graph']['nodes'], list) or not isinstance(self.json_data['graph']['edges'], list):
             raise ValueError("nodes和edges必须是列表")
     
+    @profiled()
     def _build_graph(self) -> None:
-        """从JSON数据构建NetworkX图"""
-        # 清空现有图
-        self.graph = nx.DiGraph()
+        """从JSON数据构建数组图存储"""
+        builder = GraphStoreBuilder()
         
         # 添加节点
         for node_data in self.json_data['graph']['nodes']:
-            node_id = node_data['id']
-            node_type = node_data.get('type', 'unknown')
-            node_label = node_data.get('label', node_id)
-            node_properties = node_data.get('properties', {})
-            
-            self.graph.add_node(
-                node_id,
-                type=node_type,
-                label=node_label,
-                **node_properties
-            )
+            builder.add_node_record(node_data)
         
         # 添加边
         for edge_data in self.json_data['graph']['edges']:
-            source = edge_data['source']
-            target = edge_data['target']
-            edge_type = edge_data.get('type', 'unknown')
-            edge_weight = edge_data.get('weight', 1.0)
-            edge_properties = edge_data.get('properties', {})
+            builder.add_edge_record(edge_data)
+        
+        # 替换现有图并清空由其派生的计算结果
+        self.store = builder.build()
+        self._reset_derived()
+    
+    @profiled()
+    def calculate_pagerank(self, x0: Optional[np.ndarray] = None) -> None:
+        """
+        计算PageRank值
+        
+        Args:
+            x0: 迭代的初始向量（按节点下标排列，无需归一化），如上一版本图的PageRank值；
+                默认为均匀分布
+        """
+        if not self.store:
+            raise ValueError("图未初始化，请先加载JSON数据")
+        
+        key = self._cache_key('pagerank', {
+            name: self.config[name]
+            for name in ('damping_factor', 'tolerance', 'max_iterations', 'pagerank_solver',
+                         'pagerank_acceleration', 'pagerank_stopping')
+        })
+        cached = self.cache.get(key) if key else None
+        
+        if cached is not None:
+            solver = self.config['pagerank_solver']
+            try:
+                solver = SolverMethod(solver)
+            except ValueError:
+                pass
+            self.pagerank_values = PageRankResult(
+                self._from_canonical(cached['values']),
+                self.store.node_ids,
+                self.store.index,
+                iterations=int(cached['iterations'][0]),
+                converged=bool(cached['converged'][0]),
+                method=solver,
+                residuals=cached.get('residuals')
+            )
+        else:
+            # 整数索引的数组模型只在图变化后构建一次
+            if self._pagerank_model is None:
+                self._pagerank_model = PageRankModel.from_store(self.store)
             
-            self.graph.add_edge(
-                source,
-                target,
-                type=edge_type,
-                weight=edge_weight,
-                **edge_properties
+            # 计算PageRank
+            self.pagerank_values = solve_pagerank(
+                self._pagerank_model,
+                method=self.config['pagerank_solver'],
+                damping=self.config['damping_factor'],
+                tolerance=self.config['tolerance'],
+                max_iterations=self.config['max_iterations'],
+                acceleration=self.config['pagerank_acceleration'],
+                stopping=self.config['pagerank_stopping'],
+                threads=self.config['pagerank_threads'],
+                x0=x0
+            )
+            
+            if key:
+                entry = {
+                    'values': self._to_canonical(self.pagerank_values.array),
+                    'iterations': np.array([self.pagerank_values.iterations], dtype=np.int64),
+                    'converged': np.array([self.pagerank_values.converged], dtype=np.uint8)
+                }
+                if self.pagerank_values.residuals is not None:
+                    entry['residuals'] = self.pagerank_values.residuals
+                self.cache.put(key, entry)
+        
+        # 将PageRank值保存为节点属性列
+        self.store.set_node_column('pagerank', self.pagerank_values.array)
+        
+        if self.profiler is not None:
+            self.profiler.annotate(
+                nodes=self.store.num_nodes,
+                edges=self.store.num_edges,
+                solver=self.pagerank_values.method,
+                iterations=self.pagerank_values.iterations,
+                converged=self.pagerank_values.converged,
+                cached=cached is not None,
+                warm_start=x0 is not None
             )
     
-    def calculate_pagerank(self) -> None:
-        """计算PageRank值"""
-        if not self.graph:
+    @profiled()
+    def calculate_pagerank_batch(self, damping_factors: Optional[List[float]] = None,
+                                 personalizations: Optional[List[Any]] = None) -> List[PageRankResult]:
+        """
+        批量计算多组阻尼系数和/或个性化向量下的PageRank
+        
+        所有参数组共享同一次稀疏矩阵乘法，结果不会写入 pagerank_values。
+        
+        Args:
+            damping_factors: 阻尼系数列表，默认使用配置中的阻尼系数
+            personalizations: 个性化向量列表（数组或节点ID到权重的字典）
+            
+        Returns:
+            每组参数对应的PageRank值列表
+        """
+        if not self.store:
             raise ValueError("图未初始化，请先加载JSON数据")
         
-        # 计算PageRank
-        self.pagerank_values = nx.pagerank(
-            self.graph,
-            alpha=self.config['damping_factor'],
-            max_iter=self.config['max_iterations'],
-            tol=self.config['tolerance']
+        if self._pagerank_model is None:
+            self._pagerank_model = PageRankModel.from_store(self.store)
+        
+        return solve_pagerank_batch(
+            self._pagerank_model,
+            damping=damping_factors if damping_factors is not None else self.config['damping_factor'],
+            tolerance=self.config['tolerance'],
+            max_iterations=self.config['max_iterations'],
+            personalization=personalizations
         )
+    
+    @profiled()
+    def apply_delta(self, delta: Dict[str, Any],
+                    update: IncrementalUpdate = IncrementalUpdate.WARM_START) -> PageRankResult:
+        """
+        应用图增量并增量更新PageRank
         
-        # 将PageRank值添加到节点属性
-        nx.set_node_attributes(self.graph, self.pagerank_values, 'pagerank')
+        增量格式：add_nodes/add_edges 为JSON格式的节点/边记录列表，
+        remove_nodes 为节点ID列表，remove_edges 为含source与target的记录列表。
+        WARM_START 以上一次的PageRank值为初始向量重新迭代；
+        PUSH 只从受影响的节点出发做局部残差推送，影响范围扩大到图的较大部分时
+        回退为热启动的幂迭代。
+        
+        Args:
+            delta: 图增量
+            update: 增量更新方式
+            
+        Returns:
+            更新后的PageRank值
+        """
+        update = IncrementalUpdate(update)
+        if not self.pagerank_values:
+            self.calculate_pagerank()
+        
+        old_store = self.store
+        old_model = self._pagerank_model
+        old_values = self.pagerank_values.array
+        damping = self.config['damping_factor']
+        
+        # 替换图结构，原JSON文档已不再对应当前的图
+        new_store, remap = old_store.apply_delta(delta)
+        self.store = new_store
+        self.json_data = None
+        self._reset_derived()
+        self._pagerank_model = PageRankModel.from_store(new_store)
+        
+        kept = remap >= 0
+        if update == IncrementalUpdate.WARM_START:
+            x0 = np.full(new_store.num_nodes, 1.0 / max(new_store.num_nodes, 1))
+            x0[remap[kept]] = old_values[kept]
+            self.pagerank_values = solve_pagerank(
+                self._pagerank_model,
+                method=self.config['pagerank_solver'],
+                damping=damping,
+                tolerance=self.config['tolerance'],
+                max_iterations=self.config['max_iterations'],
+                x0=x0,
+                acceleration=self.config['pagerank_acceleration'],
+                stopping=self.config['pagerank_stopping'],
+                threads=self.config['pagerank_threads']
+            )
+        else:
+            y0 = np.zeros(new_store.num_nodes)
+            y_old = unnormalized_scores(old_values, old_model.dangling, damping)
+            y0[remap[kept]] = y_old[kept]
+            self.pagerank_values = residual_push(
+                self._pagerank_model,
+                damping,
+                self.config['tolerance'],
+                y0,
+                old_store.affected_nodes(new_store, remap, delta),
+                max_iterations=self.config['max_iterations']
+            )
+        
+        self.store.set_node_column('pagerank', self.pagerank_values.array)
+        
+        if self.profiler is not None:
+            self.profiler.annotate(update=update, iterations=self.pagerank_values.iterations,
+                                   converged=self.pagerank_values.converged)
+        return self.pagerank_values
     
-    def apply_layout(self) -> None:
-        """应用布局算法"""
-        if not self.graph:
+    @profiled()
+    def apply_layout(self, initial_positions: Optional[np.ndarray] = None) -> None:
+        """
+        应用布局算法
+        
+        Args:
+            initial_positions: n×2 的初始位置（按节点下标排列），从相近的布局热启动；
+                只有力导向类布局（force_directed、spring、barnes_hut）使用，此时迭代次数
+                取 warm_layout_iterations，且结果不读写缓存
+        """
+        if not self.store:
             raise ValueError("图未初始化，请先加载JSON数据")
         
         layout = self.config['layout']
+        warm = initial_positions is not None and layout in WARM_START_LAYOUTS
+        iterations = self.config['warm_layout_iterations' if warm else 'layout_iterations']
+        initial = None
+        if warm:
+            initial_positions = np.asarray(initial_positions, dtype=np.float64).reshape(-1, 2)
+            if len(initial_positions) != self.store.num_nodes:
+                raise ValueError("初始位置的数量必须等于节点数量")
+            initial = dict(zip(self.store.node_ids, initial_positions))
+        
+        key = None
+        if layout in CACHEABLE_LAYOUTS and not warm:
+            key = self._cache_key('layout', {
+                name: self.config[name]
+                for name in ('layout', 'layout_seed', 'layout_iterations', 'layered_sweeps', 'layered_ordering')
+            })
+        cached = self.cache.get(key) if key else None
+        if self.profiler is not None:
+            self.profiler.annotate(layout=layout, cached=cached is not None, warm_start=warm)
+        if cached is not None:
+            positions = self._from_canonical(cached['positions'])
+            self.node_positions = dict(zip(self.store.node_ids, positions))
+            return
+        
+        if layout in NETWORKX_LAYOUTS:
+            import networkx as nx
         
         if layout == LayoutAlgorithm.FORCE_DIRECTED:
             self.node_positions = nx.spring_layout(
                 self.graph,
                 k=1.0,
-                iterations=50,
-                seed=42
+                pos=initial,
+                iterations=iterations,
+                seed=self.config['layout_seed']
             )
         elif layout == LayoutAlgorithm.CIRCULAR:
             self.node_positions = nx.circular_layout(self.graph)
         elif layout == LayoutAlgorithm.HIERARCHICAL:
             self.node_positions = self._hierarchical_layout()
         elif layout == LayoutAlgorithm.SPRING:
-            self.node_positions = nx.spring_layout(self.graph)
+            if warm:
+                self.node_positions = nx.spring_layout(self.graph, pos=initial, iterations=iterations)
+            else:
+                self.node_positions = nx.spring_layout(self.graph)
         elif layout == LayoutAlgorithm.RANDOM:
             self.node_positions = nx.random_layout(self.graph)
+        elif layout == LayoutAlgorithm.BARNES_HUT:
+            positions = force_directed_layout(
+                self.store.num_nodes,
+                self.store.src,
+                self.store.dst,
+                self.store.weight,
+                iterations=iterations,
+                seed=self.config['layout_seed'],
+                initial_positions=initial_positions if warm else None,
+                temperature=_WARM_TEMPERATURE * np.ptp(initial_positions, axis=0).max() if warm else None
+            )
+            self.node_positions = dict(zip(self.store.node_ids, positions))
         else:
             raise ValueError(f"不支持的布局算法: {layout}")
+        
+        if key:
+            positions = np.array([self.node_positions[node] for node in self.store.node_ids],
+                                 dtype=np.float32).reshape(-1, 2)
+            self.cache.put(key, {'positions': self._to_canonical(positions)})
     
     def _hierarchical_layout(self) -> Dict[str, Tuple[float, float]]:
-        """层次布局算法"""
-        # 简单的层次布局实现
-        # 在实际应用中，可以使用更复杂的层次布局算法
-        
-        # 计算每个节点的层级
-        levels = {}
-        visited = set()
-        
-        # 找到所有根节点（没有入边的节点）
-        root_nodes = [n for n in self.graph.nodes() if self.graph.in_degree(n) == 0]
-        
-        # 如果没有根节点，选择所有入度为0的节点
-        if not root_nodes:
-            root_nodes = list(self.graph.nodes())[:1]  # 选择第一个节点作为根
-        
-        # BFS遍历计算层级
-        from collections import deque
-        queue = deque([(node, 0) for node in root_nodes])
-        
-        while queue:
-            node, level = queue.popleft()
-            
-            if node in visited:
-                continue
-                
-            visited.add(node)
-            levels[node] = level
-            
-            # 将所有未访问的邻居加入队列
-            for neighbor in self.graph.successors(node):
-                if neighbor not in visited:
-                    queue.append((neighbor, level + 1))
-        
-        # 为未访问的节点分配层级
-        for node in self.graph.nodes():
-            if node not in levels:
-                levels[node] = max(levels.values()) + 1
-        
-        # 按层级分组节点
-        level_groups = {}
-        for node, level in levels.items():
-            if level not in level_groups:
-                level_groups[level] = []
-            level_groups[level].append(node)
-        
-        # 计算位置
-        positions = {}
-        max_level = max(levels.values())
-        
-        for level, nodes in level_groups.items():
-            # 在同一层级中均匀分布节点
-            num_nodes = len(nodes)
-            if num_nodes == 1:
-                x = 0.5
-            else:
-                x_positions = np.linspace(0.1, 0.9, num_nodes)
-                for i, node in enumerate(nodes):
-                    positions[node] = (x_positions[i], 1.0 - level / (max_level + 1))
-        
-        return positions
+        """
+        层次布局算法
+
+        使用Sugiyama风格的分层布局：回边被反转以破环，按最长路径分层，
+        长边经虚拟节点拆分后进行交叉减少与坐标压缩，整体为近线性复杂度。
+
+        Returns:
+            节点ID到 (x, y) 位置的映射，层级自上而下排列
+        """
+        positions, _ = layered_layout(
+            self.store.num_nodes,
+            self.store.src,
+            self.store.dst,
+            sweeps=self.config['layered_sweeps'],
+            method=self.config['layered_ordering']
+        )
+        return {node: (x, y) for node, (x, y) in zip(self.store.node_ids, positions.tolist())}
     
+    @profiled()
     def render(self, show: bool = False) -> plt.Figure:
         """
         渲染图形
@@ -295,7 +700,7 @@ class PageRankRenderer:
         Returns:
             matplotlib图形对象
         """
-        if not self.graph:
+        if not self.store:
             raise ValueError("图未初始化，请先加载JSON数据")
         
         if not self.pagerank_values:
@@ -304,60 +709,242 @@ class PageRankRenderer:
         if not self.node_positions:
             self.apply_layout()
         
+        # 超出元素预算时改为绘制聚合后的视图
+        detail = self.level_of_detail()
+        if detail is not None:
+            return detail.render(show)
+        
         # 创建图形
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=self.config['figsize'])
         ax.set_title(self.config['title'], fontsize=16)
         
-        # 绘制边
-        self._draw_edges(ax)
-        
-        # 绘制节点
-        self._draw_nodes(ax)
-        
-        # 绘制标签
-        if self.config['show_labels']:
-            self._draw_labels(ax)
+        if self._use_fast_draw():
+            # 边与节点各合并为一个集合绘制
+            self._draw_fast(ax)
+        else:
+            # 绘制边
+            self._draw_edges(ax)
+            
+            # 绘制节点
+            self._draw_nodes(ax)
+            
+            # 绘制标签
+            if self.config['show_labels']:
+                self._draw_labels(ax)
         
         # 添加图例
         self._add_legend(ax)
         
         # 调整布局
-        plt.tight_layout()
+        with self._stage('tight_layout'):
+            plt.tight_layout()
         
         if show:
             plt.show()
         
         return fig
     
+    @profiled()
+    def level_of_detail(self) -> Optional['PageRankRenderer']:
+        """
+        生成细节层次视图：保留PageRank最高的节点，其余节点按 lod_group_by
+        属性（缺失时按社区）聚合为簇，平行边合并并累加权重
+        
+        Returns:
+            持有聚合图、PageRank值与位置的渲染器，可直接render；
+            节点数与边数之和不超过 lod_budget（或其为None）时返回None
+        """
+        budget = self.config['lod_budget']
+        if budget is None:
+            return None
+        
+        positions = np.array([self.node_positions[node] for node in self.store.node_ids],
+                             dtype=np.float64).reshape(-1, 2)
+        result = aggregate_graph(self.store, self.pagerank_values.array, positions, budget,
+                                 group_by=self.config['lod_group_by'], seed=self.config['layout_seed'])
+        if result is None:
+            return None
+        
+        store, pagerank, positions = result
+        view = PageRankRenderer({**self.config, 'lod_budget': None, 'cache_dir': None, 'profile': False})
+        view.profiler = self.profiler
+        view.type_color_map = dict(self.type_color_map)
+        view.metadata = self.metadata
+        view.store = store
+        view.pagerank_values = PageRankResult(pagerank, store.node_ids, store.index)
+        view.store.set_node_column('pagerank', pagerank)
+        view.node_positions = dict(zip(store.node_ids, positions))
+        return view
+    
+    def _use_fast_draw(self) -> bool:
+        """边数超过 fast_draw_threshold 时使用快速绘制模式，阈值为None时不启用"""
+        threshold = self.config['fast_draw_threshold']
+        return threshold is not None and self.store.num_edges > threshold
+    
+    @staticmethod
+    def _scale(values: np.ndarray, low: float, high: float) -> np.ndarray:
+        """把数值线性映射到 [low, high]，数值全部相同时取low"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0 or values.max() <= values.min():
+            return np.full(len(values), low)
+        return low + (values - values.min()) / (values.max() - values.min()) * (high - low)
+    
+    def _style_arrays(self) -> StyleArrays:
+        """
+        按配置的策略以数组运算计算节点与边的样式
+        
+        结果在图、PageRank值、样式配置与 type_color_map 不变时复用，
+        标题或输出格式不同的重复渲染不会重新计算。
+        
+        Returns:
+            样式数组
+        """
+        params = tuple(self.config[name] for name in _STYLE_CONFIG) + tuple(self.type_color_map.items())
+        cached = self._styles
+        if cached is not None and cached[0] is self.store and cached[1] is self.pagerank_values \
+                and cached[2] == params:
+            return cached[3]
+        
+        from matplotlib.colors import to_rgba, to_rgba_array
+        
+        store = self.store
+        min_size, max_size = self.config['node_min_size'], self.config['node_max_size']
+        
+        node_size_strategy = self.config['node_size']
+        if node_size_strategy == NodeSizeStrategy.PAGERANK:
+            node_sizes = self._scale(self.pagerank_values.array, min_size, max_size)
+        elif node_size_strategy == NodeSizeStrategy.DEGREE:
+            node_sizes = self._scale(store.degree(), min_size, max_size)
+        else:
+            node_sizes = np.full(store.num_nodes, float(min_size))
+        
+        # 节点类型只扫描一次编码列，图例与颜色共用
+        codes = np.unique(store.node_type)
+        present = {store.node_type_names[code] for code in codes.tolist() if code >= 0}
+        node_types = [name for name in self.type_color_map if name in present]
+        
+        cmap = None
+        node_color_strategy = self.config['node_color']
+        if node_color_strategy == NodeColorStrategy.TYPE:
+            # 按类型编码查调色板，无类型的节点（编码-1）取表中最后一项
+            palette = to_rgba_array([self.type_color_map.get(name, 'gray') for name in store.node_type_names]
+                                    + ['gray'])
+            node_colors = palette[store.node_type]
+        elif node_color_strategy == NodeColorStrategy.PAGERANK:
+            node_colors = self.pagerank_values.array
+            cmap = 'viridis'
+        else:
+            node_colors = np.tile(to_rgba('skyblue'), (store.num_nodes, 1))
+        
+        if self.config['edge_width'] == EdgeWidthStrategy.WEIGHT:
+            edge_widths = self._scale(store.weight, self.config['edge_min_width'], self.config['edge_max_width'])
+        else:
+            edge_widths = np.full(store.num_edges, 1.5)
+        
+        styles = StyleArrays(node_sizes, node_colors, cmap, edge_widths, node_types)
+        self._styles = (self.store, self.pagerank_values, params, styles)
+        return styles
+    
+    @profiled()
+    def _draw_fast(self, ax: plt.Axes) -> None:
+        """
+        快速绘制模式：节点与边的样式按数组一次性计算，
+        全部边合并为一个LineCollection，全部节点合并为一个PathCollection
+        """
+        import fast_draw
+        
+        store = self.store
+        positions = np.array([self.node_positions[node] for node in store.node_ids],
+                             dtype=np.float64).reshape(-1, 2)
+        styles = self._style_arrays()
+        
+        # 曲线几何在绘制时按像素坐标计算（颜色条与tight_layout之后），只需先确定坐标轴范围
+        fast_draw.fit_axes(ax, positions)
+        fast_draw.draw_edges(ax, positions, store.src, store.dst, widths=styles.edge_widths,
+                             node_sizes=styles.node_sizes, color='gray', alpha=0.6)
+        fast_draw.draw_nodes(ax, positions, styles.node_sizes, styles.node_colors, cmap=styles.cmap, alpha=0.8)
+        
+        if self.config['show_labels']:
+            self._draw_labels_fast(ax, positions)
+    
+    def _draw_labels_fast(self, ax: plt.Axes, positions: np.ndarray) -> None:
+        """快速绘制模式下只为PageRank最高的 fast_label_limit 个节点绘制标签"""
+        limit = min(self.config['fast_label_limit'], self.store.num_nodes)
+        if limit <= 0:
+            return
+        
+        if self.config['label_collision']:
+            self._draw_placed_labels(ax, positions, limit)
+            return
+        
+        top = np.argsort(-self.pagerank_values.array, kind='stable')[:limit]
+        for i in top.tolist():
+            label = self.store.labels[i]
+            ax.text(positions[i, 0], positions[i, 1], str(self.store.node_ids[i] if label is None else label),
+                    fontsize=self.config['label_size'], family='sans-serif',
+                    ha='center', va='center', zorder=3)
+    
+    @profiled()
+    def _draw_placed_labels(self, ax: plt.Axes, positions: np.ndarray, budget: Optional[int]) -> None:
+        """
+        按PageRank降序放置互不重叠的标签：标签范围按字号估计并插入网格索引，
+        冲突时（label_anchors开启时）依次尝试节点右侧、左侧、上方与下方，仍冲突则不绘制
+        
+        Args:
+            ax: 坐标轴，范围须已确定
+            positions: n×2 的节点位置（数据坐标）
+            budget: 最多绘制的标签数，None为不限
+        """
+        from matplotlib.transforms import offset_copy
+        from label_placement import ANCHORS, estimate_extents, place_labels
+        
+        store = self.store
+        pixels_per_point = ax.figure.dpi / 72.0
+        pixels = ax.transData.transform(positions)
+        x0, y0, x1, y1 = ax.bbox.extents
+        visible = (pixels[:, 0] >= x0) & (pixels[:, 0] <= x1) & (pixels[:, 1] >= y0) & (pixels[:, 1] <= y1)
+        
+        # 候选按PageRank降序；有预算时只估计前 _LABEL_CANDIDATES 倍预算个候选的范围
+        order = np.argsort(-self.pagerank_values.array, kind='stable')
+        order = order[visible[order]]
+        if budget is not None:
+            order = order[:budget * _LABEL_CANDIDATES]
+        texts = [str(store.node_ids[i] if store.labels[i] is None else store.labels[i]) for i in order.tolist()]
+        font_size = self.config['label_size']
+        widths, heights = estimate_extents(texts, font_size * pixels_per_point)
+        
+        # 非居中锚点的标签放在节点边缘外侧（节点面积以点²计）
+        offsets = np.sqrt(self._style_arrays().node_sizes[order]) / 2 + _LABEL_GAP
+        placed, anchors = place_labels(pixels[order], widths, heights, offsets * pixels_per_point,
+                                       budget=budget, anchors=self.config['label_anchors'],
+                                       bounds=(x0, y0, x1, y1))
+        if self.profiler is not None:
+            self.profiler.annotate(candidates=len(order), labels=len(placed))
+        
+        for k, anchor in zip(placed.tolist(), anchors.tolist()):
+            i = int(order[k])
+            ha, va, sx, sy = ANCHORS[anchor]
+            transform = ax.transData
+            if sx or sy:
+                transform = offset_copy(ax.transData, fig=ax.figure, x=sx * offsets[k], y=sy * offsets[k],
+                                        units='points')
+            ax.text(positions[i, 0], positions[i, 1], texts[k], fontsize=font_size, family='sans-serif',
+                    ha=ha, va=va, transform=transform, zorder=3)
+    
+    @profiled()
     def _draw_edges(self, ax: plt.Axes) -> None:
         """绘制边"""
-        edge_width_strategy = self.config['edge_width']
-        
-        # 计算边宽度
-        if edge_width_strategy == EdgeWidthStrategy.FIXED:
-            edge_widths = 1.5
-        elif edge_width_strategy == EdgeWidthStrategy.WEIGHT:
-            edge_weights = [self.graph[u][v].get('weight', 1.0) for u, v in self.graph.edges()]
-            min_weight = min(edge_weights) if edge_weights else 1.0
-            max_weight = max(edge_weights) if edge_weights else 1.0
-            
-            if max_weight > min_weight:
-                edge_widths = [
-                    self.config['edge_min_width'] + 
-                    (w - min_weight) / (max_weight - min_weight) * 
-                    (self.config['edge_max_width'] - self.config['edge_min_width'])
-                    for w in edge_weights
-                ]
-            else:
-                edge_widths = [self.config['edge_min_width']] * len(edge_weights)
-        else:
-            edge_widths = 1.5
+        import networkx as nx
         
-        # 绘制边
+        # 宽度按存储中的边顺序排列，显式传入同样顺序的边列表
+        ids = self.store.node_ids
+        edgelist = [(ids[s], ids[d]) for s, d in zip(self.store.src.tolist(), self.store.dst.tolist())]
         nx.draw_networkx_edges(
             self.graph,
             pos=self.node_positions,
-            width=edge_widths,
+            edgelist=edgelist,
+            width=self._style_arrays().edge_widths,
             edge_color='gray',
             alpha=0.6,
             ax=ax,
@@ -367,81 +954,33 @@ class PageRankRenderer:
             connectionstyle='arc3,rad=0.1'
         )
     
+    @profiled()
     def _draw_nodes(self, ax: plt.Axes) -> None:
         """绘制节点"""
-        node_size_strategy = self.config['node_size']
-        node_color_strategy = self.config['node_color']
+        import networkx as nx
         
-        # 计算节点大小
-        if node_size_strategy == NodeSizeStrategy.FIXED:
-            node_sizes = [self.config['node_min_size']] * len(self.graph.nodes())
-        elif node_size_strategy == NodeSizeStrategy.PAGERANK:
-            pagerank_values = [self.pagerank_values[node] for node in self.graph.nodes()]
-            min_pr = min(pagerank_values) if pagerank_values else 0.0
-            max_pr = max(pagerank_values) if pagerank_values else 1.0
-            
-            if max_pr > min_pr:
-                node_sizes = [
-                    self.config['node_min_size'] + 
-                    (pr - min_pr) / (max_pr - min_pr) * 
-                    (self.config['node_max_size'] - self.config['node_min_size'])
-                    for pr in pagerank_values
-                ]
-            else:
-                node_sizes = [self.config['node_min_size']] * len(pagerank_values)
-        elif node_size_strategy == NodeSizeStrategy.DEGREE:
-            degrees = [self.graph.degree(node) for node in self.graph.nodes()]
-            min_degree = min(degrees) if degrees else 0
-            max_degree = max(degrees) if degrees else 1
-            
-            if max_degree > min_degree:
-                node_sizes = [
-                    self.config['node_min_size'] + 
-                    (deg - min_degree) / (max_degree - min_degree) * 
-                    (self.config['node_max_size'] - self.config['node_min_size'])
-                    for deg in degrees
-                ]
-            else:
-                node_sizes = [self.config['node_min_size']] * len(degrees)
-        else:
-            node_sizes = [self.config['node_min_size']] * len(self.graph.nodes())
-        
-        # 计算节点颜色
-        if node_color_strategy == NodeColorStrategy.FIXED:
-            node_colors = ['skyblue'] * len(self.graph.nodes())
-        elif node_color_strategy == NodeColorStrategy.TYPE:
-            node_colors = [self.type_color_map.get(self.graph.nodes[node].get('type', 'unknown'), 'gray') 
-                          for node in self.graph.nodes()]
-        elif node_color_strategy == NodeColorStrategy.PAGERANK:
-            pagerank_values = [self.pagerank_values[node] for node in self.graph.nodes()]
-            node_colors = pagerank_values
-            cmap = plt.cm.viridis
-        else:
-            node_colors = ['skyblue'] * len(self.graph.nodes())
-        
-        # 绘制节点
-        if node_color_strategy == NodeColorStrategy.PAGERANK:
-            nx.draw_networkx_nodes(
-                self.graph,
-                pos=self.node_positions,
-                node_size=node_sizes,
-                node_color=node_colors,
-                cmap=plt.cm.viridis,
-                alpha=0.8,
-                ax=ax
-            )
-        else:
-            nx.draw_networkx_nodes(
-                self.graph,
-                pos=self.node_positions,
-                node_size=node_sizes,
-                node_color=node_colors,
-                alpha=0.8,
-                ax=ax
-            )
+        styles = self._style_arrays()
+        nx.draw_networkx_nodes(
+            self.graph,
+            pos=self.node_positions,
+            node_size=styles.node_sizes,
+            node_color=styles.node_colors,
+            cmap=styles.cmap,
+            alpha=0.8,
+            ax=ax
+        )
     
+    @profiled()
     def _draw_labels(self, ax: plt.Axes) -> None:
-        """绘制标签"""
+        """绘制标签，label_collision开启时只绘制互不重叠的标签"""
+        if self.config['label_collision']:
+            positions = np.array([self.node_positions[node] for node in self.store.node_ids],
+                                 dtype=np.float64).reshape(-1, 2)
+            self._draw_placed_labels(ax, positions, self.config['label_budget'])
+            return
+        
+        import networkx as nx
+        
         labels = {node: self.graph.nodes[node].get('label', node) for node in self.graph.nodes()}
         
         nx.draw_networkx_labels(
@@ -453,29 +992,29 @@ class PageRankRenderer:
             ax=ax
         )
     
+    @profiled()
     def _add_legend(self, ax: plt.Axes) -> None:
         """添加图例"""
+        import matplotlib.patches as mpatches
+        
+        plt = _pyplot()
         if self.config['node_color'] == NodeColorStrategy.TYPE:
-            # 创建类型图例
-            legend_elements = []
-            for node_type, color in self.type_color_map.items():
-                # 检查图中是否有此类型的节点
-                has_type = any(self.graph.nodes[node].get('type') == node_type for node in self.graph.nodes())
-                if has_type:
-                    legend_elements.append(mpatches.Patch(color=color, label=node_type))
-            
+            # 创建类型图例，只列出图中出现的类型
+            legend_elements = [mpatches.Patch(color=self.type_color_map[node_type], label=node_type)
+                               for node_type in self._style_arrays().node_types]
             if legend_elements:
                 ax.legend(handles=legend_elements, loc='upper right')
         
         elif self.config['node_color'] == NodeColorStrategy.PAGERANK:
             # 添加PageRank颜色条
-            sm = plt.cm.ScalarMappable(cmap=plt.cm.viridis, 
-                                       norm=plt.Normalize(vmin=min(self.pagerank_values.values()), 
-                                                         vmax=max(self.pagerank_values.values())))
+            values = self.pagerank_values.array
+            sm = plt.cm.ScalarMappable(cmap=plt.cm.viridis,
+                                       norm=plt.Normalize(vmin=values.min(), vmax=values.max()))
             sm.set_array([])
             cbar = plt.colorbar(sm, ax=ax)
             cbar.set_label('PageRank Value')
     
+    @profiled()
     def export(self, output_path: str, dpi: int = 300) -> None:
         """
         导出图形
@@ -491,15 +1030,95 @@ class PageRankRenderer:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
         # 保存图形
-        fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
-        plt.close(fig)
+        with self._stage('savefig', dpi=dpi):
+            fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
+        _pyplot().close(fig)
     
+    def export_bytes(self, output_format: Optional[str] = None, dpi: int = 300) -> bytes:
+        """
+        渲染图形并以字节形式返回，不写入文件
+        
+        Args:
+            output_format: 图像格式（png、svg、pdf），默认取配置中的output_format
+            dpi: 图像分辨率
+            
+        Returns:
+            图像文件内容
+        """
+        fig = self.render()
+        buffer = io.BytesIO()
+        with self._stage('savefig', dpi=dpi):
+            fig.savefig(buffer, format=output_format or self.config['output_format'], dpi=dpi, bbox_inches='tight')
+        _pyplot().close(fig)
+        return buffer.getvalue()
+
+    @profiled()
+    def export_tiles(self, output_dir: str, max_zoom: Optional[int] = None, tile_size: int = 256,
+                     workers: Optional[int] = None, image_format: str = 'png',
+                     background: Optional[str] = 'white') -> Dict[str, Any]:
+        """
+        导出多分辨率瓦片金字塔（{z}/{x}/{y}.png 与 tiles.json 清单）
+
+        不经过细节层次聚合，每个瓦片只绘制与其相交的节点和边，瓦片在工作进程中并行绘制。
+        节点大小与线宽在最深一层与快速绘制模式一致（以像素计），较浅的层级等比缩小；不绘制标签。
+
+        Args:
+            output_dir: 输出目录
+            max_zoom: 最大层级，默认按节点数估计
+            tile_size: 瓦片边长（像素）
+            workers: 工作进程数，默认使用全部核心
+            image_format: 瓦片图像格式
+            background: 背景色，None为透明
+
+        Returns:
+            瓦片清单，包含层级范围、世界坐标范围与每层的瓦片数
+        """
+        from matplotlib import colormaps
+        from matplotlib.colors import Normalize
+        from tile_export import TileScene, default_max_zoom, export_tiles
+
+        if not self.store:
+            raise ValueError("图未初始化，请先加载JSON数据")
+        if not self.pagerank_values:
+            self.calculate_pagerank()
+        if not self.node_positions:
+            self.apply_layout()
+
+        store = self.store
+        positions = np.array([self.node_positions[node] for node in store.node_ids],
+                             dtype=np.float64).reshape(-1, 2)
+        styles = self._style_arrays()
+        colors = styles.node_colors
+        if styles.cmap is not None:
+            colors = colormaps[styles.cmap](Normalize(colors.min(initial=0.0), colors.max(initial=0.0))(colors))
+
+        with self._stage('tile_index'):
+            scene = TileScene(
+                positions, styles.node_sizes, colors, store.src, store.dst, styles.edge_widths,
+                max_zoom=default_max_zoom(store.num_nodes) if max_zoom is None else max_zoom,
+                tile_size=tile_size
+            )
+        manifest = export_tiles(scene, output_dir, workers=workers, image_format=image_format,
+                                background=background)
+        if self.profiler is not None:
+            self.profiler.annotate(max_zoom=scene.max_zoom, tiles=sum(manifest['tiles']))
+        return manifest
+
     def get_pagerank_values(self) -> Dict[str, float]:
         """
         获取PageRank值
         
         Returns:
-            节点ID到PageRank值的映射
+            节点ID到PageRank值的映射（新建的普通字典）
+        """
+        return self.get_pagerank_result().to_dict()
+    
+    def get_pagerank_result(self) -> PageRankResult:
+        """
+        获取PageRank计算结果，不复制数据
+        
+        Returns:
+            只读的节点ID映射，array属性为按节点下标排列的数组，另含迭代次数与收敛信息
         """
         if not self.pagerank_values:
             self.calculate_pagerank()
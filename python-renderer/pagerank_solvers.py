@@ -0,0 +1,862 @@
+"""
+PageRank求解器模块
+在整数索引的NumPy数组上求解PageRank，提供可插拔的求解算法
+"""
+
+import numpy as np
+from collections import deque
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from sparse_matrix import CSRMatrix, ParallelCSR, build_transition, resolve_threads
+
+
+class SolverMethod(Enum):
+    """PageRank求解算法枚举"""
+    POWER = "power"
+    GAUSS_SEIDEL = "gauss_seidel"
+    LINEAR = "linear"
+
+
+class Acceleration(Enum):
+    """幂迭代收敛加速方式枚举"""
+    NONE = "none"
+    AITKEN = "aitken"
+    QUADRATIC = "quadratic"
+    ANDERSON = "anderson"
+
+
+class StoppingRule(Enum):
+    """迭代停止规则枚举"""
+    DIFFERENCE = "difference"
+    RESIDUAL = "residual"
+
+
+class IncrementalUpdate(Enum):
+    """增量更新PageRank的方式枚举"""
+    WARM_START = "warm_start"
+    PUSH = "push"
+
+
+class PageRankModel:
+    """
+    整数索引的PageRank计算模型
+
+    节点ID在构建时一次性映射为连续整数，转移矩阵以CSR格式保存，
+    之后的每次求解都直接在数组上进行，无需重复转换图结构。
+    """
+
+    def __init__(self, node_ids: Sequence[Hashable], sources: np.ndarray, targets: np.ndarray,
+                 weights: Optional[np.ndarray] = None, index: Optional[Dict[Hashable, int]] = None):
+        """
+        初始化计算模型
+
+        Args:
+            node_ids: 节点ID列表，下标即节点的整数索引
+            sources: 边的源节点索引
+            targets: 边的目标节点索引
+            weights: 边权重，默认为1
+            index: 已有的节点ID到索引映射，提供时直接复用
+        """
+        self.node_ids = node_ids if isinstance(node_ids, Sequence) else list(node_ids)
+        if index is None:
+            index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.index = index
+
+        adjacency = CSRMatrix.from_edges(sources, targets, len(self.node_ids), weights)
+        self.transition, self.dangling = build_transition(adjacency)
+        self._transition_t = None
+        self._parallel: Dict[int, ParallelCSR] = {}
+
+    @classmethod
+    def from_csr(cls, node_ids: Sequence[Hashable], adjacency: CSRMatrix,
+                 index: Optional[Dict[Hashable, int]] = None) -> 'PageRankModel':
+        """
+        从已去重的CSR邻接矩阵构建计算模型，行偏移与列索引数组直接复用
+
+        Args:
+            node_ids: 节点ID序列
+            adjacency: 邻接矩阵，不能包含重复边
+            index: 节点ID到索引的映射
+
+        Returns:
+            计算模型
+        """
+        model = cls.__new__(cls)
+        model.node_ids = node_ids if isinstance(node_ids, Sequence) else list(node_ids)
+        model.index = index if index is not None else {node_id: i for i, node_id in enumerate(model.node_ids)}
+        model.transition, model.dangling = build_transition(adjacency)
+        model._transition_t = None
+        model._parallel = {}
+        return model
+
+    @classmethod
+    def from_store(cls, store: Any) -> 'PageRankModel':
+        """
+        从数组图存储构建计算模型，直接复用其CSR数组与ID索引
+
+        图存储中的边已按源节点排序且没有重复，out_indptr 与 dst 直接作为
+        转移矩阵的行偏移与列索引（内存映射的图存储不会复制这两个数组）。
+
+        Args:
+            store: GraphStore对象
+
+        Returns:
+            计算模型
+        """
+        adjacency = CSRMatrix(store.out_indptr, store.dst, store.weight, (store.num_nodes, store.num_nodes))
+        return cls.from_csr(store.node_ids, adjacency, index=store.index)
+
+    @classmethod
+    def from_networkx(cls, graph: Any, weight: str = 'weight') -> 'PageRankModel':
+        """
+        从NetworkX有向图构建计算模型
+
+        Args:
+            graph: NetworkX有向图
+            weight: 边权重属性名
+
+        Returns:
+            计算模型
+        """
+        node_ids = list(graph.nodes())
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        num_edges = graph.number_of_edges()
+
+        sources = np.empty(num_edges, dtype=np.int64)
+        targets = np.empty(num_edges, dtype=np.int64)
+        weights = np.empty(num_edges, dtype=np.float64)
+        for k, (u, v, w) in enumerate(graph.edges(data=weight, default=1.0)):
+            sources[k] = index[u]
+            targets[k] = index[v]
+            weights[k] = w
+
+        return cls(node_ids, sources, targets, weights)
+
+    @property
+    def num_nodes(self) -> int:
+        """节点数量"""
+        return len(self.node_ids)
+
+    @property
+    def transition_t(self) -> CSRMatrix:
+        """转移矩阵的转置（按目标节点分行，惰性计算并缓存）"""
+        if self._transition_t is None:
+            self._transition_t = self.transition.transpose()
+        return self._transition_t
+
+    def parallel_transition_t(self, threads: Optional[int] = None) -> ParallelCSR:
+        """
+        转置转移矩阵的多线程乘法内核（按线程数惰性创建并缓存）
+
+        Args:
+            threads: 线程数，None或0表示使用全部CPU核心
+
+        Returns:
+            按行分块的并行CSR乘法
+        """
+        threads = resolve_threads(threads)
+        if threads not in self._parallel:
+            self._parallel[threads] = ParallelCSR(self.transition_t, threads)
+        return self._parallel[threads]
+
+    def personalization_vector(self, personalization: Any = None) -> np.ndarray:
+        """
+        将个性化向量规范化为概率分布
+
+        Args:
+            personalization: None、长度为n的数组，或节点ID到权重的字典
+
+        Returns:
+            和为1的个性化向量
+        """
+        n = self.num_nodes
+        if personalization is None:
+            return np.full(n, 1.0 / n)
+
+        if isinstance(personalization, dict):
+            vector = np.zeros(n)
+            for node_id, value in personalization.items():
+                vector[self.index[node_id]] = value
+        else:
+            vector = np.asarray(personalization, dtype=np.float64)
+            if vector.shape != (n,):
+                raise ValueError("个性化向量长度必须等于节点数量")
+
+        total = vector.sum()
+        if total <= 0:
+            raise ValueError("个性化向量的权重之和必须为正数")
+        return vector / total
+
+
+class PageRankResult(Mapping):
+    """
+    PageRank计算结果
+
+    以数组加ID索引的形式保存结果，同时实现只读字典接口，
+    可以像 {节点ID: PageRank值} 字典一样使用。
+    """
+
+    def __init__(self, array: np.ndarray, node_ids: List[Hashable], index: Dict[Hashable, int],
+                 iterations: int = 0, converged: bool = True, method: Optional[Enum] = None,
+                 residuals: Optional[np.ndarray] = None):
+        """
+        初始化计算结果
+
+        Args:
+            array: PageRank值数组，与node_ids一一对应
+            node_ids: 节点ID列表
+            index: 节点ID到数组下标的映射
+            iterations: 迭代次数
+            converged: 是否收敛
+            method: 使用的求解算法或增量更新方式
+            residuals: 每次迭代的残差 ‖G(x) - x‖₁，求解器不提供时为None
+        """
+        self.array = array
+        self.node_ids = node_ids
+        self.index = index
+        self.iterations = iterations
+        self.converged = converged
+        self.method = method
+        self.residuals = residuals
+
+    def __getitem__(self, node_id: Hashable) -> float:
+        return float(self.array[self.index[node_id]])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.node_ids)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.index
+
+    def to_dict(self) -> Dict[Hashable, float]:
+        """
+        转换为普通字典
+
+        Returns:
+            节点ID到PageRank值的字典
+        """
+        return dict(zip(self.node_ids, self.array.tolist()))
+
+
+def power_iteration(model: PageRankModel, damping: float, tolerance: float, max_iterations: int,
+                    x0: Optional[np.ndarray] = None,
+                    personalization: Optional[np.ndarray] = None,
+                    acceleration: Any = Acceleration.NONE,
+                    stopping: Any = StoppingRule.DIFFERENCE, threads: int = 1) -> PageRankResult:
+    """
+    幂迭代求解PageRank
+
+    默认的收敛判据与networkx一致：相邻两次迭代的L1差小于 n × tolerance。
+    RESIDUAL 规则要求残差 ‖G(x) - x‖₁ < (1 - damping) × tolerance，由于迭代映射G
+    在L1范数下是系数为damping的压缩映射，此时结果与真解的L1误差不超过tolerance。
+
+    threads 不为1时，转置转移矩阵按行分块在线程池中并行相乘，秩一修正与
+    随机跳转项在各块内一并写入输出；悬挂节点的值按预先计算的下标取到固定缓冲区，
+    残差也在固定缓冲区中计算。未启用加速时两个输出缓冲区交替使用，迭代过程中
+    不再分配向量；启用加速时每次迭代仍分配新的输出向量（加速方法需要保留历史迭代值）。
+
+    Args:
+        model: 计算模型
+        damping: 阻尼系数
+        tolerance: 收敛阈值
+        max_iterations: 最大迭代次数
+        x0: 初始向量，默认均匀分布
+        personalization: 个性化向量（已规范化），同时作为悬挂节点的分配分布
+        acceleration: 收敛加速方式
+        stopping: 停止规则
+        threads: 并行乘法的线程数，None或0表示使用全部CPU核心
+
+    Returns:
+        计算结果，residuals为每次迭代的残差
+    """
+    n = model.num_nodes
+    v = personalization if personalization is not None else np.full(n, 1.0 / n)
+    dangling = model.dangling
+
+    if threads == 1:
+        pt = model.transition_t
+
+        def step(x: np.ndarray) -> np.ndarray:
+            return damping * (pt.dot(x) + x[dangling].sum() * v) + (1 - damping) * v
+    else:
+        kernel = model.parallel_transition_t(threads)
+        # 加速方法会保留历史迭代值，此时每次迭代使用新的输出向量
+        buffers = (np.empty(n), np.empty(n)) if Acceleration(acceleration) == Acceleration.NONE else None
+        dangling_index = np.flatnonzero(dangling)
+        dangling_values = np.empty(len(dangling_index))
+
+        def step(x: np.ndarray) -> np.ndarray:
+            out = None if buffers is None else buffers[x is buffers[0]]
+            dangling_mass = np.take(x, dangling_index, out=dangling_values, mode='clip').sum()
+            return kernel.dot(x, out, damping, damping * dangling_mass + 1 - damping, v)
+
+    x, iterations, converged, residuals = accelerated_iteration(
+        step,
+        _initial_vector(n, x0),
+        stopping_threshold(stopping, tolerance, damping, n),
+        max_iterations,
+        acceleration
+    )
+    return PageRankResult(x, model.node_ids, model.index, iterations, converged, SolverMethod.POWER, residuals)
+
+
+def stopping_threshold(stopping: Any, tolerance: float, damping: float, scale: float = 1.0) -> float:
+    """
+    计算停止规则对应的残差阈值
+
+    Args:
+        stopping: 停止规则
+        tolerance: 收敛阈值
+        damping: 阻尼系数
+        scale: DIFFERENCE 规则下阈值的倍数（networkx约定为节点数量）
+
+    Returns:
+        残差 ‖G(x) - x‖₁ 的阈值
+    """
+    if StoppingRule(stopping) == StoppingRule.RESIDUAL:
+        return (1 - damping) * tolerance
+    return scale * tolerance
+
+
+def accelerated_iteration(step: Callable[[np.ndarray], np.ndarray], x0: np.ndarray, threshold: float,
+                          max_iterations: int, acceleration: Any = Acceleration.NONE, window: int = 5,
+                          period: int = 10, callback: Optional[Callable[[np.ndarray], None]] = None
+                          ) -> Tuple[np.ndarray, int, bool, np.ndarray]:
+    """
+    带收敛加速的不动点迭代 x ← G(x)
+
+    每次迭代调用一次G并记录残差 ‖G(x) - x‖₁，残差低于阈值时返回G(x)。
+    AITKEN 与 QUADRATIC 每隔period次迭代，用最近3个或4个连续迭代值做逐分量的
+    Aitken Δ² 外推或二次外推；ANDERSON 每次迭代用最近window个残差差分的
+    最小二乘组合修正G(x)，残差明显回升时清空历史重新开始。
+    加速得到的向量负分量截断为0，并缩放到与G(x)相同的总和。
+
+    Args:
+        step: 迭代映射G
+        x0: 初始向量
+        threshold: 残差的收敛阈值
+        max_iterations: 最大迭代次数（即G的调用次数）
+        acceleration: 加速方式
+        window: Anderson加速使用的历史长度
+        period: 外推的间隔迭代次数
+        callback: 每得到一个新的迭代值时调用
+
+    Returns:
+        (结果向量, 迭代次数, 是否收敛, 残差数组)
+    """
+    acceleration = Acceleration(acceleration)
+    if window < 1 or period < 4:
+        raise ValueError("Anderson历史长度至少为1，外推间隔至少为4")
+
+    x = x0
+    residuals = []
+    # 外推使用的连续迭代值；Anderson使用的 G(x) 与残差向量的相邻差分
+    iterates = deque(maxlen=3 if acceleration == Acceleration.AITKEN else 4)
+    delta_g = deque(maxlen=window)
+    delta_f = deque(maxlen=window)
+    last = None
+    best = np.inf
+    # Anderson需要保留每次的残差向量，其他方式在固定缓冲区中计算残差
+    work = np.empty(len(x0))
+
+    converged = False
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        g = step(x)
+        if acceleration == Acceleration.ANDERSON:
+            f = g - x
+            residual = float(np.abs(f).sum())
+        else:
+            residual = float(np.abs(np.subtract(g, x, out=work), out=work).sum())
+        residuals.append(residual)
+
+        if residual < threshold:
+            x = g
+            converged = True
+        elif acceleration == Acceleration.ANDERSON:
+            if residual > 10 * best:
+                delta_g.clear()
+                delta_f.clear()
+                last = None
+                best = residual
+            best = min(best, residual)
+            if last is not None:
+                delta_g.append(g - last[0])
+                delta_f.append(f - last[1])
+            last = (g, f)
+            x = _anderson_step(g, f, delta_g, delta_f)
+        else:
+            x = g
+            if acceleration != Acceleration.NONE:
+                iterates.append(g)
+                if iterations % period == 0 and len(iterates) == iterates.maxlen:
+                    extrapolate = _aitken_step if acceleration == Acceleration.AITKEN else _quadratic_step
+                    x = _project(extrapolate(iterates), g)
+                    iterates.clear()
+
+        if callback is not None:
+            callback(x)
+        if converged:
+            break
+
+    return x, iterations, converged, np.array(residuals)
+
+
+def _aitken_step(iterates: deque) -> np.ndarray:
+    """
+    Aitken Δ² 外推：由相邻两次差分估计主误差分量的收缩比 λ，
+    再沿最后一次差分外推 λ/(1-λ) 倍，把该分量的几何级数一次求和
+    """
+    x0, x1, x2 = iterates
+    previous = x1 - x0
+    delta = x2 - x1
+    norm = previous @ previous
+    ratio = (delta @ previous) / norm if norm > 0 else 0.0
+    if not 0.0 < ratio < 1.0:
+        return x2
+    return x2 + ratio / (1.0 - ratio) * delta
+
+
+def _quadratic_step(iterates: deque) -> np.ndarray:
+    """二次外推（Kamvar等）：假设误差集中在前两个次主特征向量上，消去它们"""
+    x0, x1, x2, x3 = iterates
+    y1, y2, y3 = x1 - x0, x2 - x0, x3 - x0
+    gram = np.array([[y1 @ y1, y1 @ y2], [y1 @ y2, y2 @ y2]])
+    gamma1, gamma2 = -np.linalg.lstsq(gram, np.array([y1 @ y3, y2 @ y3]), rcond=1e-12)[0]
+    return (gamma1 + gamma2 + 1) * x1 + (gamma2 + 1) * x2 + x3
+
+
+def _anderson_step(g: np.ndarray, f: np.ndarray, delta_g: deque, delta_f: deque) -> np.ndarray:
+    """Anderson加速：x = G(x) - ΔG·γ，γ 使 ‖f - ΔF·γ‖₂ 最小（在 k×k 法方程上求解）"""
+    k = len(delta_f)
+    if k == 0:
+        return g
+    gram = np.empty((k, k))
+    rhs = np.empty(k)
+    for i, a in enumerate(delta_f):
+        rhs[i] = a @ f
+        for j in range(i + 1):
+            gram[i, j] = gram[j, i] = a @ delta_f[j]
+    gamma = np.linalg.lstsq(gram, rhs, rcond=1e-12)[0]
+
+    x = g.copy()
+    for coefficient, column in zip(gamma.tolist(), delta_g):
+        x -= coefficient * column
+    return _project(x, g)
+
+
+def _project(x: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """截断负分量并缩放到与参考向量相同的总和，无法缩放时退回参考向量"""
+    x = np.maximum(x, 0.0)
+    total = x.sum()
+    if not np.isfinite(total) or total <= 0:
+        return reference
+    return x * (reference.sum() / total)
+
+
+def _system_matrix(model: PageRankModel, damping: float) -> Any:
+    """构建线性系统的系数矩阵 I - d·Pᵀ（scipy CSR格式）"""
+    import scipy.sparse as sp
+
+    pt = model.transition_t
+    n = model.num_nodes
+    return (sp.identity(n, format='csr') - damping * sp.csr_matrix(
+        (pt.data, pt.indices, pt.indptr), shape=pt.shape)).tocsr()
+
+
+def gauss_seidel(model: PageRankModel, damping: float, tolerance: float, max_iterations: int,
+                 x0: Optional[np.ndarray] = None,
+                 personalization: Optional[np.ndarray] = None) -> PageRankResult:
+    """
+    Gauss-Seidel迭代求解PageRank
+
+    求解线性系统 (I - d·Pᵀ)·y = v 后归一化，悬挂节点由归一化自然处理。
+    系数矩阵拆分为下三角部分（含对角线）L与严格上三角部分U，每次扫描求解
+    L·y' = v - U·y：按节点下标顺序逐行更新，每行立即使用本次扫描中已更新的值。
+    三角求解由scipy完成。
+
+    Args:
+        model: 计算模型
+        damping: 阻尼系数
+        tolerance: 收敛阈值
+        max_iterations: 最大迭代次数（完整扫描次数）
+        x0: 初始向量，默认均匀分布
+        personalization: 个性化向量（已规范化）
+
+    Returns:
+        计算结果
+    """
+    try:
+        import scipy.sparse as sp
+        from scipy.sparse.linalg import spsolve_triangular
+    except ImportError:
+        raise ImportError("Gauss-Seidel迭代需要安装scipy")
+
+    n = model.num_nodes
+    v = personalization if personalization is not None else np.full(n, 1.0 / n)
+    matrix = _system_matrix(model, damping)
+    lower = sp.tril(matrix, format='csr')
+    upper = sp.triu(matrix, k=1, format='csr')
+    y = _initial_vector(n, x0)
+
+    x = y / y.sum()
+    converged = False
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        y = spsolve_triangular(lower, v - upper @ y, lower=True)
+
+        x_last = x
+        x = y / y.sum()
+        if np.abs(x - x_last).sum() < n * tolerance:
+            converged = True
+            break
+
+    return PageRankResult(x, model.node_ids, model.index, iterations, converged,
+                          SolverMethod.GAUSS_SEIDEL)
+
+
+def linear_solve(model: PageRankModel, damping: float, tolerance: float, max_iterations: int,
+                 x0: Optional[np.ndarray] = None,
+                 personalization: Optional[np.ndarray] = None) -> PageRankResult:
+    """
+    用GMRES迭代求解线性系统 (I - d·Pᵀ)·y = v 后归一化
+
+    Krylov子空间方法从x0出发，相对残差 ‖v - (I - d·Pᵀ)·y‖₂ / ‖v‖₂ 小于tolerance时
+    停止；每30次迭代重启一次，总迭代次数不超过max_iterations。需要scipy（≥1.12）。
+
+    Args:
+        model: 计算模型
+        damping: 阻尼系数
+        tolerance: 相对残差的收敛阈值
+        max_iterations: 最大迭代次数（GMRES的内层迭代次数）
+        x0: 初始向量，默认均匀分布
+        personalization: 个性化向量（已规范化）
+
+    Returns:
+        计算结果，iterations为GMRES的内层迭代次数
+    """
+    try:
+        from scipy.sparse.linalg import gmres
+    except ImportError:
+        raise ImportError("线性方程组求解需要安装scipy")
+
+    n = model.num_nodes
+    v = personalization if personalization is not None else np.full(n, 1.0 / n)
+    restart = max(1, min(30, max_iterations))
+    iterations = 0
+
+    def count(_residual: float) -> None:
+        nonlocal iterations
+        iterations += 1
+
+    y, info = gmres(_system_matrix(model, damping), v, x0=_initial_vector(n, x0), rtol=tolerance, atol=0.0,
+                    restart=restart, maxiter=-(-max_iterations // restart),
+                    callback=count, callback_type='pr_norm')
+    x = y / y.sum()
+    return PageRankResult(x, model.node_ids, model.index, iterations, info == 0, SolverMethod.LINEAR)
+
+
+def batch_power_iteration(transition_t: CSRMatrix, dangling: np.ndarray, dampings: np.ndarray,
+                          personalization: np.ndarray, threshold: float, max_iterations: int,
+                          x0: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量幂迭代：同时迭代 n×k 矩阵的k个列
+
+    每步只对尚未收敛的列做一次共享的稀疏矩阵乘法，各列独立判断收敛，
+    收敛后即冻结不再参与计算。
+
+    Args:
+        transition_t: 转移矩阵的转置
+        dangling: 悬挂节点掩码
+        dampings: 长度为k的阻尼系数数组
+        personalization: n×k 的个性化矩阵，每列和为1
+        threshold: 相邻两次迭代L1差的收敛阈值
+        max_iterations: 最大迭代次数
+        x0: n×k 的初始矩阵，默认与个性化矩阵相同的均匀分布
+
+    Returns:
+        (n×k 结果矩阵, 每列迭代次数, 每列是否收敛)
+    """
+    n, k = personalization.shape
+    x = np.full((n, k), 1.0 / n) if x0 is None else np.array(x0, dtype=np.float64)
+    result = x.copy()
+    iterations = np.full(k, max_iterations, dtype=np.int64)
+    converged = np.zeros(k, dtype=bool)
+    dangling_weights = dangling.astype(np.float64)
+    ones = np.ones(n)
+
+    # 所有列都是均匀个性化向量时（如阻尼系数扫描）用按行广播代替n×k矩阵
+    uniform = bool(np.all(personalization == 1.0 / n))
+    v = None if uniform else np.array(personalization, dtype=np.float64)
+    buffer = None if uniform else np.empty_like(v)
+
+    # 工作矩阵只包含未收敛的列，仅在有列收敛时才压缩
+    active = np.arange(k)
+    d = dampings.astype(np.float64)
+    for iteration in range(1, max_iterations + 1):
+        # x_new = d·(Pᵀx) + v·(d·悬挂质量 + 1 - d)
+        x_new = transition_t.dot(x)
+        x_new *= d
+        scale = d * (dangling_weights @ x) + (1 - d)
+        if uniform:
+            x_new += scale / n
+        else:
+            np.multiply(v, scale, out=buffer)
+            x_new += buffer
+
+        # 复用旧矩阵的缓冲区计算各列的L1差
+        np.subtract(x_new, x, out=x)
+        np.abs(x, out=x)
+        done = ones @ x < threshold
+        x = x_new
+
+        if done.any():
+            finished = active[done]
+            result[:, finished] = x[:, done]
+            iterations[finished] = iteration
+            converged[finished] = True
+
+            keep = ~done
+            active, x, d = active[keep], x[:, keep], d[keep]
+            if v is not None:
+                v = v[:, keep]
+                buffer = buffer[:, keep]
+            if len(active) == 0:
+                break
+
+    result[:, active] = x
+    return result, iterations, converged
+
+
+def solve_pagerank_batch(model: PageRankModel, damping: Any = 0.85, tolerance: float = 1e-6,
+                         max_iterations: int = 100,
+                         personalization: Optional[Sequence[Any]] = None) -> List[PageRankResult]:
+    """
+    批量求解多组参数下的PageRank
+
+    damping 可以是单个值或k个值的序列，personalization 可以是None或k个
+    个性化向量（数组或节点ID到权重的字典，None表示均匀分布）；两者均为序列时长度必须一致。
+
+    Args:
+        model: 计算模型
+        damping: 阻尼系数或阻尼系数序列
+        tolerance: 收敛阈值
+        max_iterations: 最大迭代次数
+        personalization: 个性化向量序列
+
+    Returns:
+        每组参数对应的计算结果列表
+    """
+    dampings = np.atleast_1d(np.asarray(damping, dtype=np.float64))
+    if personalization is None:
+        personalization = [None]
+    if len(dampings) > 1 and len(personalization) > 1 and len(dampings) != len(personalization):
+        raise ValueError("阻尼系数与个性化向量的数量不一致")
+
+    k = max(len(dampings), len(personalization))
+    dampings = np.broadcast_to(dampings, (k,))
+    if len(personalization) == 1:
+        personalization = list(personalization) * k
+
+    n = model.num_nodes
+    if n == 0:
+        return [PageRankResult(np.zeros(0), model.node_ids, model.index, 0, True, SolverMethod.POWER)
+                for _ in range(k)]
+
+    v = np.column_stack([model.personalization_vector(p) for p in personalization])
+    x, iterations, converged = batch_power_iteration(
+        model.transition_t, model.dangling, dampings, v, n * tolerance, max_iterations
+    )
+    return [
+        PageRankResult(x[:, j].copy(), model.node_ids, model.index, int(iterations[j]),
+                       bool(converged[j]), SolverMethod.POWER)
+        for j in range(k)
+    ]
+
+
+def unnormalized_scores(x: np.ndarray, dangling: np.ndarray, damping: float) -> np.ndarray:
+    """
+    将归一化的PageRank向量换算为线性系统 (I - d·Hᵀ)·y = 1 的解
+
+    y 的每个分量只取决于图结构而与节点总数无关，因此在节点增删后
+    仍可直接作为增量更新的起点。要求 x 使用均匀的个性化向量。
+
+    Args:
+        x: 归一化的PageRank向量
+        dangling: 悬挂节点掩码
+        damping: 阻尼系数
+
+    Returns:
+        未归一化的得分向量
+    """
+    n = len(x)
+    dangling_share = x[dangling].sum() / x.sum()
+    return x / x.sum() * n / (1 - damping + damping * dangling_share)
+
+
+def _gather_rows(matrix: CSRMatrix, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    取出若干行的全部非零元
+
+    Returns:
+        (非零元在indices/data中的位置, 每个非零元所属行在rows中的下标)
+    """
+    starts = matrix.indptr[rows]
+    counts = matrix.indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), counts)
+    positions = np.arange(len(owner)) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return positions, owner
+
+
+def residual_push(model: PageRankModel, damping: float, tolerance: float, y0: np.ndarray,
+                  affected: np.ndarray, max_iterations: int = 100,
+                  frontier_limit: float = 0.1) -> PageRankResult:
+    """
+    局部残差推送更新PageRank
+
+    以旧解换算出的 y0 为起点，只计算受影响节点的残差
+    r = 1 - y + d·Hᵀ·y，然后按轮推送：每轮把所有超过阈值的残差同时计入y，
+    并沿出边（CSR行切片）一次性累加到后继节点的残差上，直到所有残差换算到
+    归一化尺度后都不超过 tolerance，与其他求解器"每个节点误差约为tolerance"的
+    精度一致。未受影响节点的残差视为旧解收敛后的残差，不再重新计算。
+
+    待推送的节点超过 frontier_limit × 节点数时，局部更新已不比全量迭代便宜，
+    改为以当前估计为初始向量做幂迭代（热启动）。
+
+    Args:
+        model: 更新后的计算模型
+        damping: 阻尼系数
+        tolerance: 单个节点的残差阈值（归一化尺度）
+        y0: 更新后图上的初始未归一化得分，新节点为0
+        affected: 受影响节点的索引
+        max_iterations: 回退为热启动时的最大迭代次数
+        frontier_limit: 回退为热启动的待推送节点比例
+
+    Returns:
+        计算结果，iterations为推送轮数（回退时加上幂迭代次数）
+    """
+    n = model.num_nodes
+    y = np.array(y0, dtype=np.float64)
+    pt = model.transition_t
+    p = model.transition
+    threshold = tolerance * max(y.sum(), 1.0)
+
+    affected = np.unique(np.asarray(affected, dtype=np.int64))
+    positions, owner = _gather_rows(pt, affected)
+    inflow = np.bincount(owner, weights=pt.data[positions] * y[pt.indices[positions]], minlength=len(affected))
+    residual = np.zeros(n)
+    residual[affected] = 1.0 - y[affected] + damping * inflow
+
+    frontier = affected[np.abs(residual[affected]) > threshold]
+    rounds = 0
+    pushed = 0
+    while len(frontier):
+        pushed += len(frontier)
+        if pushed > frontier_limit * n:
+            result = power_iteration(model, damping, tolerance, max_iterations, x0=y / y.sum())
+            return PageRankResult(result.array, model.node_ids, model.index, rounds + result.iterations,
+                                  result.converged, IncrementalUpdate.PUSH, result.residuals)
+
+        rounds += 1
+        amounts = residual[frontier]
+        y[frontier] += amounts
+        residual[frontier] = 0.0
+
+        positions, owner = _gather_rows(p, frontier)
+        targets = p.indices[positions]
+        np.add.at(residual, targets, damping * amounts[owner] * p.data[positions])
+        touched = np.unique(targets)
+        frontier = touched[np.abs(residual[touched]) > threshold]
+
+    x = y / y.sum()
+    return PageRankResult(x, model.node_ids, model.index, rounds, True, IncrementalUpdate.PUSH)
+
+
+def _initial_vector(n: int, x0: Optional[np.ndarray]) -> np.ndarray:
+    """生成归一化的初始向量"""
+    if x0 is None:
+        return np.full(n, 1.0 / n)
+    x = np.array(x0, dtype=np.float64)
+    total = x.sum()
+    if x.shape != (n,) or total <= 0:
+        raise ValueError("初始向量长度必须等于节点数量且元素和为正数")
+    return x / total
+
+
+SOLVERS: Dict[SolverMethod, Callable[..., PageRankResult]] = {
+    SolverMethod.POWER: power_iteration,
+    SolverMethod.GAUSS_SEIDEL: gauss_seidel,
+    SolverMethod.LINEAR: linear_solve,
+}
+
+
+def register_solver(method: Any, solver: Callable[..., PageRankResult]) -> None:
+    """
+    注册自定义求解器
+
+    Args:
+        method: 求解算法标识（SolverMethod成员或自定义键）
+        solver: 求解函数，签名与 power_iteration 相同
+    """
+    SOLVERS[method] = solver
+
+
+def solve_pagerank(model: PageRankModel, method: Any = SolverMethod.POWER, damping: float = 0.85,
+                   tolerance: float = 1e-6, max_iterations: int = 100,
+                   x0: Optional[np.ndarray] = None, personalization: Any = None,
+                   acceleration: Any = Acceleration.NONE,
+                   stopping: Any = StoppingRule.DIFFERENCE, threads: Optional[int] = 1) -> PageRankResult:
+    """
+    使用指定算法求解PageRank
+
+    Args:
+        model: 计算模型
+        method: 求解算法，SolverMethod成员、其字符串值或已注册的自定义键
+        damping: 阻尼系数
+        tolerance: 收敛阈值
+        max_iterations: 最大迭代次数
+        x0: 初始向量
+        personalization: 个性化向量或节点ID到权重的字典
+        acceleration: 收敛加速方式，仅幂迭代支持
+        stopping: 停止规则，仅幂迭代支持
+        threads: 稀疏乘法的线程数，None或0表示使用全部CPU核心，仅幂迭代支持
+
+    Returns:
+        计算结果
+    """
+    if method not in SOLVERS:
+        try:
+            method = SolverMethod(method)
+        except ValueError:
+            raise ValueError(f"不支持的PageRank求解算法: {method}")
+
+    # 只有非默认值才传给求解器，其他求解器与自定义求解器的签名保持不变
+    options = {}
+    if Acceleration(acceleration) != Acceleration.NONE:
+        options['acceleration'] = Acceleration(acceleration)
+    if StoppingRule(stopping) != StoppingRule.DIFFERENCE:
+        options['stopping'] = StoppingRule(stopping)
+    if options and method != SolverMethod.POWER:
+        raise ValueError("收敛加速与停止规则仅支持幂迭代求解")
+    if threads != 1:
+        if method != SolverMethod.POWER:
+            raise ValueError("多线程迭代仅支持幂迭代求解")
+        options['threads'] = threads
+
+    if model.num_nodes == 0:
+        return PageRankResult(np.zeros(0), model.node_ids, model.index, 0, True, method)
+
+    return SOLVERS[method](
+        model,
+        damping,
+        tolerance,
+        max_iterations,
+        x0=x0,
+        personalization=model.personalization_vector(personalization),
+        **options
+    )
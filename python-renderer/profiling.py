@@ -0,0 +1,306 @@
+"""
+性能剖析模块
+为渲染流水线的各阶段记录耗时、CPU时间、内存峰值与分配计数，
+结果汇总为结构化报告，可逐条写入JSON Lines或交给回调函数处理
+"""
+
+import functools
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _json_default(value: Any) -> Any:
+    """JSON序列化时把枚举转换为其值，其他对象转换为字符串"""
+    return value.value if isinstance(value, Enum) else str(value)
+
+
+def _peak_rss() -> Optional[int]:
+    """进程常驻内存的历史峰值（字节），平台不支持时返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux以KB为单位，macOS以字节为单位
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageRecord:
+    """
+    单个阶段的剖析记录
+
+    memory_peak 与 memory_delta 只在开启内存追踪时可用，分别为阶段内
+    Python堆相对阶段开始时的峰值增量与结束时的净增量；rss_peak 为阶段
+    结束时进程常驻内存的历史峰值，rss_growth 为阶段内该峰值的增长量。
+    """
+
+    def __init__(self, name: str, path: str, depth: int, start: float):
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.start = start
+        self.duration = 0.0
+        self.cpu_time = 0.0
+        self.allocated_blocks = 0
+        self.memory_peak: Optional[int] = None
+        self.memory_delta: Optional[int] = None
+        self.rss_peak: Optional[int] = None
+        self.rss_growth: Optional[int] = None
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, Any] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为可JSON序列化的字典
+
+        Returns:
+            记录字典
+        """
+        return {
+            'stage': self.name,
+            'path': self.path,
+            'depth': self.depth,
+            'start': self.start,
+            'duration': self.duration,
+            'cpu_time': self.cpu_time,
+            'allocated_blocks': self.allocated_blocks,
+            'memory_peak': self.memory_peak,
+            'memory_delta': self.memory_delta,
+            'rss_peak': self.rss_peak,
+            'rss_growth': self.rss_growth,
+            'error': self.error,
+            'attributes': self.attributes
+        }
+
+    def __repr__(self) -> str:
+        return f"StageRecord({self.path!r}, duration={self.duration:.6f})"
+
+
+class ProfileReport:
+    """
+    剖析报告
+
+    records 按阶段结束的先后排列（子阶段在父阶段之前）。
+    """
+
+    def __init__(self, records: List[StageRecord]):
+        self.records = records
+
+    def __iter__(self) -> Iterator[StageRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def stages(self, name: str) -> List[StageRecord]:
+        """
+        查找指定名称的全部阶段记录
+
+        Args:
+            name: 阶段名称
+
+        Returns:
+            记录列表
+        """
+        return [record for record in self.records if record.name == name]
+
+    def total(self, name: str) -> float:
+        """
+        指定阶段的累计耗时（秒）
+
+        Args:
+            name: 阶段名称
+
+        Returns:
+            累计耗时
+        """
+        return sum(record.duration for record in self.records if record.name == name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为可JSON序列化的字典，包含全部记录与按阶段名汇总的统计
+
+        Returns:
+            报告字典
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            entry = totals.setdefault(record.name, {'count': 0, 'duration': 0.0, 'memory_peak': None})
+            entry['count'] += 1
+            entry['duration'] += record.duration
+            if record.memory_peak is not None:
+                entry['memory_peak'] = max(entry['memory_peak'] or 0, record.memory_peak)
+        return {'stages': [record.to_dict() for record in self.records], 'totals': totals}
+
+    def summary(self) -> str:
+        """
+        生成按调用层次缩进的文本表格
+
+        Returns:
+            多行文本
+        """
+        lines = [f"{'stage':<40}{'time(s)':>10}{'cpu(s)':>10}{'peak(MB)':>10}{'blocks':>10}"]
+        for record in sorted(self.records, key=lambda r: r.start):
+            peak = '-' if record.memory_peak is None else f"{record.memory_peak / 2 ** 20:.1f}"
+            name = '  ' * record.depth + record.name
+            lines.append(f"{name:<40}{record.duration:>10.4f}{record.cpu_time:>10.4f}{peak:>10}"
+                         f"{record.allocated_blocks:>10}")
+        return '\n'.join(lines)
+
+
+class Profiler:
+    """
+    阶段剖析器
+
+    阶段可以嵌套；开启内存追踪时使用tracemalloc（会明显拖慢纯Python代码，
+    适合诊断时使用），关闭时每个阶段只读取几个计时器与计数器。
+    """
+
+    def __init__(self, memory: bool = False, output: Union[str, IO[str], None] = None,
+                 callback: Optional[Callable[[StageRecord], None]] = None):
+        """
+        创建剖析器
+
+        Args:
+            memory: 是否用tracemalloc追踪Python堆的峰值与净增量
+            output: JSON Lines输出路径（追加写入）或文本文件对象，每个阶段结束时写一行
+            callback: 每个阶段结束时以StageRecord调用
+        """
+        self.memory = memory
+        self.callback = callback
+        self._owns_output = isinstance(output, str)
+        self._output = open(output, 'a', encoding='utf-8') if isinstance(output, str) else output
+        self._records: List[StageRecord] = []
+        self._stack: List[StageRecord] = []
+        # 每层阶段在子阶段重置tracemalloc峰值之前观察到的峰值
+        self._peak_seen: List[int] = []
+        self._started_tracing = False
+        self._origin = time.perf_counter()
+
+    @property
+    def report(self) -> ProfileReport:
+        """截至目前已结束阶段的报告"""
+        return ProfileReport(list(self._records))
+
+    def reset(self) -> None:
+        """清空已记录的阶段"""
+        self._records.clear()
+        self._origin = time.perf_counter()
+
+    def annotate(self, **attributes: Any) -> None:
+        """
+        为当前阶段附加属性（如求解器迭代次数），不在任何阶段内时忽略
+
+        Args:
+            attributes: 属性键值对
+        """
+        if self._stack:
+            self._stack[-1].attributes.update(attributes)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[StageRecord]:
+        """
+        记录一个阶段
+
+        Args:
+            name: 阶段名称
+            attributes: 附加到记录上的属性
+
+        Returns:
+            上下文管理器，进入时给出正在记录的StageRecord
+        """
+        parent = self._stack[-1] if self._stack else None
+        path = f"{parent.path}/{name}" if parent else name
+        record = StageRecord(name, path, len(self._stack), time.perf_counter() - self._origin)
+        record.attributes.update(attributes)
+
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peak_seen:
+                self._peak_seen[-1] = max(self._peak_seen[-1], peak)
+            tracemalloc.reset_peak()
+            self._peak_seen.append(current)
+            memory_start = current
+
+        rss_start = _peak_rss()
+        blocks_start = sys.getallocatedblocks()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        self._stack.append(record)
+        try:
+            yield record
+        except BaseException as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.duration = time.perf_counter() - wall_start
+            record.cpu_time = time.process_time() - cpu_start
+            record.allocated_blocks = sys.getallocatedblocks() - blocks_start
+            self._stack.pop()
+
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record.memory_peak = max(self._peak_seen.pop(), peak) - memory_start
+                record.memory_delta = current - memory_start
+                if not self._stack and self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+
+            record.rss_peak = _peak_rss()
+            if rss_start is not None:
+                record.rss_growth = record.rss_peak - rss_start
+
+            self._finish(record)
+
+    def _finish(self, record: StageRecord) -> None:
+        """保存记录并输出到JSON Lines与回调"""
+        self._records.append(record)
+        if self._output is not None:
+            self._output.write(json.dumps(record.to_dict(), ensure_ascii=False, default=_json_default) + '\n')
+            self._output.flush()
+        if self.callback is not None:
+            self.callback(record)
+
+    def close(self) -> None:
+        """关闭由剖析器打开的JSON Lines文件"""
+        if self._owns_output and not self._output.closed:
+            self._output.close()
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    方法装饰器：对象的 profiler 属性不为None时把方法调用记录为一个阶段
+
+    未启用剖析时只多一次属性读取，可以在生产环境中常开。
+
+    Args:
+        name: 阶段名称，默认为去掉前导下划线的方法名
+
+    Returns:
+        装饰器
+    """
+    def decorator(method: Callable) -> Callable:
+        stage = name or method.__name__.lstrip('_')
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            with profiler.span(stage):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,553 @@
+"""
+本地渲染服务
+基于asyncio的本地服务：接收图JSON（如 packages/code-to-json 的输出），返回PageRank值、
+节点位置与PNG/SVG图像。支持 localhost HTTP 与 stdin/stdout JSON Lines 两种协议；
+计算在进程池中执行，并发的相同请求按图哈希合并，队列有界，满载时拒绝（HTTP 503）
+或暂停读取（JSON Lines）
+
+用法:
+    python render_service.py --http 127.0.0.1:8765
+    python render_service.py --stdio < requests.jsonl > responses.jsonl
+
+请求（HTTP为 POST /render 的请求体，JSON Lines为每行一个）:
+    {"id": 1, "data": {"metadata": {...}, "graph": {...}},
+     "outputs": ["pagerank", "positions", "png", "svg"], "config": {"layout": "circular"}, "dpi": 100}
+    data 可以省略，直接把 metadata 与 graph 放在顶层；outputs 默认为 ["pagerank"]。
+
+响应:
+    {"id": 1, "ok": true, "hash": "...", "nodes": [...], "pagerank": [...], "iterations": 12,
+     "converged": true, "positions": [[x, y], ...], "png": "<base64>", "svg": "<svg ...>", "elapsed": 0.012}
+    失败时为 {"id": 1, "ok": false, "status": 400, "error": "..."}。
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Tuple
+
+
+OUTPUTS = ('pagerank', 'positions', 'png', 'svg')
+# 请求不能修改的配置项：会在服务所在机器上读写文件
+SERVICE_ONLY_CONFIG = ('cache_dir', 'cache_max_bytes', 'profile', 'profile_memory', 'profile_output')
+# 请求体超过该大小时在线程中解析与哈希，不阻塞事件循环
+_LARGE_BODY = 256 * 1024
+
+# 每个工作进程只使用单线程的数值库，避免多进程叠加多线程造成超额订阅
+_THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+_REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class ServiceBusy(Exception):
+    """请求队列已满"""
+
+
+def _init_worker() -> None:
+    """
+    工作进程初始化：切换到Agg后端，导入绘图库与networkx，并在小图上计算一次PageRank
+    以完成稀疏求解器的惰性导入，使首个请求不承担导入开销
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+    import networkx  # noqa: F401
+    from pagerank_renderer import PageRankRenderer
+
+    renderer = PageRankRenderer()
+    renderer.load_json_from_dict({'metadata': {}, 'graph': {
+        'nodes': [{'id': 'a'}, {'id': 'b'}], 'edges': [{'source': 'a', 'target': 'b'}]}})
+    renderer.get_pagerank_result()
+
+
+def _ping() -> int:
+    """预热用的空任务"""
+    return os.getpid()
+
+
+def _run_job(data_text: str, outputs: List[str], config: Dict[str, Any], dpi: int) -> Dict[str, Any]:
+    """
+    在工作进程中处理一个请求
+
+    Args:
+        data_text: 图JSON文本
+        outputs: 需要的输出
+        config: 渲染器配置（JSON形式）
+        dpi: 图像分辨率
+
+    Returns:
+        响应中的结果字段
+    """
+    from batch_render import load_config
+    from pagerank_renderer import PageRankRenderer
+
+    renderer = PageRankRenderer(load_config(config))
+    renderer.load_json_from_dict(json.loads(data_text))
+    node_ids = list(renderer.store.node_ids)
+    result: Dict[str, Any] = {'nodes': node_ids}
+
+    if 'pagerank' in outputs:
+        values = renderer.get_pagerank_result()
+        result.update(pagerank=values.array.tolist(), iterations=values.iterations,
+                      converged=values.converged)
+    if 'positions' in outputs:
+        positions = renderer.get_node_positions()
+        result['positions'] = [[float(positions[node][0]), float(positions[node][1])] for node in node_ids]
+    if 'png' in outputs:
+        result['png'] = base64.b64encode(renderer.export_bytes('png', dpi)).decode('ascii')
+    if 'svg' in outputs:
+        result['svg'] = renderer.export_bytes('svg', dpi).decode('utf-8')
+    return result
+
+
+def _prepare(request: Any) -> Tuple[Dict[str, Any], str, str, int]:
+    """
+    解析并校验请求，计算图哈希
+
+    Args:
+        request: 请求体字节或已解析的请求字典
+
+    Returns:
+        (请求字典, 规范化的图JSON文本, 图哈希, 节点数+边数)
+    """
+    if isinstance(request, (bytes, str)):
+        try:
+            request = json.loads(request)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"请求不是有效的JSON: {e}")
+    if not isinstance(request, dict):
+        raise ValueError("请求必须是JSON对象")
+
+    data = request.get('data', request)
+    if not isinstance(data, dict) or not isinstance(data.get('graph'), dict):
+        raise ValueError("请求中缺少graph字段")
+    graph = data['graph']
+    if not isinstance(graph.get('nodes'), list) or not isinstance(graph.get('edges'), list):
+        raise ValueError("graph.nodes与graph.edges必须是列表")
+
+    data_text = json.dumps({'metadata': data.get('metadata', {}), 'graph': graph},
+                           sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    graph_hash = hashlib.sha256(data_text.encode('utf-8')).hexdigest()
+    return request, data_text, graph_hash, len(graph['nodes']) + len(graph['edges'])
+
+
+class _Lane:
+    """
+    一条处理通道：独立的进程池与有界的待处理名额
+
+    名额在请求提交时占用、完成时释放，包含排队中与执行中的请求。
+    工作进程异常退出会使整个进程池失效，此时换用新的进程池，只有当时未完成的请求失败。
+    """
+
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.slots = asyncio.Semaphore(max_pending)
+        self.restarts = 0
+        self.executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        """创建通道的进程池"""
+        return ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'), initializer=_init_worker)
+
+    def replace_executor(self, broken: ProcessPoolExecutor) -> None:
+        """
+        换掉已失效的进程池并在后台预热新的工作进程；
+        同一个进程池的多个失败请求只触发一次替换
+
+        Args:
+            broken: 失效的进程池
+        """
+        if self.executor is not broken:
+            return
+        self.executor = self._new_executor()
+        self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        for _ in range(self.workers):
+            self.executor.submit(_ping)
+
+    async def acquire(self, wait: bool) -> None:
+        """占用一个名额，wait为False且名额已满时抛出ServiceBusy"""
+        if not wait and self.slots.locked():
+            raise ServiceBusy(f"{self.name} 队列已满（{self.max_pending}）")
+        await self.slots.acquire()
+        self.pending += 1
+
+    def release(self) -> None:
+        """释放名额"""
+        self.pending -= 1
+        self.slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        """通道状态"""
+        return {'workers': self.workers, 'pending': self.pending, 'max_pending': self.max_pending,
+                'restarts': self.restarts}
+
+
+class RenderService:
+    """
+    渲染服务
+
+    节点数+边数不超过 small_graph_limit 的请求进入交互通道，其余进入批量通道，
+    大图不会阻塞课程页面的小图请求。键（图哈希、输出、配置与分辨率）相同的并发请求
+    只计算一次，完成的结果保存在有界的LRU中。
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, workers: Optional[int] = None,
+                 interactive_workers: int = 2, max_pending: int = 32, small_graph_limit: int = 5000,
+                 cache_entries: int = 128, dpi: int = 100):
+        """
+        创建服务，需要在事件循环中调用
+
+        Args:
+            config: 渲染器的基础配置（JSON形式），请求中的config在其上覆盖
+            workers: 批量通道的进程数，默认为CPU核心数
+            interactive_workers: 交互通道的进程数
+            max_pending: 每条通道的待处理请求上限
+            small_graph_limit: 进入交互通道的节点数+边数上限
+            cache_entries: 结果LRU的条目数，0表示不缓存
+            dpi: 默认的图像分辨率
+        """
+        self.config = dict(config or {})
+        self.small_graph_limit = small_graph_limit
+        self.cache_entries = cache_entries
+        self.dpi = dpi
+
+        for variable in _THREAD_VARIABLES:
+            os.environ.setdefault(variable, '1')
+        os.environ['MPLBACKEND'] = 'Agg'
+        self.interactive = _Lane('interactive', max(1, interactive_workers), max_pending)
+        self.bulk = _Lane('bulk', max(1, workers or os.cpu_count() or 1), max_pending)
+
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._results: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.counters = {'requests': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                         'coalesced': 0, 'cache_hits': 0}
+
+    async def start(self) -> None:
+        """预热全部工作进程（启动进程并导入渲染器与绘图库）"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(lane.executor, _ping)
+            for lane in (self.interactive, self.bulk) for _ in range(lane.workers)
+        ])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        服务状态
+
+        Returns:
+            计数器、各通道的待处理数量与进行中的计算数
+        """
+        return {**self.counters, 'inflight': len(self._inflight), 'cached': len(self._results),
+                'lanes': {lane.name: lane.stats() for lane in (self.interactive, self.bulk)}}
+
+    async def handle(self, request: Any, wait: bool = False) -> Dict[str, Any]:
+        """
+        处理一个请求，错误也以响应字典的形式返回
+
+        Args:
+            request: 请求体字节或请求字典
+            wait: 队列已满时是否等待（JSON Lines），否则立即返回503（HTTP）
+
+        Returns:
+            响应字典
+        """
+        start = time.perf_counter()
+        self.counters['requests'] += 1
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if isinstance(request, (bytes, str)) and len(request) > _LARGE_BODY:
+                prepared = await asyncio.to_thread(_prepare, request)
+            else:
+                prepared = _prepare(request)
+            request, data_text, graph_hash, size = prepared
+            request_id = request.get('id')
+            outputs, config, dpi = self._options(request)
+
+            key = hashlib.sha256(json.dumps([graph_hash, outputs, config, dpi], sort_keys=True,
+                                            default=str).encode('utf-8')).hexdigest()
+            lane = self.interactive if size <= self.small_graph_limit else self.bulk
+            result = await self._compute(key, lane, wait, data_text, outputs, config, dpi)
+        except ServiceBusy as e:
+            self.counters['rejected'] += 1
+            return {'id': request_id, 'ok': False, 'status': 503, 'error': str(e)}
+        except ValueError as e:
+            self.counters['failed'] += 1
+            return {'id': request_id, 'ok': False, 'status': 400, 'error': str(e)}
+        except Exception as e:
+            self.counters['failed'] += 1
+            return {'id': request_id, 'ok': False, 'status': 500, 'error': f"{type(e).__name__}: {e}"}
+
+        self.counters['completed'] += 1
+        return {'id': request_id, 'ok': True, 'hash': graph_hash, **result,
+                'elapsed': time.perf_counter() - start}
+
+    def _options(self, request: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any], int]:
+        """校验并规范化请求的输出、配置与分辨率"""
+        outputs = request.get('outputs', ['pagerank'])
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        if not isinstance(outputs, list) or not outputs:
+            raise ValueError("outputs必须是非空列表")
+        unknown = [name for name in outputs if name not in OUTPUTS]
+        if unknown:
+            raise ValueError(f"不支持的输出: {', '.join(map(str, unknown))}，可选: {', '.join(OUTPUTS)}")
+
+        overrides = request.get('config', {})
+        if not isinstance(overrides, dict):
+            raise ValueError("config必须是JSON对象")
+        forbidden = [name for name in overrides if name in SERVICE_ONLY_CONFIG]
+        if forbidden:
+            raise ValueError(f"请求不能设置配置项: {', '.join(forbidden)}")
+
+        dpi = request.get('dpi', self.dpi)
+        if not isinstance(dpi, int) or not 10 <= dpi <= 600:
+            raise ValueError("dpi必须是10到600之间的整数")
+        return sorted(set(outputs), key=OUTPUTS.index), {**self.config, **overrides}, dpi
+
+    async def _compute(self, key: str, lane: _Lane, wait: bool, *args: Any) -> Dict[str, Any]:
+        """查找结果LRU与进行中的计算，都没有时占用通道名额并提交到进程池"""
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.counters['cache_hits'] += 1
+            return self._results[key]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        await lane.acquire(wait)
+        # 等待名额期间其他相同的请求可能已经开始计算
+        future = self._inflight.get(key)
+        if future is not None:
+            lane.release()
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        executor = lane.executor
+        try:
+            try:
+                future = asyncio.ensure_future(loop.run_in_executor(executor, _run_job, *args))
+            except BrokenProcessPool:
+                # 进程池已失效，但失败请求的回调尚未执行替换
+                lane.replace_executor(executor)
+                executor = lane.executor
+                future = asyncio.ensure_future(loop.run_in_executor(executor, _run_job, *args))
+        except BaseException:
+            # 提交失败时不会注册完成回调，在这里归还名额
+            lane.release()
+            raise
+        self._inflight[key] = future
+
+        def finished(done: asyncio.Future) -> None:
+            lane.release()
+            del self._inflight[key]
+            if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+                lane.replace_executor(executor)
+            if self.cache_entries and not done.cancelled() and done.exception() is None:
+                self._results[key] = done.result()
+                while len(self._results) > self.cache_entries:
+                    self._results.popitem(last=False)
+
+        future.add_done_callback(finished)
+        # 客户端断开只取消等待，不取消可能被其他请求共享的计算
+        return await asyncio.shield(future)
+
+    async def serve_http(self, host: str = '127.0.0.1', port: int = 8765,
+                         max_request_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        启动HTTP服务并一直运行
+
+        POST /render 处理请求，GET /health 返回服务状态；支持keep-alive与CORS预检，
+        课程页面可以直接从浏览器调用。
+
+        Args:
+            host: 监听地址
+            port: 监听端口
+            max_request_bytes: 请求体大小上限
+        """
+        async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                while await self._http_exchange(reader, writer, max_request_bytes):
+                    pass
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def _http_exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             max_request_bytes: int) -> bool:
+        """处理连接上的一个HTTP请求，返回是否保持连接"""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return False
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            await self._http_respond(writer, 400, {'ok': False, 'error': '无效的请求行'}, False)
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+        length = int(headers.get('content-length') or 0)
+        if length > max_request_bytes:
+            await self._http_respond(writer, 413, {'ok': False, 'error': f'请求体超过 {max_request_bytes} 字节'}, False)
+            return False
+        body = await reader.readexactly(length) if length else b''
+
+        path = target.split('?', 1)[0]
+        if method == 'OPTIONS':
+            status, payload = 204, None
+        elif method == 'GET' and path == '/health':
+            status, payload = 200, {'ok': True, **self.stats()}
+        elif method == 'POST' and path == '/render':
+            payload = await self.handle(body)
+            status = 200 if payload['ok'] else payload['status']
+        else:
+            status, payload = 404, {'ok': False, 'error': f'未知的路径: {method} {path}'}
+        await self._http_respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    async def _http_respond(writer: asyncio.StreamWriter, status: int, payload: Optional[Dict[str, Any]],
+                            keep_alive: bool) -> None:
+        """写出JSON响应"""
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        headers = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            'Content-Type: application/json; charset=utf-8',
+            f'Content-Length: {len(body)}',
+            'Access-Control-Allow-Origin: *',
+            'Access-Control-Allow-Methods: GET, POST, OPTIONS',
+            'Access-Control-Allow-Headers: Content-Type',
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            headers.append('Retry-After: 1')
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve_stdio(self, stdin: Any = None, stdout: Any = None) -> None:
+        """
+        按JSON Lines协议处理标准输入中的请求，直到输入结束
+
+        响应按完成的先后写出（以id对应请求）；进行中的请求达到两条通道的名额之和时
+        暂停读取输入，由上游的管道缓冲区形成背压。
+
+        Args:
+            stdin: 二进制输入流，默认为标准输入
+            stdout: 二进制输出流，默认为标准输出
+        """
+        stdin = stdin or sys.stdin.buffer
+        stdout = stdout or sys.stdout.buffer
+        limit = asyncio.Semaphore(self.interactive.max_pending + self.bulk.max_pending)
+        tasks = set()
+
+        async def respond(line: bytes) -> None:
+            try:
+                response = await self.handle(line, wait=True)
+                stdout.write(json.dumps(response, ensure_ascii=False, default=str).encode('utf-8') + b'\n')
+                stdout.flush()
+            finally:
+                limit.release()
+
+        while True:
+            await limit.acquire()
+            # 普通文件与管道都可以在线程中阻塞读取
+            line = await asyncio.to_thread(stdin.readline)
+            if not line:
+                limit.release()
+                break
+            if not line.strip():
+                limit.release()
+                continue
+            task = asyncio.create_task(respond(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+    def close(self) -> None:
+        """关闭进程池"""
+        for lane in (self.interactive, self.bulk):
+            lane.executor.shutdown(cancel_futures=True)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """按命令行参数创建并运行服务"""
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+    service = RenderService(config, workers=args.workers, interactive_workers=args.interactive_workers,
+                            max_pending=args.max_pending, small_graph_limit=args.small_graph_limit,
+                            cache_entries=args.cache_entries, dpi=args.dpi)
+    try:
+        await service.start()
+        if args.stdio:
+            await service.serve_stdio()
+        else:
+            host, _, port = args.http.rpartition(':')
+            print(f"渲染服务监听 http://{host}:{port}（POST /render，GET /health）", file=sys.stderr, flush=True)
+            await service.serve_http(host, int(port), int(args.max_request_mb * 2 ** 20))
+    finally:
+        service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数，默认使用 sys.argv
+
+    Returns:
+        退出码
+    """
+    parser = argparse.ArgumentParser(description='本地PageRank渲染服务')
+    parser.add_argument('--http', default='127.0.0.1:8765', help='HTTP监听地址 host:port')
+    parser.add_argument('--stdio', action='store_true', help='改用stdin/stdout JSON Lines协议')
+    parser.add_argument('--config', default=None, help='渲染器基础配置JSON文件')
+    parser.add_argument('--workers', type=int, default=None, help='批量通道的进程数（默认CPU核心数）')
+    parser.add_argument('--interactive-workers', type=int, default=2, help='交互通道的进程数')
+    parser.add_argument('--max-pending', type=int, default=32, help='每条通道的待处理请求上限')
+    parser.add_argument('--small-graph-limit', type=int, default=5000, help='进入交互通道的节点数+边数上限')
+    parser.add_argument('--cache-entries', type=int, default=128, help='结果LRU的条目数')
+    parser.add_argument('--dpi', type=int, default=100, help='默认图像分辨率')
+    parser.add_argument('--max-request-mb', type=float, default=64, help='HTTP请求体大小上限（MB）')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
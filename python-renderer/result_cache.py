@@ -0,0 +1,281 @@
+"""
+结果缓存模块
+以内容寻址的方式在磁盘上缓存PageRank结果与布局，重复处理同一张图时直接读取
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from enum import Enum
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+_MAGIC = b'PRC1'
+_SUFFIX = '.prc'
+_DTYPES = {'f8': np.float64, 'f4': np.float32, 'i8': np.int64, 'u1': np.uint8}
+
+
+def graph_fingerprint(node_ids: List[Hashable], sources: np.ndarray, targets: np.ndarray,
+                      weights: Optional[np.ndarray] = None) -> Tuple[str, np.ndarray]:
+    """
+    计算图结构的规范哈希
+
+    节点按ID的repr排序、边按 (源, 目标) 排序后再哈希，因此与节点和边的
+    插入顺序无关；节点类型、标签等不影响PageRank与布局的属性不参与哈希。
+
+    Args:
+        node_ids: 节点ID列表
+        sources: 边的源节点索引
+        targets: 边的目标节点索引
+        weights: 边权重
+
+    Returns:
+        (十六进制哈希值, 规范顺序：第i个规范位置对应的原节点下标)
+    """
+    keys = [repr(node_id) for node_id in node_ids]
+    canonical = np.array(sorted(range(len(keys)), key=keys.__getitem__), dtype=np.int64)
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[canonical] = np.arange(len(keys))
+
+    src = rank[np.asarray(sources, dtype=np.int64)]
+    dst = rank[np.asarray(targets, dtype=np.int64)]
+    order = np.lexsort((dst, src))
+
+    digest = hashlib.sha256()
+    digest.update('\n'.join(keys[i] for i in canonical).encode('utf-8'))
+    digest.update(src[order].tobytes())
+    digest.update(dst[order].tobytes())
+    if weights is not None:
+        digest.update(np.asarray(weights, dtype=np.float64)[order].tobytes())
+    return digest.hexdigest(), canonical
+
+
+def array_fingerprint(*arrays: np.ndarray) -> str:
+    """
+    计算一组数组的哈希（包含形状与数据类型）
+
+    Args:
+        arrays: 参与哈希的数组
+
+    Returns:
+        十六进制哈希值
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode('ascii'))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def make_key(kind: str, fingerprint: str, params: Dict[str, Any]) -> str:
+    """
+    由结果类型、图哈希与相关配置生成缓存键
+
+    Args:
+        kind: 结果类型，如 'pagerank' 或 'layout'
+        fingerprint: 图结构哈希
+        params: 影响结果的配置项，Enum取其值
+
+    Returns:
+        缓存键（十六进制字符串）
+    """
+    normalized = {name: value.value if isinstance(value, Enum) else value
+                  for name, value in params.items()}
+    payload = json.dumps([kind, fingerprint, normalized], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    磁盘结果缓存
+
+    每个条目是一个紧凑的二进制文件，保存若干命名的数组；
+    按文件修改时间实现LRU，总大小超过上限时淘汰最久未使用的条目。
+    写入先落到临时文件再原子替换，多个进程可以共享同一个缓存目录。
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        初始化缓存
+
+        Args:
+            directory: 缓存目录，不存在时自动创建
+            max_bytes: 缓存总大小上限（字节）
+        """
+        if max_bytes <= 0:
+            raise ValueError("缓存大小上限必须为正数")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        """缓存键对应的文件路径"""
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        """列出全部条目的 (最后使用时间, 路径, 大小)"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        读取缓存条目
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            名称到数组的字典，未命中或文件损坏时返回None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            arrays = _decode(data)
+        except (OSError, KeyError, ValueError, struct.error):
+            self.misses += 1
+            return None
+
+        # 刷新修改时间作为LRU的最近使用时间
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return arrays
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        写入缓存条目，必要时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            arrays: 名称到数组的字典
+        """
+        data = _encode(arrays)
+        if len(data) > self.max_bytes:
+            return
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.writes += 1
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """按最后使用时间从旧到新删除条目，直到总大小不超过上限"""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def clear(self) -> None:
+        """删除全部缓存条目"""
+        for _, path, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取命中统计
+
+        Returns:
+            包含命中、未命中、写入、淘汰次数、命中率与当前大小的字典
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size_bytes': self._size
+        }
+
+
+def _encode(arrays: Dict[str, np.ndarray]) -> bytes:
+    """
+    编码为二进制：魔数、数组个数，然后依次为
+    名称长度、名称、数据类型、维数、各维长度与原始数据（小端）
+    """
+    parts = [_MAGIC, struct.pack('<I', len(arrays))]
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        code = array.dtype.str[1:]
+        if code not in _DTYPES:
+            raise ValueError(f"不支持缓存的数据类型: {array.dtype}")
+        encoded_name = name.encode('utf-8')
+        parts.append(struct.pack('<H', len(encoded_name)))
+        parts.append(encoded_name)
+        parts.append(code.encode('ascii'))
+        parts.append(struct.pack('<B', array.ndim))
+        parts.append(struct.pack(f'<{array.ndim}Q', *array.shape))
+        parts.append(array.astype(array.dtype.newbyteorder('<'), copy=False).tobytes())
+    return b''.join(parts)
+
+
+def _decode(data: bytes) -> Dict[str, np.ndarray]:
+    """解码 _encode 生成的二进制数据"""
+    if data[:4] != _MAGIC:
+        raise ValueError("缓存文件格式不正确")
+
+    (count,) = struct.unpack_from('<I', data, 4)
+    offset = 8
+    arrays = {}
+    for _ in range(count):
+        (name_length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        name = data[offset:offset + name_length].decode('utf-8')
+        offset += name_length
+        dtype = np.dtype(_DTYPES[data[offset:offset + 2].decode('ascii')]).newbyteorder('<')
+        (ndim,) = struct.unpack_from('<B', data, offset + 2)
+        shape = struct.unpack_from(f'<{ndim}Q', data, offset + 3)
+        offset += 3 + 8 * ndim
+        size = int(np.prod(shape)) * dtype.itemsize
+        if offset + size > len(data):
+            raise ValueError("缓存文件不完整")
+        arrays[name] = np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)),
+                                     offset=offset).reshape(shape).copy()
+        offset += size
+    return arrays
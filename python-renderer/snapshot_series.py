@@ -0,0 +1,235 @@
+"""
+快照序列渲染模块
+按顺序渲染同一代码库各个版本的图：节点按ID在相邻快照之间匹配，
+PageRank以上一快照的值为初始向量，布局以上一快照的位置热启动，只有新节点重新放置，
+每个快照输出一帧，布局在帧之间保持稳定
+
+用法:
+    python snapshot_series.py v1.json v2.json v3.json -o frames/ --config render.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from pagerank_renderer import PageRankRenderer
+
+
+# 新节点放置在已知邻居的质心附近，随机偏移相对布局范围的比例
+_JITTER = 0.02
+# 新节点沿边向外传播位置的最大轮数，仍未确定的节点随机放置
+_PROPAGATION_ROUNDS = 3
+
+
+def match_nodes(previous: PageRankRenderer, current: PageRankRenderer) -> np.ndarray:
+    """
+    按节点ID匹配两个快照的节点
+
+    Args:
+        previous: 上一快照的渲染器
+        current: 当前快照的渲染器
+
+    Returns:
+        长度为当前节点数的数组，元素为上一快照中同一ID节点的下标，新节点为-1
+    """
+    index = previous.store.index
+    return np.fromiter((index.get(node, -1) for node in current.store.node_ids),
+                       dtype=np.int64, count=current.store.num_nodes)
+
+
+def carry_positions(current: PageRankRenderer, previous_positions: np.ndarray, matched: np.ndarray,
+                    seed: int = 0) -> np.ndarray:
+    """
+    生成当前快照的初始位置：保留的节点沿用上一快照的位置，
+    新节点放在已确定位置的邻居的质心附近（沿边逐轮向外传播），没有这类邻居的新节点随机放置
+
+    Args:
+        current: 当前快照的渲染器
+        previous_positions: 上一快照 n_prev×2 的节点位置
+        matched: match_nodes 的结果
+        seed: 随机种子
+
+    Returns:
+        n×2 的初始位置
+    """
+    store = current.store
+    n = store.num_nodes
+    rng = np.random.default_rng(seed)
+    positions = np.zeros((n, 2))
+    known = matched >= 0
+    positions[known] = previous_positions[matched[known]]
+
+    if known.any():
+        low, high = positions[known].min(axis=0), positions[known].max(axis=0)
+    else:
+        low, high = np.full(2, -1.0), np.full(2, 1.0)
+    jitter = _JITTER * max(float((high - low).max()), 1e-9)
+
+    src, dst = store.src, store.dst
+    for _ in range(_PROPAGATION_ROUNDS):
+        if known.all():
+            break
+        # 一端已知、一端未知的边把已知端的位置贡献给未知端
+        forward = known[src] & ~known[dst]
+        backward = known[dst] & ~known[src]
+        targets = np.concatenate((dst[forward], src[backward]))
+        sources = np.concatenate((src[forward], dst[backward]))
+        count = np.bincount(targets, minlength=n)
+        placed = count > 0
+        if not placed.any():
+            break
+        for axis in range(2):
+            total = np.bincount(targets, weights=positions[sources, axis], minlength=n)
+            positions[placed, axis] = total[placed] / count[placed]
+        positions[placed] += rng.normal(scale=jitter, size=(int(placed.sum()), 2))
+        known |= placed
+
+    unknown = ~known
+    positions[unknown] = low + rng.random((int(unknown.sum()), 2)) * (high - low)
+    return positions
+
+
+class SnapshotSeries:
+    """
+    快照序列渲染器
+
+    每个快照使用新的渲染器加载，上一快照的渲染器只保留到当前快照完成热启动，
+    因此内存中最多同时存在两个快照。
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, warm_start: bool = True):
+        """
+        Args:
+            config: 渲染器配置
+            warm_start: 是否从上一快照热启动；关闭时每个快照独立计算，用于对比
+        """
+        self.config = dict(config or {})
+        self.warm_start = warm_start
+        self.previous: Optional[PageRankRenderer] = None
+        # 最近一个快照的节点在其上一快照中的下标（见 match_nodes），第一个快照为None
+        self.matched: Optional[np.ndarray] = None
+        self._previous_positions: Optional[np.ndarray] = None
+
+    def _load(self, snapshot: Union[str, Dict[str, Any]]) -> PageRankRenderer:
+        """加载快照文件（.json、.json.gz 或 .prg）或JSON字典"""
+        renderer = PageRankRenderer(self.config)
+        if isinstance(snapshot, dict):
+            renderer.load_json_from_dict(snapshot)
+        elif snapshot.endswith('.prg'):
+            renderer.load_binary(snapshot)
+        else:
+            renderer.load_json(snapshot)
+        return renderer
+
+    def advance(self, snapshot: Union[str, Dict[str, Any]]) -> PageRankRenderer:
+        """
+        加载下一个快照并计算PageRank与布局
+
+        Args:
+            snapshot: 快照文件路径或JSON字典
+
+        Returns:
+            已计算PageRank与布局的渲染器
+        """
+        renderer = self._load(snapshot)
+        matched = match_nodes(self.previous, renderer) if self.previous is not None else None
+        if self.warm_start and matched is not None:
+            kept = matched >= 0
+
+            # 新节点的初始值取均匀分布，求解器会重新归一化
+            x0 = np.full(renderer.store.num_nodes, 1.0 / max(renderer.store.num_nodes, 1))
+            x0[kept] = self.previous.pagerank_values.array[matched[kept]]
+            renderer.calculate_pagerank(x0=x0)
+            renderer.apply_layout(carry_positions(renderer, self._previous_positions, matched,
+                                                  seed=renderer.config['layout_seed']))
+        else:
+            renderer.calculate_pagerank()
+            renderer.apply_layout()
+
+        self.previous = renderer
+        self.matched = matched
+        self._previous_positions = np.array([renderer.node_positions[node] for node in renderer.store.node_ids],
+                                            dtype=np.float64).reshape(-1, 2)
+        return renderer
+
+    def render(self, snapshots: Sequence[Union[str, Dict[str, Any]]], output_dir: str,
+               output_format: Optional[str] = None, dpi: int = 150,
+               names: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        依次渲染全部快照，每个快照输出一帧 frame-NNNN.{format}
+
+        Args:
+            snapshots: 按时间顺序排列的快照文件路径或JSON字典
+            output_dir: 输出目录
+            output_format: 图像格式，默认取配置中的output_format
+            dpi: 图像分辨率
+            names: 各快照在标题中显示的名称，默认为文件名或序号
+
+        Returns:
+            每一帧的统计：输出文件、节点数、新增与删除的节点数、PageRank迭代次数与各阶段耗时
+        """
+        output_format = output_format or self.config.get('output_format', 'png')
+        frames = []
+        for k, snapshot in enumerate(snapshots):
+            if names is not None:
+                name = names[k]
+            elif isinstance(snapshot, str):
+                name = os.path.basename(snapshot)
+            else:
+                name = str(k + 1)
+
+            previous_nodes = self.previous.store.num_nodes if self.previous is not None else 0
+            start = time.perf_counter()
+            renderer = self.advance(snapshot)
+            computed = time.perf_counter()
+            matched = int(np.count_nonzero(self.matched >= 0)) if self.matched is not None else None
+
+            renderer.config['title'] = f"{renderer.config['title']} - {name}"
+            output = os.path.join(output_dir, f"frame-{k:04d}.{output_format}")
+            renderer.export(output, dpi=dpi)
+            frames.append({
+                'snapshot': name,
+                'output': output,
+                'nodes': renderer.store.num_nodes,
+                'added': renderer.store.num_nodes - matched if matched is not None else None,
+                'removed': previous_nodes - matched if matched is not None else None,
+                'iterations': renderer.pagerank_values.iterations,
+                'compute_time': computed - start,
+                'render_time': time.perf_counter() - computed
+            })
+        return frames
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='按顺序渲染图快照序列，布局与PageRank从上一快照热启动')
+    parser.add_argument('snapshots', nargs='+', help='按时间顺序排列的图文件（.json、.json.gz 或 .prg）')
+    parser.add_argument('-o', '--output-dir', required=True, help='输出目录')
+    parser.add_argument('--config', default=None, help='渲染器配置JSON文件')
+    parser.add_argument('--format', default=None, help='输出格式: png, svg, pdf（默认取配置中的output_format）')
+    parser.add_argument('--dpi', type=int, default=150, help='图像分辨率')
+    parser.add_argument('--cold', action='store_true', help='每个快照独立计算，不热启动')
+    args = parser.parse_args(argv)
+
+    from batch_render import load_config
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+    series = SnapshotSeries(load_config(config), warm_start=not args.cold)
+    for frame in series.render(args.snapshots, args.output_dir, args.format, args.dpi):
+        changes = '' if frame['added'] is None else f"，新增 {frame['added']}，删除 {frame['removed']}"
+        print(f"{frame['snapshot']} -> {frame['output']}：{frame['nodes']} 个节点{changes}，"
+              f"PageRank迭代 {frame['iterations']} 次，计算 {frame['compute_time']:.2f}s，"
+              f"绘制 {frame['render_time']:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""
+稀疏矩阵工具模块
+以CSR格式保存邻接结构与转移矩阵，避免构造稠密的n×n矩阵
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+_scipy_sparse = None
+
+
+def _get_scipy_sparse() -> Any:
+    """惰性导入可选的scipy.sparse，未安装时返回None"""
+    global _scipy_sparse
+    if _scipy_sparse is None:
+        try:
+            import scipy.sparse
+            _scipy_sparse = scipy.sparse
+        except ImportError:
+            _scipy_sparse = False
+    return _scipy_sparse or None
+
+
+def _as_index_array(values: Any) -> np.ndarray:
+    """转换为整数下标数组，已是int32/int64的数组（如内存映射的数组）直接使用而不复制"""
+    if isinstance(values, np.ndarray) and values.dtype in (np.int32, np.int64):
+        return values
+    return np.asarray(values, dtype=np.int64)
+
+
+class CSRMatrix:
+    """CSR（压缩稀疏行）格式矩阵，仅依赖NumPy"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                 shape: Tuple[int, int]):
+        """
+        初始化CSR矩阵
+
+        Args:
+            indptr: 行偏移数组，长度为行数+1，int32或int64数组不会被复制
+            indices: 列索引数组，int32或int64数组不会被复制
+            data: 非零元素值数组
+            shape: 矩阵形状 (行数, 列数)
+        """
+        self.indptr = _as_index_array(indptr)
+        self.indices = _as_index_array(indices)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._row_ids = None
+        self._native = None
+
+        if len(self.indptr) != self.shape[0] + 1:
+            raise ValueError("indptr长度必须等于行数+1")
+        if len(self.indices) != len(self.data):
+            raise ValueError("indices与data长度不一致")
+
+    @classmethod
+    def from_edges(cls, sources: Iterable[int], targets: Iterable[int], num_nodes: int,
+                   weights: Optional[Iterable[float]] = None) -> 'CSRMatrix':
+        """
+        从边列表构建CSR矩阵，重复边的权重会被累加
+
+        Args:
+            sources: 边的源节点索引
+            targets: 边的目标节点索引
+            num_nodes: 节点数量
+            weights: 边权重，默认为1
+
+        Returns:
+            CSR矩阵
+        """
+        src = np.asarray(sources, dtype=np.int64)
+        dst = np.asarray(targets, dtype=np.int64)
+        if weights is None:
+            w = np.ones(len(src), dtype=np.float64)
+        else:
+            w = np.asarray(weights, dtype=np.float64)
+
+        if len(src) != len(dst) or len(src) != len(w):
+            raise ValueError("sources、targets与weights长度不一致")
+        if len(src) and (src.min() < 0 or dst.min() < 0
+                         or src.max() >= num_nodes or dst.max() >= num_nodes):
+            raise ValueError("边的节点索引超出范围")
+
+        # 按(源, 目标)排序后合并重复边
+        order = np.lexsort((dst, src))
+        src, dst, w = src[order], dst[order], w[order]
+        if len(src):
+            keys = src * num_nodes + dst
+            first = np.concatenate(([True], keys[1:] != keys[:-1]))
+            starts = np.flatnonzero(first)
+            w = np.add.reduceat(w, starts)
+            src, dst = src[starts], dst[starts]
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, dst, w, (num_nodes, num_nodes))
+
+    @classmethod
+    def from_dense(cls, matrix: np.ndarray) -> 'CSRMatrix':
+        """
+        从稠密矩阵构建CSR矩阵
+
+        Args:
+            matrix: 稠密二维数组
+
+        Returns:
+            CSR矩阵
+        """
+        matrix = np.asarray(matrix)
+        rows, cols = np.nonzero(matrix)
+        indptr = np.zeros(matrix.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=matrix.shape[0]), out=indptr[1:])
+        return cls(indptr, cols, matrix[rows, cols], matrix.shape)
+
+    @property
+    def nnz(self) -> int:
+        """非零元素数量"""
+        return len(self.data)
+
+    @property
+    def row_ids(self) -> np.ndarray:
+        """每个非零元素所在的行索引（惰性计算并缓存）"""
+        if self._row_ids is None:
+            self._row_ids = np.repeat(np.arange(self.shape[0], dtype=np.int64),
+                                      np.diff(self.indptr))
+        return self._row_ids
+
+    @property
+    def native(self) -> Any:
+        """
+        共享同一组数组的scipy.sparse矩阵（惰性创建），未安装scipy时为None
+
+        Returns:
+            scipy CSR矩阵或None
+        """
+        if self._native is None:
+            sp = _get_scipy_sparse()
+            if sp is None:
+                self._native = False
+            else:
+                self._native = sp.csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+        return self._native if self._native is not False else None
+
+    def row_sums(self) -> np.ndarray:
+        """
+        计算每一行的元素和
+
+        Returns:
+            行和数组（float64；没有元素时bincount返回整数数组，这里统一转换）
+        """
+        return np.bincount(self.row_ids, weights=self.data, minlength=self.shape[0]).astype(np.float64)
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        """
+        计算矩阵与向量（或列矩阵）的乘积 A·x
+
+        安装了scipy时使用其编译的稀疏乘法内核，否则使用NumPy实现。
+
+        Args:
+            x: 长度为列数的向量，或形状为(列数, k)的矩阵
+
+        Returns:
+            乘积结果
+        """
+        native = self.native
+        if native is not None:
+            return native @ x
+
+        if x.ndim == 1:
+            return np.bincount(self.row_ids, weights=self.data * x[self.indices],
+                               minlength=self.shape[0])
+        # 多列输入按行分段归约，空行需跳过以免reduceat取到相邻段
+        out = np.zeros((self.shape[0], x.shape[1]))
+        nonempty = np.diff(self.indptr) > 0
+        if self.nnz:
+            products = self.data[:, None] * x[self.indices]
+            out[nonempty] = np.add.reduceat(products, self.indptr[:-1][nonempty], axis=0)
+        return out
+
+    def transpose_dot(self, x: np.ndarray) -> np.ndarray:
+        """
+        计算转置矩阵与向量（或列矩阵）的乘积 Aᵀ·x
+
+        Args:
+            x: 长度为行数的向量，或形状为(行数, k)的矩阵
+
+        Returns:
+            乘积结果
+        """
+        native = self.native
+        if native is not None:
+            return native.T @ x
+
+        if x.ndim == 1:
+            return np.bincount(self.indices, weights=self.data * x[self.row_ids],
+                               minlength=self.shape[1])
+        return np.column_stack([
+            np.bincount(self.indices, weights=self.data * x[self.row_ids, j],
+                        minlength=self.shape[1])
+            for j in range(x.shape[1])
+        ])
+
+    def transpose(self) -> 'CSRMatrix':
+        """
+        返回转置矩阵（即原矩阵的CSC表示）
+
+        Returns:
+            转置后的CSR矩阵
+        """
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=indptr[1:])
+        return CSRMatrix(indptr, self.row_ids[order], self.data[order],
+                         (self.shape[1], self.shape[0]))
+
+    def toarray(self) -> np.ndarray:
+        """
+        转换为稠密矩阵，仅用于小图调试
+
+        Returns:
+            稠密二维数组
+        """
+        dense = np.zeros(self.shape)
+        dense[self.row_ids, self.indices] = self.data
+        return dense
+
+
+def resolve_threads(threads: Optional[int]) -> int:
+    """
+    规范化线程数配置
+
+    Args:
+        threads: 线程数，None或0表示使用全部CPU核心
+
+    Returns:
+        至少为1的线程数
+    """
+    if not threads:
+        return os.cpu_count() or 1
+    if threads < 0:
+        raise ValueError("线程数不能为负数")
+    return int(threads)
+
+
+class _RowBlock:
+    """ParallelCSR的一个行块及其预分配的缓冲区"""
+
+    def __init__(self, matrix: CSRMatrix, row_start: int, row_end: int):
+        self.row_start = row_start
+        self.row_end = row_end
+        self.start = int(matrix.indptr[row_start])
+        self.end = int(matrix.indptr[row_end])
+        self.indices = matrix.indices[self.start:self.end]
+        self.data = matrix.data[self.start:self.end]
+
+        # 非空行在块内的下标与各行在乘积缓冲区中的起点；reduceat对空区间会取到
+        # 相邻元素，因此只对非空行归约，没有空行时直接归约到输出切片
+        counts = np.diff(matrix.indptr[row_start:row_end + 1])
+        self.rows = np.flatnonzero(counts > 0)
+        self.offsets = (matrix.indptr[row_start:row_end][self.rows] - self.start).astype(np.intp)
+        self.dense = len(self.rows) == row_end - row_start
+        self.products = np.empty(self.end - self.start)
+        self.sums = np.empty(0 if self.dense else len(self.rows))
+        self.scratch = np.empty(row_end - row_start)
+
+
+class ParallelCSR:
+    """
+    按行分块、在线程池中并行计算的CSR矩阵向量乘
+
+    行按 非零元数 + 行数 均匀划分为若干块，每块依次用 np.take、np.multiply
+    与 np.add.reduceat 计算（均为释放GIL的NumPy内核），全部写入构造时预分配的
+    缓冲区与调用方提供的输出向量，迭代过程中不再分配内存。
+    """
+
+    def __init__(self, matrix: CSRMatrix, threads: Optional[int] = None, blocks: Optional[int] = None):
+        """
+        划分行块并创建线程池
+
+        Args:
+            matrix: CSR矩阵，通常为转置后的转移矩阵（按目标节点分行）
+            threads: 线程数，None或0表示使用全部CPU核心
+            blocks: 行块数量，默认为线程数的2倍以平衡负载
+        """
+        self.matrix = matrix
+        self.shape = matrix.shape
+        self.threads = resolve_threads(threads)
+        num_blocks = max(1, min(blocks or 2 * self.threads, matrix.shape[0] or 1))
+
+        rows = matrix.shape[0]
+        cost = matrix.indptr + np.arange(rows + 1)
+        bounds = np.searchsorted(cost, np.linspace(0, cost[-1], num_blocks + 1), side='left')
+        bounds[0], bounds[-1] = 0, rows
+        bounds = np.unique(bounds)
+        self.blocks: List[_RowBlock] = [
+            _RowBlock(matrix, int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        self._pool = ThreadPoolExecutor(self.threads) if self.threads > 1 and len(self.blocks) > 1 else None
+
+    def _multiply_block(self, block: _RowBlock, x: np.ndarray, out: np.ndarray, scale: float,
+                        offset: float, vector: Optional[np.ndarray]) -> None:
+        """计算一个行块：out[块] = scale · (A·x)[块] + offset · vector[块]"""
+        target = out[block.row_start:block.row_end]
+        if block.end == block.start:
+            target.fill(0.0)
+        else:
+            products = block.products
+            np.take(x, block.indices, out=products, mode='clip')
+            np.multiply(products, block.data, out=products)
+            if block.dense:
+                np.add.reduceat(products, block.offsets, out=target)
+            else:
+                target.fill(0.0)
+                np.add.reduceat(products, block.offsets, out=block.sums)
+                target[block.rows] = block.sums
+
+        if scale != 1.0:
+            np.multiply(target, scale, out=target)
+        if vector is not None:
+            np.multiply(vector[block.row_start:block.row_end], offset, out=block.scratch)
+            np.add(target, block.scratch, out=target)
+        elif offset:
+            np.add(target, offset, out=target)
+
+    def dot(self, x: np.ndarray, out: Optional[np.ndarray] = None, scale: float = 1.0,
+            offset: float = 0.0, vector: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        计算 out = scale · A·x + offset · vector（vector为None时加常数offset）
+
+        Args:
+            x: 长度为列数的float64向量
+            out: 长度为行数的输出向量，不能与x共享内存；默认新分配
+            scale: 乘积的系数
+            offset: 常数项或vector的系数
+            vector: 长度为行数的向量
+
+        Returns:
+            输出向量
+        """
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        if out is None:
+            out = np.empty(self.shape[0])
+        if self._pool is None:
+            for block in self.blocks:
+                self._multiply_block(block, x, out, scale, offset, vector)
+        else:
+            futures = [self._pool.submit(self._multiply_block, block, x, out, scale, offset, vector)
+                       for block in self.blocks]
+            for future in futures:
+                future.result()
+        return out
+
+    def close(self) -> None:
+        """关闭线程池"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def as_csr(adjacency: Any, num_nodes: Optional[int] = None) -> CSRMatrix:
+    """
+    将多种邻接表示统一转换为CSR矩阵
+
+    支持CSRMatrix、带indptr/indices/data属性的稀疏矩阵（如scipy.sparse.csr_matrix）、
+    稠密二维数组，以及由(source, target)或(source, target, weight)元组组成的边列表。
+
+    Args:
+        adjacency: 邻接结构
+        num_nodes: 节点数量，边列表输入时若未提供则取最大索引+1
+
+    Returns:
+        CSR矩阵
+    """
+    if isinstance(adjacency, CSRMatrix):
+        return adjacency
+
+    if hasattr(adjacency, 'indptr') and hasattr(adjacency, 'indices'):
+        return CSRMatrix(adjacency.indptr, adjacency.indices, adjacency.data, adjacency.shape)
+
+    # 二维数组视为稠密邻接矩阵，与稠密路径的输入保持一致
+    if isinstance(adjacency, np.ndarray):
+        return CSRMatrix.from_dense(adjacency)
+
+    edges = np.asarray(list(adjacency), dtype=np.float64)
+    if edges.size == 0:
+        edges = edges.reshape(0, 2)
+    if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+        raise ValueError("边列表的每一项必须是(source, target)或(source, target, weight)")
+
+    sources = edges[:, 0].astype(np.int64)
+    targets = edges[:, 1].astype(np.int64)
+    weights = edges[:, 2] if edges.shape[1] == 3 else None
+    if num_nodes is None:
+        num_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1)) + 1)
+    return CSRMatrix.from_edges(sources, targets, num_nodes, weights)
+
+
+def build_transition(adjacency: Any, num_nodes: Optional[int] = None) -> Tuple[CSRMatrix, np.ndarray]:
+    """
+    构建稀疏的行随机转移矩阵
+
+    悬挂节点（出度为0）对应的行保持为空，由返回的布尔掩码在迭代时
+    以秩一修正的方式处理，而不是物化为 1/n 的稠密行。
+
+    Args:
+        adjacency: 邻接结构，参见 as_csr
+        num_nodes: 节点数量
+
+    Returns:
+        (转移矩阵, 悬挂节点掩码)
+    """
+    csr = as_csr(adjacency, num_nodes)
+    out_weights = csr.row_sums()
+    dangling = out_weights == 0
+
+    scale = np.zeros(csr.shape[0], dtype=np.float64)
+    np.divide(1.0, out_weights, out=scale, where=~dangling)
+    transition = CSRMatrix(csr.indptr, csr.indices, csr.data * scale[csr.row_ids], csr.shape)
+    return transition, dangling
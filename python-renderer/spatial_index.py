@@ -0,0 +1,162 @@
+"""
+空间索引模块
+线性松散四叉树：每个元素按包围盒大小放入能容纳它的最深层级，按所在网格单元的
+Morton编码排序；矩形查询在每一层只需几次二分查找，更深的层级是连续的编码区间
+"""
+
+import math
+import numpy as np
+from typing import Optional, Sequence
+
+
+# 每个坐标最多使用的位数，层级不超过该值
+MAX_LEVEL = 20
+
+_SPREAD_STEPS = ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                 (2, 0x3333333333333333), (1, 0x5555555555555555))
+
+# 查询范围在某一层覆盖的网格单元超过该数量时，更深的层级改用祖先单元的编码区间
+_ENUMERATE_LIMIT = 16
+
+
+def morton_encode(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    把网格坐标交错为Morton编码（x占偶数位，y占奇数位）
+
+    Args:
+        x: 非负整数网格坐标
+        y: 非负整数网格坐标
+
+    Returns:
+        int64编码数组
+    """
+    def spread(v: np.ndarray) -> np.ndarray:
+        v = np.asarray(v, dtype=np.uint64) & np.uint64(0xFFFFFFFF)
+        for shift, mask in _SPREAD_STEPS:
+            v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+        return v
+
+    return (spread(x) | (spread(y) << np.uint64(1))).astype(np.int64)
+
+
+def _morton(x: int, y: int) -> int:
+    """单个网格坐标的Morton编码，查询时只需少量编码，避免数组运算的开销"""
+    result = []
+    for v in (x, y):
+        for shift, mask in _SPREAD_STEPS:
+            v = (v | (v << shift)) & mask
+        result.append(v)
+    return result[0] | (result[1] << 1)
+
+
+class QuadtreeIndex:
+    """
+    静态矩形元素的空间索引
+
+    元素放在边长不小于其包围盒的最深层级，以包围盒左下角所在的网格单元为键，
+    因此它最多覆盖该层相邻的2×2个单元。查询时在浅层枚举查询范围（向左下扩展
+    一个单元）内的单元，在深层取浅层单元的全部后代，得到的候选再按包围盒精确过滤。
+    """
+
+    def __init__(self, boxes: np.ndarray, bounds: Optional[Sequence[float]] = None,
+                 max_level: int = MAX_LEVEL):
+        """
+        构建索引
+
+        Args:
+            boxes: m×4 的包围盒数组 (xmin, ymin, xmax, ymax)
+            bounds: 索引覆盖的范围 (xmin, ymin, xmax, ymax)，默认取全部包围盒的范围；
+                超出范围的元素放在最浅层
+            max_level: 最大层级
+        """
+        if not 0 <= max_level <= MAX_LEVEL:
+            raise ValueError(f"max_level必须在0到{MAX_LEVEL}之间")
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.boxes = boxes
+        self.max_level = max_level
+
+        if bounds is None:
+            bounds = (boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max()) \
+                if len(boxes) else (0.0, 0.0, 1.0, 1.0)
+        self.origin = np.array(bounds[:2], dtype=np.float64)
+        self.size = max(bounds[2] - bounds[0], bounds[3] - bounds[1], 1e-12)
+
+        # 层级：能容纳包围盒最长边的最深层级，超出范围的元素放在第0层
+        extent = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+        with np.errstate(divide='ignore'):
+            levels = np.floor(np.log2(self.size / np.maximum(extent, 0.0)))
+        levels = np.clip(np.nan_to_num(levels, posinf=max_level), 0, max_level).astype(np.int64)
+        low = (boxes[:, :2] - self.origin) / self.size
+        outside = (low < 0).any(axis=1) | (boxes[:, 2:] > self.origin + self.size).any(axis=1)
+        levels[outside] = 0
+
+        cells = np.floor(low * (1 << levels)[:, None])
+        cells = np.clip(cells, 0, ((1 << levels) - 1)[:, None]).astype(np.int64)
+        codes = morton_encode(cells[:, 0], cells[:, 1])
+
+        order = np.lexsort((codes, levels))
+        self.order = order
+        self.codes = codes[order]
+        self.level_start = np.searchsorted(levels[order], np.arange(max_level + 2))
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def query(self, xmin: float, ymin: float, xmax: float, ymax: float) -> np.ndarray:
+        """
+        查询与矩形相交的元素
+
+        Args:
+            xmin: 矩形左边界
+            ymin: 矩形下边界
+            xmax: 矩形右边界
+            ymax: 矩形上边界
+
+        Returns:
+            相交元素的下标（升序）
+        """
+        if len(self.boxes) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        x0, y0 = self.origin.tolist()
+        low = ((xmin - x0) / self.size, (ymin - y0) / self.size)
+        high = ((xmax - x0) / self.size, (ymax - y0) / self.size)
+        begins, ends = [], []
+        anchor = None
+        for level in range(self.max_level + 1):
+            start, stop = int(self.level_start[level]), int(self.level_start[level + 1])
+            if anchor is None:
+                # 元素只会向右上越过所在单元，查询范围向左下扩展一个单元
+                n = 1 << level
+                first = [min(max(math.floor(v * n) - 1, 0), n - 1) for v in low]
+                last = [min(max(math.floor(v * n), 0), n - 1) for v in high]
+                enumerate_all = (last[0] - first[0] + 1) * (last[1] - first[1] + 1) > _ENUMERATE_LIMIT
+                if stop == start and not enumerate_all:
+                    continue
+                keys = np.array(sorted(_morton(x, y) for x in range(first[0], last[0] + 1)
+                                       for y in range(first[1], last[1] + 1)), dtype=np.int64)
+                lows, highs = keys, keys + 1
+                if enumerate_all:
+                    anchor = (level, keys)
+            elif stop > start:
+                # 更深的层级：祖先单元的后代在Morton顺序中是连续区间
+                shift = 2 * (level - anchor[0])
+                lows, highs = anchor[1] << shift, (anchor[1] + 1) << shift
+            if stop > start:
+                codes = self.codes[start:stop]
+                begins.append(start + np.searchsorted(codes, lows))
+                ends.append(start + np.searchsorted(codes, highs))
+
+        if not begins:
+            return np.empty(0, dtype=np.int64)
+        begin, end = np.concatenate(begins), np.concatenate(ends)
+        counts = end - begin
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        # 把各区间 [begin, end) 展开为连续的下标
+        offsets = np.repeat(begin - np.cumsum(counts) + counts, counts)
+        candidates = self.order[offsets + np.arange(total)]
+        boxes = self.boxes[candidates]
+        hit = (boxes[:, 0] <= xmax) & (boxes[:, 2] >= xmin) & (boxes[:, 1] <= ymax) & (boxes[:, 3] >= ymin)
+        return np.sort(candidates[hit])
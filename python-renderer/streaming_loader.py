@@ -0,0 +1,251 @@
+"""
+流式JSON加载模块
+逐个元素解析graph.nodes与graph.edges并直接送入图构建器，不保留完整文档
+"""
+
+import gzip
+import io
+import json
+from typing import Any, Dict, IO, Iterator, Optional
+
+from graph_store import GraphStoreBuilder
+
+
+_WHITESPACE = ' \t\n\r'
+
+
+def open_json_file(file_path: str) -> IO[str]:
+    """
+    以文本方式打开JSON文件，gzip压缩的文件（按文件头识别）会被透明解压
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        文本文件对象
+    """
+    with open(file_path, 'rb') as f:
+        magic = f.read(2)
+
+    if magic == b'\x1f\x8b':
+        return gzip.open(file_path, 'rt', encoding='utf-8')
+    return io.open(file_path, 'r', encoding='utf-8')
+
+
+class JSONStreamReader:
+    """
+    增量JSON读取器
+
+    在有界的文本缓冲区上工作：结构字符逐个读取，
+    完整的值（如单个节点字典）使用 json.JSONDecoder.raw_decode 解析。
+    """
+
+    def __init__(self, fp: IO[str], chunk_size: int = 1 << 16):
+        """
+        初始化读取器
+
+        Args:
+            fp: 文本文件对象
+            chunk_size: 每次读取的字符数
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """读取更多文本到缓冲区，已到文件末尾时返回False"""
+        if self.eof:
+            return False
+
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        # 丢弃已消费的部分，保持缓冲区大小有界
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        """构造带位置信息的解析错误"""
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """
+        跳过空白并返回下一个字符，文件结束时返回空字符串
+
+        Returns:
+            下一个非空白字符
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """
+        读取指定的结构字符
+
+        Args:
+            char: 期望的字符
+        """
+        if self.peek() != char:
+            raise self._error(f"期望字符 {char!r}")
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        """
+        读取一个完整的JSON值
+
+        Returns:
+            解析后的Python对象
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+
+            # 数字等值恰好结束在缓冲区末尾时可能尚未读完整
+            if end == len(self.buffer) and self._fill(size):
+                continue
+
+            self.pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        逐个产出对象的键，调用方须在下一次迭代前消费对应的值
+
+        Returns:
+            键的迭代器
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            if self.peek() != '"':
+                raise self._error("对象的键必须是字符串")
+            key = self.read_value()
+            self.expect(':')
+            yield key
+
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise self._error("对象成员之间缺少逗号")
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        逐个产出数组元素
+
+        Returns:
+            元素的迭代器
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.read_value()
+
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise self._error("数组元素之间缺少逗号")
+
+
+def stream_graph(fp: IO[str], builder: GraphStoreBuilder, chunk_size: int = 1 << 16) -> Optional[Dict[str, Any]]:
+    """
+    流式解析图JSON并送入构建器
+
+    文档结构与 PageRankRenderer.load_json 接受的格式相同；
+    metadata 会被完整读取并返回，graph.nodes 与 graph.edges 逐个元素校验并添加，
+    其他字段被跳过。
+
+    Args:
+        fp: 文本文件对象
+        builder: 图构建器
+        chunk_size: 每次读取的字符数
+
+    Returns:
+        metadata字段的值（与 load_json_from_dict 一致，可以为None）
+    """
+    reader = JSONStreamReader(fp, chunk_size)
+    if reader.peek() != '{':
+        if reader.peek() in ('', 'n'):
+            raise ValueError("JSON数据为空")
+        raise ValueError("JSON数据格式不正确，缺少metadata或graph字段")
+
+    metadata = None
+    has_metadata = has_graph = has_nodes = has_edges = False
+
+    for key in reader.iter_object():
+        if key == 'metadata':
+            has_metadata = True
+            metadata = reader.read_value()
+        elif key == 'graph':
+            has_graph = True
+            if reader.peek() != '{':
+                raise ValueError("JSON数据格式不正确，graph必须是对象")
+            for graph_key in reader.iter_object():
+                if graph_key == 'nodes':
+                    has_nodes = True
+                    _stream_nodes(reader, builder)
+                elif graph_key == 'edges':
+                    has_edges = True
+                    _stream_edges(reader, builder)
+                else:
+                    reader.read_value()
+        else:
+            reader.read_value()
+
+    if reader.peek() != '':
+        raise reader._error("文档末尾存在多余内容")
+    if not has_metadata or not has_graph:
+        raise ValueError("JSON数据格式不正确，缺少metadata或graph字段")
+    if not has_nodes or not has_edges:
+        raise ValueError("JSON数据格式不正确，graph中缺少nodes或edges字段")
+
+    return metadata
+
+
+def _stream_nodes(reader: JSONStreamReader, builder: GraphStoreBuilder) -> None:
+    """逐个校验并添加节点"""
+    if reader.peek() != '[':
+        raise ValueError("nodes和edges必须是列表")
+
+    for i, node_data in enumerate(reader.iter_array()):
+        if not isinstance(node_data, dict) or 'id' not in node_data:
+            raise ValueError(f"第{i}个节点格式不正确，缺少id字段")
+        builder.add_node_record(node_data)
+
+
+def _stream_edges(reader: JSONStreamReader, builder: GraphStoreBuilder) -> None:
+    """逐个校验并添加边"""
+    if reader.peek() != '[':
+        raise ValueError("nodes和edges必须是列表")
+
+    for i, edge_data in enumerate(reader.iter_array()):
+        if not isinstance(edge_data, dict) or 'source' not in edge_data or 'target' not in edge_data:
+            raise ValueError(f"第{i}条边格式不正确，缺少source或target字段")
+        builder.add_edge_record(edge_data)
@@ -0,0 +1,373 @@
+"""
+瓦片金字塔导出模块
+把节点位置与样式数组切分为多分辨率的 z/x/y 瓦片（与Leaflet、OpenLayers的XYZ瓦片约定一致），
+每个瓦片只绘制空间索引查询到的相交元素，瓦片在工作进程中并行绘制，单个瓦片的内存占用有界
+
+用法:
+    python tile_export.py graph.prg tiles/ --workers 8 --max-zoom 7 --config render.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from spatial_index import QuadtreeIndex
+
+
+TILE_MANIFEST = 'tiles.json'
+
+# 每个瓦片四周额外查询的像素数，覆盖低层级中被放大到最小可见尺寸的节点与线条
+_QUERY_PADDING = 4.0
+# 低层级的最小节点直径与线宽（像素），避免元素缩小到不可见
+_MIN_NODE_DIAMETER = 1.0
+_MIN_EDGE_WIDTH = 0.25
+# 弧线每个分段的目标长度（像素）
+_SEGMENT_PIXELS = 12.0
+
+# 工作进程内的瓦片绘制器，由 _init_worker 创建
+_worker = None
+
+
+def default_max_zoom(num_nodes: int, nodes_per_tile: int = 64, limit: int = 12) -> int:
+    """
+    按节点数估计最大层级：最深一层的瓦片平均包含约 nodes_per_tile 个节点
+
+    Args:
+        num_nodes: 节点数量
+        nodes_per_tile: 最深一层每个瓦片的平均节点数
+        limit: 层级上限
+
+    Returns:
+        最大层级
+    """
+    if num_nodes <= nodes_per_tile:
+        return 0
+    return min(limit, math.ceil(math.log(num_nodes / nodes_per_tile, 4)))
+
+
+class TileScene:
+    """
+    瓦片绘制所需的全部数据：节点位置、样式数组与空间索引
+
+    节点大小与线宽以最深一层的像素为单位，较浅的层级按 2^(z - max_zoom) 等比缩小，
+    因此元素在世界坐标中的大小不随层级变化，同一个空间索引适用于全部层级。
+    """
+
+    def __init__(self, positions: np.ndarray, node_sizes: np.ndarray, node_colors: np.ndarray,
+                 sources: np.ndarray, targets: np.ndarray, edge_widths: np.ndarray,
+                 max_zoom: int, tile_size: int = 256, rad: float = 0.1, arrowsize: float = 20.0):
+        """
+        Args:
+            positions: n×2 的节点位置
+            node_sizes: 节点面积（最深一层的像素²，与scatter的s含义相同）
+            node_colors: n×4 的RGBA颜色
+            sources: 边的源节点索引
+            targets: 边的目标节点索引
+            edge_widths: 每条边的线宽（最深一层的像素）
+            max_zoom: 最大层级
+            tile_size: 瓦片边长（像素）
+            rad: 边的弧度系数
+            arrowsize: 箭头大小（最深一层的像素）
+        """
+        if tile_size <= 0:
+            raise ValueError("tile_size必须为正数")
+        if max_zoom < 0:
+            raise ValueError("max_zoom不能为负数")
+
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.node_sizes = np.broadcast_to(np.asarray(node_sizes, dtype=np.float64), (len(self.positions),))
+        self.node_colors = np.asarray(node_colors, dtype=np.float64).reshape(-1, 4)
+        loops = np.asarray(sources) == np.asarray(targets)
+        self.sources = np.asarray(sources, dtype=np.int64)[~loops]
+        self.targets = np.asarray(targets, dtype=np.int64)[~loops]
+        self.edge_widths = np.broadcast_to(np.asarray(edge_widths, dtype=np.float64), loops.shape)[~loops]
+        self.max_zoom = max_zoom
+        self.tile_size = tile_size
+        self.rad = rad
+        self.arrowsize = arrowsize
+
+        # 第0层的瓦片是覆盖全部节点的正方形，四周留出最大节点与箭头的边距；
+        # 边距以最深一层的像素计，它在世界坐标中的长度与世界范围成正比
+        if len(self.positions):
+            low, high = self.positions.min(axis=0), self.positions.max(axis=0)
+        else:
+            low, high = np.zeros(2), np.zeros(2)
+        span = float((high - low).max()) or 1.0
+        margin = (np.sqrt(self.node_sizes.max(initial=0.0)) / 2 + 0.4 * arrowsize
+                  + self.edge_widths.max(initial=0.0)) / (tile_size * (1 << max_zoom))
+        self.world_size = span / max(1.0 - 2 * margin, 0.5)
+        self.origin = (low + high) / 2 - self.world_size / 2
+        pixel = self._world_per_pixel(max_zoom)
+
+        bounds = (*self.origin, *(self.origin + self.world_size))
+        node_radius = np.sqrt(self.node_sizes) / 2 * pixel
+        self.node_index = QuadtreeIndex(
+            np.column_stack((self.positions - node_radius[:, None], self.positions + node_radius[:, None])),
+            bounds, max_level=max_zoom
+        )
+
+        # 弧形边位于起点、终点与控制点的凸包内，再加上箭头与线宽
+        start, end = self.positions[self.sources], self.positions[self.targets]
+        delta = end - start
+        control = (start + end) / 2 + rad * np.column_stack((delta[:, 1], -delta[:, 0]))
+        points = np.stack((start, end, control), axis=1)
+        pad = (0.4 * arrowsize + self.edge_widths / 2)[:, None] * pixel
+        self.edge_index = QuadtreeIndex(
+            np.column_stack((points.min(axis=1) - pad, points.max(axis=1) + pad)),
+            bounds, max_level=max_zoom
+        )
+
+    def _world_per_pixel(self, zoom: int) -> float:
+        """给定层级上一个像素对应的世界坐标长度"""
+        return self.world_size / (self.tile_size * (1 << zoom))
+
+    def _crossing(self, edges: np.ndarray, cx: float, cy: float, radius: float) -> np.ndarray:
+        """
+        进一步排除包围盒与瓦片相交、曲线却不经过瓦片的长边（如对角方向的长边）
+
+        弧线偏离弦的距离不超过 rad/2·弦长，弦到瓦片中心的距离超过
+        瓦片外接圆半径加该偏移与箭头、线宽时，曲线不可能经过瓦片。
+        """
+        if len(edges) == 0:
+            return edges
+        start, end = self.positions[self.sources[edges]], self.positions[self.targets[edges]]
+        delta = end - start
+        length2 = (delta ** 2).sum(axis=1)
+        center = np.array([cx, cy])
+        t = np.clip(((center - start) * delta).sum(axis=1) / np.maximum(length2, 1e-300), 0.0, 1.0)
+        distance = np.sqrt(((start + t[:, None] * delta - center) ** 2).sum(axis=1))
+        pixel = self._world_per_pixel(self.max_zoom)
+        limit = radius + abs(self.rad) / 2 * np.sqrt(length2) \
+            + (0.4 * self.arrowsize + self.edge_widths[edges] / 2) * pixel
+        return edges[distance <= limit]
+
+    def tile_bounds(self, z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+        """
+        瓦片的世界坐标范围，y=0 为最上方一行
+
+        Returns:
+            (xmin, ymin, xmax, ymax)
+        """
+        size = self.world_size / (1 << z)
+        xmin = self.origin[0] + x * size
+        ymax = self.origin[1] + self.world_size - y * size
+        return xmin, ymax - size, xmin + size, ymax
+
+    def draw(self, ax: Any, z: int, x: int, y: int) -> bool:
+        """
+        在坐标轴上绘制一个瓦片，坐标轴的数据坐标为瓦片像素（y向上）
+
+        Args:
+            ax: 坐标轴，覆盖整个图形且范围为 [0, tile_size]
+            z: 层级
+            x: 列号
+            y: 行号
+
+        Returns:
+            瓦片内是否有元素
+        """
+        import fast_draw
+
+        xmin, ymin, xmax, ymax = self.tile_bounds(z, x, y)
+        pixel = self._world_per_pixel(z)
+        pad = _QUERY_PADDING * pixel
+        nodes = self.node_index.query(xmin - pad, ymin - pad, xmax + pad, ymax + pad)
+        edges = self._crossing(self.edge_index.query(xmin - pad, ymin - pad, xmax + pad, ymax + pad),
+                               (xmin + xmax) / 2, (ymin + ymax) / 2, (xmax - xmin) / np.sqrt(2) + pad)
+        if len(nodes) == 0 and len(edges) == 0:
+            return False
+
+        scale = 2.0 ** (z - self.max_zoom)
+        origin = np.array([xmin, ymin])
+
+        if len(edges):
+            # 只转换这些边用到的端点，端点可能远在瓦片之外
+            ends = np.concatenate((self.sources[edges], self.targets[edges]))
+            used, local = np.unique(ends, return_inverse=True)
+            pixels = (self.positions[used] - origin) / pixel
+            # 浅层级中边通常只有几个像素长，按弦长中位数减少曲线的分段数
+            chord = np.sqrt(((pixels[local[:len(edges)]] - pixels[local[len(edges):]]) ** 2).sum(axis=1))
+            samples = int(np.clip(np.median(chord) / _SEGMENT_PIXELS, 2, 8))
+            fast_draw.draw_edges(
+                ax, pixels, local[:len(edges)], local[len(edges):],
+                widths=np.maximum(self.edge_widths[edges] * scale, _MIN_EDGE_WIDTH),
+                node_sizes=np.maximum(self.node_sizes[used] * scale ** 2, _MIN_NODE_DIAMETER ** 2),
+                color='gray', alpha=0.6, rad=self.rad, arrowsize=self.arrowsize * scale, samples=samples
+            )
+        if len(nodes):
+            fast_draw.draw_nodes(
+                ax, (self.positions[nodes] - origin) / pixel,
+                np.maximum(self.node_sizes[nodes] * scale ** 2, _MIN_NODE_DIAMETER ** 2),
+                self.node_colors[nodes], alpha=0.8
+            )
+        return True
+
+
+class _TileWorker:
+    """复用一个Agg图形逐个绘制瓦片，每个瓦片只清空并重新添加集合"""
+
+    def __init__(self, scene: TileScene, output_dir: str, image_format: str, background: Optional[str]):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.scene = scene
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self.background = background
+
+        # dpi为72时1点等于1像素，节点面积与线宽直接以像素为单位
+        size = scene.tile_size / 72.0
+        self.figure = Figure(figsize=(size, size), dpi=72)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_axes((0, 0, 1, 1))
+        self.ax.set_axis_off()
+
+    def render(self, tiles: List[Tuple[int, int, int]]) -> List[bool]:
+        """
+        绘制并保存一批瓦片，没有元素的瓦片不写文件
+
+        Returns:
+            每个瓦片是否非空
+        """
+        ax = self.ax
+        results = []
+        for z, x, y in tiles:
+            for artist in list(ax.collections):
+                artist.remove()
+            ax.set_xlim(0, self.scene.tile_size)
+            ax.set_ylim(0, self.scene.tile_size)
+            drawn = self.scene.draw(ax, z, x, y)
+            results.append(drawn)
+            if not drawn:
+                continue
+
+            ax.set_xlim(0, self.scene.tile_size)
+            ax.set_ylim(0, self.scene.tile_size)
+            directory = os.path.join(self.output_dir, str(z), str(x))
+            os.makedirs(directory, exist_ok=True)
+            self.figure.savefig(os.path.join(directory, f"{y}.{self.image_format}"), dpi=72,
+                                format=self.image_format, facecolor=self.background or 'none',
+                                transparent=self.background is None)
+        return results
+
+
+def _init_worker(scene: TileScene, output_dir: str, image_format: str, background: Optional[str]) -> None:
+    """工作进程初始化：场景数据只在创建进程时传输一次"""
+    global _worker
+    _worker = _TileWorker(scene, output_dir, image_format, background)
+
+
+def _render_tiles(tiles: List[Tuple[int, int, int]]) -> List[bool]:
+    """在工作进程中绘制一批瓦片"""
+    return _worker.render(tiles)
+
+
+def export_tiles(scene: TileScene, output_dir: str, workers: Optional[int] = None,
+                 image_format: str = 'png', background: Optional[str] = 'white',
+                 batch_size: int = 64) -> Dict[str, Any]:
+    """
+    逐层导出瓦片金字塔
+
+    第0层只有一个瓦片；下一层只处理上一层非空瓦片的四个子瓦片，
+    因此空白区域不会被展开。没有元素的瓦片不写文件，查看器按背景色显示即可。
+
+    Args:
+        scene: 瓦片场景
+        output_dir: 输出目录，瓦片保存为 {z}/{x}/{y}.{format}
+        workers: 工作进程数，默认使用全部核心，1为在当前进程中绘制
+        image_format: 图像格式（png、jpg、webp等matplotlib支持的格式）
+        background: 背景色，None为透明
+        batch_size: 每个任务包含的最大瓦片数
+
+    Returns:
+        写入 tiles.json 的清单
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    pool = None
+    worker = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(scene, output_dir, image_format, background))
+    else:
+        worker = _TileWorker(scene, output_dir, image_format, background)
+
+    counts = []
+    try:
+        level = [(0, 0, 0)]
+        for z in range(scene.max_zoom + 1):
+            if not level:
+                break
+            # 按核心数切分，使每层的任务足够均衡
+            size = max(1, min(batch_size, math.ceil(len(level) / (workers * 4))))
+            batches = [level[i:i + size] for i in range(0, len(level), size)]
+            if pool is not None:
+                results = [drawn for batch in pool.map(_render_tiles, batches) for drawn in batch]
+            else:
+                results = [drawn for batch in batches for drawn in worker.render(batch)]
+
+            occupied = [tile for tile, drawn in zip(level, results) if drawn]
+            counts.append(len(occupied))
+            level = [(z + 1, 2 * x + dx, 2 * y + dy) for _, x, y in occupied for dx in (0, 1) for dy in (0, 1)]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    manifest = {
+        'format': image_format,
+        'tile_size': scene.tile_size,
+        'min_zoom': 0,
+        'max_zoom': scene.max_zoom,
+        'url': '{z}/{x}/{y}.' + image_format,
+        'bounds': [*scene.origin.tolist(), *(scene.origin + scene.world_size).tolist()],
+        'tiles': counts,
+        'background': background,
+        'elapsed': time.perf_counter() - start
+    }
+    with open(os.path.join(output_dir, TILE_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='把图导出为多分辨率瓦片金字塔')
+    parser.add_argument('input', help='输入图文件（.json、.json.gz 或 .prg）')
+    parser.add_argument('output_dir', help='输出目录')
+    parser.add_argument('--config', default=None, help='渲染器配置JSON文件')
+    parser.add_argument('--max-zoom', type=int, default=None, help='最大层级（默认按节点数估计）')
+    parser.add_argument('--tile-size', type=int, default=256, help='瓦片边长（像素）')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='工作进程数')
+    parser.add_argument('--format', default='png', help='瓦片图像格式')
+    args = parser.parse_args(argv)
+
+    from batch_render import load_config
+    from pagerank_renderer import PageRankRenderer
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    renderer = PageRankRenderer(load_config(config))
+    if args.input.endswith('.prg'):
+        renderer.load_binary(args.input)
+    else:
+        renderer.load_json(args.input)
+
+    manifest = renderer.export_tiles(args.output_dir, max_zoom=args.max_zoom, tile_size=args.tile_size,
+                                     workers=args.workers, image_format=args.format)
+    print(f"{args.output_dir}: 层级 0-{manifest['max_zoom']}，共 {sum(manifest['tiles'])} 个瓦片，"
+          f"{manifest['elapsed']:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())